@@ -0,0 +1,80 @@
+"""
+Throughput of the asyncio callback receiver (gozarpay.callbacks).
+
+    python benchmarks/bench_callbacks.py [--callbacks 20000] [--connections 32]
+
+Posts JSON callbacks over keep-alive connections to an in-process
+CallbackReceiver (sender and receiver share one event loop, i.e. one core)
+and reports acknowledged callbacks per second; every tenth delivery repeats
+an earlier reference_id to exercise de-duplication.
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import List, Optional
+
+from gozarpay.callbacks import CallbackReceiver
+
+
+def request(path: str, i: int) -> bytes:
+    ref = i - 1 if i % 10 == 9 else i  # every 10th is a redelivery
+    body = json.dumps({"reference_id": f"order-{ref}", "status": "success"}).encode()
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+async def sender(host: str, port: int, path: str, ids: range) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    ok = 0
+    for i in ids:
+        writer.write(request(path, i))
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+        ok += head.startswith(b"HTTP/1.1 200")
+    writer.close()
+    return ok
+
+
+async def run(callbacks: int, connections: int) -> None:
+    handled = 0
+
+    def handler(event: object) -> None:
+        nonlocal handled
+        handled += 1
+
+    async with CallbackReceiver(handler, queue_size=callbacks) as receiver:
+        host, port = receiver._server.sockets[0].getsockname()[:2]  # type: ignore[union-attr]
+        per = callbacks // connections
+        start = time.perf_counter()
+        acks = await asyncio.gather(
+            *(
+                sender(host, port, receiver.path, range(c * per, (c + 1) * per))
+                for c in range(connections)
+            )
+        )
+        await receiver.join()
+        elapsed = time.perf_counter() - start
+    total = sum(acks)
+    print(f"acknowledged {total} callbacks in {elapsed:.2f}s: {total / elapsed:,.0f}/s")
+    print(f"handled {handled}, {receiver.stats}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CallbackReceiver throughput")
+    parser.add_argument("--callbacks", type=int, default=20_000)
+    parser.add_argument("--connections", type=int, default=32)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.callbacks, args.connections))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
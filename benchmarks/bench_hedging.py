@@ -0,0 +1,69 @@
+"""
+Tail latency with and without hedged reads (gozarpay.hedging).
+
+    python benchmarks/bench_hedging.py [--calls 2000] [--tail-ms 200] [--tail-ratio 0.03]
+
+Calls `receipt.get` against an in-process stub server where `tail-ratio` of
+the requests stall for `tail-ms`, once on a plain client and once with
+`hedge=HedgePolicy(...)`, and prints p50/p95/p99 for both plus the hedge
+counts (`Client.hedge_stats()`).
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from gozarpay import ClientConfig
+from gozarpay.bulk import percentile
+from gozarpay.factory import create_client
+from gozarpay.hedging import HedgePolicy
+from stub_server import StubServer
+
+
+def run(client, calls: int) -> List[float]:
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        client.receipt.get(receipt_id=i % 1000 + 1, validate=False)
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def report(label: str, latencies: List[float]) -> None:
+    p50, p95, p99 = (percentile(latencies, p) * 1000 for p in (50, 95, 99))
+    print(f"{label:<10} p50 {p50:7.2f}ms  p95 {p95:7.2f}ms  p99 {p99:7.2f}ms")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="hedged vs plain receipt.get")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--tail-ms", type=float, default=200.0)
+    parser.add_argument("--tail-ratio", type=float, default=0.03)
+    parser.add_argument("--percentile", type=float, default=95.0)
+    args = parser.parse_args(argv)
+
+    with StubServer(
+        latency_ms=args.latency_ms, tail_ms=args.tail_ms, tail_ratio=args.tail_ratio
+    ) as server:
+        base = dict(base_url=server.url, api_key="bench", secret_key="bench")
+        plain = create_client(ClientConfig(**base))
+        hedged = create_client(
+            ClientConfig(**base, hedge=HedgePolicy(percentile=args.percentile))
+        )
+        report("plain", run(plain, args.calls))
+        report("hedged", run(hedged, args.calls))
+        for route, stats in hedged.hedge_stats().items():
+            print(
+                f"{route}: {stats.hedged} hedges ({stats.hedged / stats.calls:.1%}), "
+                f"{stats.wins} won, delay {stats.delay * 1000:.2f}ms"
+            )
+        plain.close()
+        hedged.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
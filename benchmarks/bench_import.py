@@ -0,0 +1,75 @@
+"""
+Cold-start benchmark: wall time of fresh interpreters importing the SDK.
+
+    python benchmarks/bench_import.py [--runs 15] [--json results.json]
+
+Each scenario runs in a new process (nothing cached in sys.modules); the
+median, min and max over all runs are reported in milliseconds.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+SCENARIOS: Dict[str, str] = {
+    "baseline (python -c pass)": "pass",
+    "import gozarpay": "import gozarpay",
+    "client_public()": (
+        "import gozarpay; gozarpay.client_public(base_url='http://localhost')"
+    ),
+    "client_public().market": (
+        "import gozarpay; gozarpay.client_public(base_url='http://localhost').market"
+    ),
+    "client + all services": (
+        "import gozarpay; c = gozarpay.client_public(base_url='http://localhost'); "
+        "c.market; c.receipt; c.wallet"
+    ),
+}
+
+_TIMER = (
+    "import time as _t; _s = _t.perf_counter()\n{code}\n"
+    "print((_t.perf_counter() - _s) * 1000)"
+)
+
+
+def measure(code: str, runs: int) -> List[float]:
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(code=code)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main(argv: List[str] | None = None) -> Dict[str, Dict[str, float]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, code in SCENARIOS.items():
+        samples = measure(code, args.runs)
+        results[name] = {
+            "median_ms": statistics.median(samples),
+            "min_ms": min(samples),
+            "max_ms": max(samples),
+        }
+        print(f"{name:<30} median {results[name]['median_ms']:8.2f} ms")
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
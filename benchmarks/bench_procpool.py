@@ -0,0 +1,56 @@
+"""
+Threads vs processes for decode-heavy bulk reads (gozarpay.procpool).
+
+    python benchmarks/bench_procpool.py [--receipts 50000] [--page-size 500] [--workers 4]
+
+Crawls every `receipt.list` page of an in-process stub server twice: with a
+thread pool sharing one Client (fetch + Pydantic validation contend for the
+GIL) and with a ProcessExecutor (each worker owns a copy of the client), and
+reports receipts per second for each.
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+import time
+from functools import partial
+from typing import List, Optional
+
+from gozarpay import ClientConfig
+from gozarpay.bulk import BulkRun
+from gozarpay.factory import create_client
+from gozarpay.procpool import ProcessExecutor, receipt_page
+from stub_server import StubServer
+
+
+def report(label: str, run: BulkRun, elapsed: float) -> None:
+    items = sum(1 for _ in run)
+    elapsed = time.perf_counter() - elapsed
+    print(f"{label:<10} {items} receipts in {elapsed:.2f}s: {items / elapsed:,.0f}/s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ProcessExecutor vs threads")
+    parser.add_argument("--receipts", type=int, default=50_000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    with StubServer(receipts=args.receipts, receipt_page_size=args.page_size) as server:
+        client = create_client(
+            ClientConfig(base_url=server.url, api_key="bench", secret_key="bench")
+        )
+        pages = range(1, -(-args.receipts // args.page_size) + 1)
+
+        start = time.perf_counter()
+        threads = BulkRun(pages, partial(receipt_page, client), max_workers=args.workers)
+        report("threads", threads, start)
+
+        with ProcessExecutor(client, processes=args.workers) as executor:
+            start = time.perf_counter()
+            report("processes", executor.receipts(pages), start)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
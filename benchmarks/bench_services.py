@@ -0,0 +1,318 @@
+"""
+SDK benchmark suite against the local stub server (no network, no credentials).
+
+    python benchmarks/bench_services.py [--quick] [--json results.json]
+                                        [--compare baseline.json --threshold 15]
+
+Measures, per service method, throughput and p50/p99 latency; concurrency
+scaling (threads and asyncio); model decode cost on captured bodies; and
+import time. The stub runs in-process by default (it shares the GIL with the
+client); start `stub_server.py` separately and pass `--url` for cleaner numbers.
+Results are JSON so runs can be compared: `--compare` prints the change
+against a previous file and exits 1 when any metric regressed by more than
+`--threshold` percent.
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from bench_import import SCENARIOS as IMPORT_SCENARIOS, measure as measure_import
+from stub_server import StubServer
+
+import gozarpay
+from gozarpay import ClientConfig
+from gozarpay.auth.strategies import LOGIN_PATH
+from gozarpay.bulk import percentile
+from gozarpay.cache import HTTPCache
+from gozarpay.decoding import decode, json_backend
+from gozarpay.factory import create_async_client, create_client
+from gozarpay.models import MarketPrice, PaginatedReceiptList, PaginatedWalletList
+from gozarpay.retry import NO_RETRY
+from gozarpay.versioning import V1_SPEC
+
+Result = Dict[str, float]
+
+# Metric -> True when higher is better (used by --compare).
+HIGHER_IS_BETTER = {"ops_per_s": True, "p50_ms": False, "p99_ms": False, "us_per_op": False}
+
+
+def summarize(latencies: List[float], elapsed: float) -> Result:
+    lat = sorted(latencies)
+    return {
+        "ops": len(lat),
+        "ops_per_s": len(lat) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(lat, 50) * 1000,
+        "p99_ms": percentile(lat, 99) * 1000,
+    }
+
+
+def run_sync(fn: Callable[[], Any], ops: int, workers: int = 1) -> Result:
+    def timed(_: int) -> float:
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+    fn()  # warm-up: connection, token, TypeAdapter build
+    started = time.perf_counter()
+    if workers == 1:
+        latencies = [timed(i) for i in range(ops)]
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            latencies = list(pool.map(timed, range(ops)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run_async(fn: Callable[[], Awaitable[Any]], ops: int, concurrency: int) -> Result:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def timed() -> float:
+        async with gate:
+            start = time.perf_counter()
+            await fn()
+            return time.perf_counter() - start
+
+    await fn()
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(timed() for _ in range(ops)))
+    return summarize(list(latencies), time.perf_counter() - started)
+
+
+def micro(fn: Callable[[], Any], ops: int) -> Result:
+    fn()
+    start = time.perf_counter()
+    for _ in range(ops):
+        fn()
+    return {"ops": ops, "us_per_op": (time.perf_counter() - start) / ops * 1e6}
+
+
+def bench_services(server: Any, ops: int) -> Dict[str, Result]:
+    cfg = ClientConfig(base_url=server.url, api_key="bench", secret_key="bench", retry=NO_RETRY)
+    client = create_client(cfg)
+    raw = create_client(
+        ClientConfig(
+            base_url=server.url,
+            api_key="bench",
+            secret_key="bench",
+            retry=NO_RETRY,
+            response_mode="raw",
+        )
+    )
+    cached = create_client(
+        ClientConfig(
+            base_url=server.url,
+            api_key="bench",
+            secret_key="bench",
+            retry=NO_RETRY,
+            http_cache=HTTPCache(),
+        )
+    )
+    counter = iter(range(10**9))
+    small = max(ops // 10, 5)
+    return {
+        "market.price_stats": run_sync(client.market.price_stats, small),
+        "market.price_stats[raw]": run_sync(raw.market.price_stats, small),
+        "receipt.get": run_sync(lambda: client.receipt.get(receipt_id=7), ops),
+        "receipt.get[http_cache]": run_sync(lambda: cached.receipt.get(receipt_id=7), ops),
+        "receipt.list": run_sync(lambda: client.receipt.list(page=2), ops),
+        "receipt.create": run_sync(
+            lambda: client.receipt.create(
+                irt_amount="10000",
+                reference_id=f"bench-{next(counter)}",
+                phone_number="09120000000",
+                callback="https://merchant.example/cb",
+            ),
+            ops,
+        ),
+        "receipt.verify": run_sync(
+            lambda: client.receipt.verify(reference_id=f"bench-{next(counter)}"), ops
+        ),
+        "receipt.iter_receipts[all]": run_sync(lambda: list(client.receipt.iter_receipts()), 3),
+        "receipt.iter_receipts[all,c=8]": run_sync(
+            lambda: list(client.receipt.iter_receipts(concurrency=8)), 3
+        ),
+        "wallet.list_by_phone": run_sync(
+            lambda: client.wallet.list_by_phone(phone="09120000000"), ops
+        ),
+        "wallet.list_by_phone[http_cache]": run_sync(
+            lambda: cached.wallet.list_by_phone(phone="09120000000"), ops
+        ),
+        "wallet.list_many[50 phones]": run_sync(
+            lambda: list(client.wallet.list_many([f"0912{i:07d}" for i in range(50)])), 3
+        ),
+    }
+
+
+def bench_scaling(server: Any, ops: int) -> Dict[str, Result]:
+    client = create_client(
+        ClientConfig(base_url=server.url, api_key="bench", secret_key="bench", retry=NO_RETRY)
+    )
+    results = {}
+    for workers in (1, 4, 16):
+        results[f"threads={workers} receipt.get"] = run_sync(
+            lambda: client.receipt.get(receipt_id=7), ops, workers
+        )
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        return results
+
+    async def run() -> None:
+        async with create_async_client(
+            ClientConfig(
+                base_url=server.url, api_key="bench", secret_key="bench", retry=NO_RETRY
+            )
+        ) as ac:
+            for concurrency in (1, 16, 64):
+                results[f"asyncio={concurrency} receipt.get"] = await run_async(
+                    lambda: ac.receipt.get(receipt_id=7), ops, concurrency
+                )
+
+    asyncio.run(run())
+    return results
+
+
+class _Remote:
+    """Stand-in for StubServer when the stub runs in another process."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url.rstrip("/")
+
+    def __enter__(self) -> "_Remote":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+class _Body:
+    __slots__ = ("content",)
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+
+def bench_decode(server: Any, ops: int) -> Dict[str, Result]:
+    import requests
+
+    login = requests.post(
+        f"{server.url}{LOGIN_PATH}", json={"api_key": "bench", "secret_key": "bench"}
+    )
+    auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    def body(path: str) -> _Body:
+        return _Body(requests.get(f"{server.url}{path}", headers=auth, timeout=30).content)
+
+    routes = V1_SPEC.routes
+    prices = body(routes["market.price_stats"])
+    receipts = body(routes["receipt.list"])
+    wallets = body(routes["wallet.list_by_phone"].format(phone="09120000000"))
+    n = max(ops // 10, 5)
+    return {
+        "List[MarketPrice] model": micro(lambda: decode(prices, List[MarketPrice]), n),
+        "List[MarketPrice] raw": micro(lambda: decode(prices, List[MarketPrice], False), n),
+        "List[MarketPrice] json.loads+model_validate": micro(
+            lambda: [MarketPrice.model_validate(x) for x in json.loads(prices.content)], n
+        ),
+        "PaginatedReceiptList model": micro(
+            lambda: decode(receipts, PaginatedReceiptList), ops
+        ),
+        "PaginatedWalletList model": micro(lambda: decode(wallets, PaginatedWalletList), ops),
+        "PaginatedWalletList raw": micro(
+            lambda: decode(wallets, PaginatedWalletList, False), ops
+        ),
+    }
+
+
+def bench_imports(runs: int) -> Dict[str, Result]:
+    out = {}
+    for name, code in IMPORT_SCENARIOS.items():
+        samples = sorted(measure_import(code, runs))
+        out[name] = {"runs": runs, "p50_ms": percentile(samples, 50), "p99_ms": samples[-1]}
+    return out
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Print per-metric deltas; return True when nothing regressed past `threshold` %."""
+    ok = True
+    for group, entries in current["results"].items():
+        for name, metrics in entries.items():
+            base = baseline.get("results", {}).get(group, {}).get(name)
+            if not base:
+                continue
+            for metric, higher_better in HIGHER_IS_BETTER.items():
+                if metric not in metrics or not base.get(metric):
+                    continue
+                change = (metrics[metric] - base[metric]) / base[metric] * 100
+                worse = -change if higher_better else change
+                flag = "REGRESSION" if worse > threshold else ""
+                ok = ok and not flag
+                print(f"{group:>9} {name:<45} {metric:<10} {change:+7.1f}% {flag}")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="GozarPay SDK benchmarks")
+    parser.add_argument("--ops", type=int, default=300, help="calls per method")
+    parser.add_argument("--quick", action="store_true", help="small run (smoke test)")
+    parser.add_argument("--markets", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stub server delay")
+    parser.add_argument(
+        "--url", help="use a stub started separately (stub_server.py) instead of in-process"
+    )
+    parser.add_argument("--skip-import", action="store_true")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--compare", help="baseline results file")
+    parser.add_argument("--threshold", type=float, default=15.0, help="regression %")
+    args = parser.parse_args(argv)
+    ops = 30 if args.quick else args.ops
+
+    results: Dict[str, Dict[str, Result]] = {}
+    server: Any = (
+        _Remote(args.url)
+        if args.url
+        else StubServer(markets=args.markets, latency_ms=args.latency_ms)
+    )
+    with server:
+        results["services"] = bench_services(server, ops)
+        results["scaling"] = bench_scaling(server, ops)
+        results["decode"] = bench_decode(server, ops)
+    if not args.skip_import:
+        results["import"] = bench_imports(3 if args.quick else 15)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "gozarpay": gozarpay.__version__,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "json_backend": json_backend(),
+            "ops": ops,
+            "markets": args.markets,
+            "latency_ms": args.latency_ms,
+            "server": args.url or "in-process",
+        },
+        "results": results,
+    }
+    for group, entries in results.items():
+        print(f"[{group}]")
+        for name, metrics in entries.items():
+            shown = "  ".join(f"{k}={v:,.2f}" for k, v in metrics.items() if k != "ops")
+            print(f"  {name:<45} {shown}")
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(report, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            return 0 if compare(report, json.load(fh), args.threshold) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
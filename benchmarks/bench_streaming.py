@@ -0,0 +1,61 @@
+"""
+Buffered vs streamed decode of a large price-stats response (gozarpay.streaming).
+
+    python benchmarks/bench_streaming.py [--markets 50000] [--gzip] [--raw]
+
+Reads every market of an in-process stub server twice: with
+`market.price_stats()` (whole body, then one parse) and with
+`market.iter_price_stats()` (items decoded as the body arrives, consumed one
+at a time), and reports time to the first market, total time and the peak
+of Python allocations (tracemalloc) for each.
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+import time
+import tracemalloc
+from typing import Callable, Iterable, List, Optional
+
+from gozarpay import ClientConfig
+from gozarpay.factory import create_client
+from stub_server import StubServer
+
+
+def measure(label: str, read: Callable[[], Iterable]) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in read():
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<10} {count} markets  first {first * 1000:8.1f}ms  "
+        f"total {total * 1000:8.1f}ms  peak {peak / 2**20:7.1f} MiB"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="price_stats vs iter_price_stats")
+    parser.add_argument("--markets", type=int, default=50_000)
+    parser.add_argument("--gzip", action="store_true", help="gzip-encoded bodies")
+    parser.add_argument("--raw", action="store_true", help="record views, no validation")
+    args = parser.parse_args(argv)
+
+    with StubServer(markets=args.markets, gzip=args.gzip) as server:
+        client = create_client(ClientConfig(base_url=server.url))
+        validate = not args.raw
+        client.market.price_stats(validate=validate)  # warm-up: imports, pool, adapters
+        measure("buffered", lambda: client.market.price_stats(validate=validate))
+        measure("streamed", lambda: client.market.iter_price_stats(validate=validate))
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
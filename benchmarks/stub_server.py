@@ -0,0 +1,358 @@
+"""
+Local stand-in for the GozarPay API, used by the benchmarks.
+
+    python benchmarks/stub_server.py --port 8080 [--latency-ms 2]
+
+Serves every route of `versioning.V1_SPEC` / `V2_SPEC` plus api-login and
+refresh-token, with deterministic, realistically sized payloads:
+- price-stats: `markets` entries (some `price_info` as JSON strings, like prod);
+- receipts / wallets: DRF-style pages (`count`, `next`, 404 past the end);
+- private routes require a Bearer token issued by login/refresh (else 401);
+- GET bodies carry an `ETag`; a matching `If-None-Match` gets a bodiless 304;
+- `gzip=True`: bodies are gzip-encoded for clients that accept it.
+"""
+
+from __future__ import annotations
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from gozarpay.auth.strategies import LOGIN_PATH, REFRESH_PATH
+from gozarpay.versioning import SPECS
+
+PUBLIC_ROUTES = {"market.price_stats"}
+_GET_ROUTES = {"market.price_stats", "receipt.get", "receipt.list", "wallet.list_by_phone"}
+
+
+def fake_jwt(exp: float, sub: str = "bench") -> str:
+    """Unsigned JWT-shaped token whose `exp` the SDK's refresh logic can read."""
+
+    def part(obj: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+
+    return f"{part({'alg': 'none'})}.{part({'sub': sub, 'exp': int(exp)})}.sig"
+
+
+def price_stats_payload(markets: int) -> List[Dict[str, Any]]:
+    codes = [f"C{i:03d}" for i in range(max(2, int(markets**0.5) + 1))]
+    out = []
+    for i in range(markets):
+        code1, code2 = codes[i % len(codes)], codes[(i // len(codes) + 1) % len(codes)]
+        price = f"{1000 + i * 7.5:.2f}"
+        info = {
+            "created_at": 1700000000 + i,
+            "price": price,
+            "change": round((i % 21 - 10) / 10, 2),
+            "min": f"{900 + i * 7.5:.2f}",
+            "max": f"{1100 + i * 7.5:.2f}",
+            "time": 1700000000 + i,
+            "mean": price,
+            "value": i * 13,
+            "amount": i * 3,
+        }
+        out.append(
+            {
+                "id": i + 1,
+                "code": f"{code1}{code2}",
+                "code1": code1,
+                "code2": code2,
+                "currency1": codes.index(code1) + 1,
+                "currency2": codes.index(code2) + 1,
+                "title": f"{code1}/{code2}",
+                # Every third market ships price_info as a JSON string, like prod.
+                "price_info": json.dumps(info) if i % 3 == 0 else info,
+                "price": price,
+                "buy_price": f"{float(price) * 0.999:.2f}",
+                "sell_price": f"{float(price) * 1.001:.2f}",
+                "tradable": i % 5 != 0,
+            }
+        )
+    return out
+
+
+def receipt(i: int) -> Dict[str, Any]:
+    return {
+        "id": i,
+        "reference_id": f"ref-{i:08d}",
+        "status": "success" if i % 4 else "pending",
+        "irt_amount": str(10000 + i),
+        "redirect_url": f"https://pay.example/receipts/{i}/",
+        "created_at": f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z",
+    }
+
+
+def wallet(i: int) -> Dict[str, Any]:
+    return {
+        "currency": {
+            "id": i,
+            "code": f"C{i:03d}",
+            "title_fa": "ارز",
+            "description": "stub currency",
+            "image": f"https://cdn.example/{i}.png",
+            "color": "#ffaa00",
+            "decimal": 8,
+            "decimal_amount": 6,
+            "decimal_irt": 0,
+        },
+        "balance": f"{i * 1.25:.8f}",
+        "value_total": f"{i * 1250:.0f}",
+    }
+
+
+def page(
+    url: str, total: int, size: int, number: int, make: Callable[[int], Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """DRF PageNumberPagination body, or None when `number` is past the end."""
+    last = max(1, -(-total // size))
+    if number < 1 or number > last:
+        return None
+    start = (number - 1) * size
+    return {
+        "count": total,
+        "next": f"{url}?page={number + 1}" if number < last else None,
+        "previous": f"{url}?page={number - 1}" if number > 1 else None,
+        "results": [make(i) for i in range(start + 1, min(total, start + size) + 1)],
+    }
+
+
+class StubServer:
+    """
+    Threaded HTTP server on 127.0.0.1 (port 0 = any free port).
+    Use as a context manager; `url` is the base URL for the SDK.
+    `stats` counts requests per route key. `tail_ratio` of the requests take
+    `tail_ms` longer (a slow tail, for hedging runs).
+    """
+
+    def __init__(
+        self,
+        *,
+        port: int = 0,
+        markets: int = 2000,
+        receipts: int = 1000,
+        receipt_page_size: int = 50,
+        wallets: int = 200,
+        wallet_page_size: int = 25,
+        token_ttl: float = 3600.0,
+        latency_ms: float = 0.0,
+        tail_ms: float = 0.0,
+        tail_ratio: float = 0.0,
+        etags: bool = True,
+        gzip: bool = False,
+    ) -> None:
+        self.etags = etags
+        self.gzip = gzip
+        self.receipts = receipts
+        self.receipt_page_size = receipt_page_size
+        self.wallets = wallets
+        self.wallet_page_size = wallet_page_size
+        self.token_ttl = token_ttl
+        self.latency = latency_ms / 1000
+        self.tail = tail_ms / 1000
+        self.tail_ratio = tail_ratio
+        self.stats: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, float] = {}
+        self._refresh_tokens: set = set()
+        self._price_stats = json.dumps(price_stats_payload(markets)).encode()
+        self._price_stats_gz: Optional[bytes] = None
+        self._routes = self._compile()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="gozarpay-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ---- routing ----
+
+    def _compile(self) -> List[Tuple[str, str, Pattern[str]]]:
+        routes = []
+        for spec in SPECS.values():
+            paths = dict(spec.routes)
+            paths["auth.login"] = LOGIN_PATH.replace("/v1/", f"/{spec.name}/")
+            paths["auth.refresh"] = REFRESH_PATH.replace("/v1/", f"/{spec.name}/")
+            for key, path in paths.items():
+                method = "GET" if key in _GET_ROUTES else "POST"
+                regex = re.sub(r"\\{(\w+)\\}", r"(?P<\1>[^/]+)", re.escape(path))
+                routes.append((method, key, re.compile(f"^{regex}$")))
+        return routes
+
+    def _match(self, method: str, path: str) -> Tuple[Optional[str], Dict[str, str]]:
+        for route_method, key, regex in self._routes:
+            m = regex.match(path)
+            if m and route_method == method:
+                return key, m.groupdict()
+        return None, {}
+
+    def _issue(self) -> Dict[str, str]:
+        exp = time.time() + self.token_ttl
+        with self._lock:
+            access = fake_jwt(exp, sub=str(len(self._tokens)))
+            refresh = f"refresh-{len(self._refresh_tokens)}"
+            self._tokens[access] = exp
+            self._refresh_tokens.add(refresh)
+        return {"access_token": access, "refresh_token": refresh}
+
+    def _authorized(self, header: Optional[str]) -> bool:
+        if not header or not header.startswith("Bearer "):
+            return False
+        exp = self._tokens.get(header[len("Bearer ") :])
+        return exp is not None and exp > time.time()
+
+    def handle(
+        self, method: str, target: str, headers: Any, body: bytes
+    ) -> Tuple[int, bytes]:
+        split = urlsplit(target)
+        key, args = self._match(method, split.path)
+        with self._lock:
+            self.stats[key or "unknown"] = self.stats.get(key or "unknown", 0) + 1
+        if key is None:
+            return 404, b'{"detail": "Not found."}'
+        if self.latency:
+            time.sleep(self.latency)
+        if self.tail_ratio and random.random() < self.tail_ratio:
+            time.sleep(self.tail)
+        query = {k: v[-1] for k, v in parse_qs(split.query).items()}
+        payload = json.loads(body) if body else {}
+
+        if key == "auth.login":
+            if not payload.get("api_key") or not payload.get("secret_key"):
+                return 401, b'{"detail": "Invalid credentials."}'
+            return 200, json.dumps(self._issue()).encode()
+        if key == "auth.refresh":
+            if payload.get("refresh") not in self._refresh_tokens:
+                return 401, b'{"detail": "Token is invalid or expired"}'
+            return 200, json.dumps({"access": self._issue()["access_token"]}).encode()
+        if key not in PUBLIC_ROUTES and not self._authorized(headers.get("Authorization")):
+            return 401, b'{"detail": "Authentication credentials were not provided."}'
+
+        if key == "market.price_stats":
+            return 200, self._price_stats
+        if key == "receipt.list":
+            body_ = page(
+                f"{self.url}{split.path}",
+                self.receipts,
+                self.receipt_page_size,
+                int(query.get("page", 1)),
+                receipt,
+            )
+        elif key == "wallet.list_by_phone":
+            body_ = page(
+                f"{self.url}{split.path}",
+                self.wallets,
+                self.wallet_page_size,
+                int(query.get("page", 1)),
+                wallet,
+            )
+        elif key == "receipt.get":
+            body_ = receipt(int(args["id"]))
+        elif key == "receipt.create":
+            body_ = {**receipt(abs(hash(payload.get("reference_id"))) % 10**6), **payload}
+        else:  # receipt.verify / receipt.refund
+            body_ = {"reference_id": payload.get("reference_id")}
+        if body_ is None:
+            return 404, b'{"detail": "Invalid page."}'
+        return 200, json.dumps(body_).encode()
+
+    def _gzipped(self, body: bytes) -> bytes:
+        if body is self._price_stats:  # the big one: compressed once
+            if self._price_stats_gz is None:
+                self._price_stats_gz = gzip.compress(body, 6)
+            return self._price_stats_gz
+        return gzip.compress(body, 6)
+
+    def _handler(self) -> type:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+            disable_nagle_algorithm = True  # headers + body are separate writes
+
+            def _serve(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, out = server.handle(self.command, self.path, self.headers, body)
+                etag = None
+                if server.etags and self.command == "GET" and status == 200:
+                    etag = f'"{hashlib.sha1(out).hexdigest()[:16]}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        status, out = 304, b""
+                if server.gzip and out and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    out = server._gzipped(out)
+                    self.send_response(status)
+                    self.send_header("Content-Encoding", "gzip")
+                else:
+                    self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+            do_GET = do_POST = _serve
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return _Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local GozarPay API stand-in")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--markets", type=int, default=2000)
+    parser.add_argument("--receipts", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--tail-ms", type=float, default=0.0)
+    parser.add_argument("--tail-ratio", type=float, default=0.0)
+    parser.add_argument("--gzip", action="store_true")
+    args = parser.parse_args()
+    server = StubServer(
+        port=args.port,
+        markets=args.markets,
+        receipts=args.receipts,
+        latency_ms=args.latency_ms,
+        tail_ms=args.tail_ms,
+        tail_ratio=args.tail_ratio,
+        gzip=args.gzip,
+    )
+    print(f"GozarPay stub listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
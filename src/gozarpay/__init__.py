@@ -1,17 +1,55 @@
-from .client import Client, GozarPayClient
-from .factory import from_env, client_public, client_with_api_keys, client_with_tokens
-from .config import ClientConfig
-from .versioning import ApiVersion
-
-__all__ = [
-    "Client",
-    "GozarPayClient",
-    "from_env",
-    "client_public",
-    "client_with_api_keys",
-    "client_with_tokens",
-    "ClientConfig",
-    "ApiVersion",
-]
+from __future__ import annotations
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import Client, GozarPayClient
+    from .async_client import AsyncClient, AsyncGozarPayClient
+    from .factory import (
+        from_env,
+        client_public,
+        client_with_api_keys,
+        client_with_tokens,
+        async_from_env,
+        async_client_public,
+        async_client_with_api_keys,
+        async_client_with_tokens,
+    )
+    from .config import ClientConfig
+    from .versioning import ApiVersion
+
+# Public name -> defining submodule. Resolved on first attribute access (PEP 562)
+# so `import gozarpay` does not pull in requests, pydantic or httpx.
+_EXPORTS = {
+    "Client": ".client",
+    "GozarPayClient": ".client",
+    "from_env": ".factory",
+    "client_public": ".factory",
+    "client_with_api_keys": ".factory",
+    "client_with_tokens": ".factory",
+    "AsyncClient": ".async_client",
+    "AsyncGozarPayClient": ".async_client",
+    "async_from_env": ".factory",
+    "async_client_public": ".factory",
+    "async_client_with_api_keys": ".factory",
+    "async_client_with_tokens": ".factory",
+    "ClientConfig": ".config",
+    "ApiVersion": ".versioning",
+}
+
+__all__ = list(_EXPORTS)
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,389 @@
+from __future__ import annotations
+from functools import cached_property
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional
+from . import deadlines
+from .decoding import ResponseMode, SharedDecode
+from .auth.strategies import AsyncAuthStrategy, AsyncNoAuth
+from .client import DEFAULT_TIMEOUT, _api_error, _coalesce_key
+from .exceptions import DeadlineExceeded
+from .hooks import Hooks, RequestInfo, body_size, response_size
+from .retry import NO_RETRY, RetryPolicy, breaker_for
+from .singleflight import AsyncSingleFlight
+from .transport import Transport
+from .versioning import ApiVersion, SPECS, VersionRouter
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .cache import HTTPCache, TTLCache
+    from .hedging import HedgePolicy, HedgeStats
+    from .ratelimit import RateLimiter
+    from .services import AsyncMarketService, AsyncReceiptService, AsyncWalletService
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore[assignment]
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+
+
+class AsyncClient:
+    """
+    asyncio counterpart of `Client`.
+    - One pooled `httpx.AsyncClient` is shared by all services and the auth strategy.
+    - Use `async with` (or `await client.aclose()`) to release the pool.
+    - `transport` takes an InMemoryTransport (served through httpx.MockTransport).
+    - `deadline` / `hedge` as on Client; a hedged call's losing attempt is cancelled.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        version: ApiVersion | str = ApiVersion.v1,
+        auth_strategy: Optional[AsyncAuthStrategy] = None,
+        http_client: Optional["httpx.AsyncClient"] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        transport: Optional[Transport] = None,
+        price_cache: Optional[TTLCache] = None,
+        response_mode: ResponseMode | str = ResponseMode.model,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hooks: Optional[Hooks] = None,
+        coalesce: bool = False,
+        http_cache: Optional[HTTPCache] = None,
+        deadline: Optional[float] = None,
+        hedge: Optional[HedgePolicy] = None,
+    ) -> None:
+        if httpx is None:
+            raise ImportError(
+                "AsyncClient requires httpx; install with `pip install gozarpay[async]`"
+            )
+        if not base_url:
+            raise ValueError("base_url is required (e.g., 'https://api.gozarpay.com')")
+        self.base_url = base_url.rstrip("/")
+        self.version = (
+            ApiVersion(version) if not isinstance(version, ApiVersion) else version
+        )
+
+        self._owns_http = http_client is None
+        self._http = http_client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            transport=_httpx_transport(transport),
+        )
+        self._auth: AsyncAuthStrategy = auth_strategy or AsyncNoAuth()
+        self._hooks = hooks
+        self._auth.bind(self._http)
+        if hooks is not None:
+            self._auth.instrument(hooks)
+
+        self._router = VersionRouter(SPECS[self.version])
+        self._retry = retry or NO_RETRY  # retries and the breaker are opt-in
+        self._breaker = breaker_for(self.base_url, self._retry)
+        self._limiter = rate_limiter
+        if rate_limiter is not None:
+            rate_limiter.validate(self._router.spec.routes)
+        self._inflight = AsyncSingleFlight() if coalesce else None
+        self._http_cache = http_cache
+        self._deadline = deadline
+        self._hedger = None
+        if hedge is not None:
+            from .hedging import Hedger
+
+            self._hedger = Hedger(hedge)
+        self._request: Callable[..., Awaitable[Any]] = self._build_request_fn()
+
+        self._price_cache = price_cache
+        self._response_mode = response_mode
+
+    @cached_property
+    def market(self) -> AsyncMarketService:
+        from .services.market import AsyncMarketService
+
+        return AsyncMarketService(
+            self._request, self._router, self._price_cache, self._response_mode
+        )
+
+    @cached_property
+    def receipt(self) -> AsyncReceiptService:
+        from .services.receipt import AsyncReceiptService
+
+        return AsyncReceiptService(self._request, self._router, self._response_mode)
+
+    @cached_property
+    def wallet(self) -> AsyncWalletService:
+        from .services.wallet import AsyncWalletService
+
+        return AsyncWalletService(self._request, self._router, self._response_mode)
+
+    @property
+    def coalesced(self) -> int:
+        """Calls answered by another caller's in-flight request (coalesce=True)."""
+        return self._inflight.shared if self._inflight is not None else 0
+
+    def hedge_stats(self) -> Dict[str, HedgeStats]:
+        """Per-route hedging outcome and latency percentiles (empty without `hedge`)."""
+        return self._hedger.stats() if self._hedger is not None else {}
+
+    async def aclose(self) -> None:
+        if self._owns_http:
+            await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _build_request_fn(self) -> Callable[..., Awaitable[Any]]:
+        async def _http(
+            method: str, url: str, headers: Dict[str, str], kwargs, route, attempt
+        ):
+            if self._hooks is None:
+                return await _asend(self._http, method, url, headers, kwargs)
+            return await _atraced(
+                self._hooks, self._http, route, method, url, attempt, headers, kwargs
+            )
+
+        async def _send(
+            method: str,
+            url: str,
+            base_headers: Dict[str, str],
+            auth: bool,
+            kwargs,
+            route: Optional[str],
+            attempt: int,
+        ):
+            headers = await self._auth.attach(base_headers) if auth else base_headers
+            resp = await _http(method, url, headers, kwargs, route, attempt)
+
+            # One retry on 401 if strategy supports it
+            if resp.status_code == 401 and auth:
+                if await self._auth.on_401_and_retry(self._http):
+                    deadlines.check(route)
+                    if kwargs.get("stream"):
+                        await resp.aclose()
+                    headers = await self._auth.attach(base_headers)
+                    resp = await _http(method, url, headers, kwargs, route, attempt)
+            return resp
+
+        async def _hedged_send(
+            method: str,
+            url: str,
+            base_headers: Dict[str, str],
+            auth: bool,
+            kwargs,
+            route: str,
+            attempt: int,
+        ):
+            from .hedging import ahedged
+
+            return await ahedged(
+                self._hedger,
+                route,
+                lambda: _send(method, url, base_headers, auth, kwargs, route, attempt),
+                self._hooks,
+            )
+
+        async def _call(
+            method: str, path: str, auth: bool, route: Optional[str], kwargs
+        ):
+            url = f"{self.base_url}{path}"
+            base_headers: Dict[str, str] = dict(kwargs.pop("headers", {}) or {})
+            retryable = self._retry.allows(method, route, base_headers)
+            # A streamed body is read by the caller: never cached, never hedged
+            stream = bool(kwargs.get("stream"))
+            cache_key = entry = None
+            if self._http_cache is not None and method == "GET" and not stream:
+                cache_key = self._http_cache.key(
+                    route,
+                    url,
+                    kwargs.get("params"),
+                    base_headers,
+                    self._auth.identity() if auth else None,
+                )
+                if cache_key is not None:
+                    entry = self._http_cache.lookup(cache_key)
+                if entry is not None:
+                    base_headers.update(entry.conditional_headers())
+            send = (
+                _hedged_send
+                if self._hedger is not None
+                and not stream
+                and self._hedger.eligible(method, route)
+                else _send
+            )
+            attempt = 0
+            while True:
+                deadlines.check(route)
+                self._breaker.check()
+                if self._limiter is not None:
+                    await self._limiter.aacquire(route)
+                attempt += 1
+                try:
+                    resp = await send(
+                        method, url, base_headers, auth, kwargs, route, attempt
+                    )
+                except httpx.TransportError:
+                    self._breaker.record_failure()
+                    delay = self._retry.wait_for(attempt) if retryable else None
+                    if delay is None or not deadlines.fits(delay):
+                        raise
+                    if self._hooks is not None:
+                        self._hooks.on_retry(route, attempt, delay, None)
+                    await asyncio.sleep(delay)
+                    continue
+                self._breaker.record(resp.status_code)
+
+                if resp.status_code == 304 and entry is not None:
+                    return self._http_cache.revalidated(cache_key, entry, resp)
+                if 200 <= resp.status_code < 300:
+                    if cache_key is not None:
+                        self._http_cache.store(cache_key, resp)
+                    return resp
+                if stream:
+                    await resp.aread()  # error bodies are small; frees the connection
+                delay = (
+                    self._retry.wait_for(
+                        attempt, resp.status_code, resp.headers.get("Retry-After")
+                    )
+                    if retryable
+                    else None
+                )
+                if delay is None or not deadlines.fits(delay):
+                    raise _api_error(resp, url, method)  # no time left to retry
+                if self._hooks is not None:
+                    self._hooks.on_retry(route, attempt, delay, resp.status_code)
+                await asyncio.sleep(delay)
+
+        async def _request(
+            method: str,
+            path: str,
+            *,
+            auth: bool = True,
+            route: Optional[str] = None,
+            deadline: Optional[float] = None,
+            **kwargs,
+        ):
+            budget = deadline if deadline is not None else self._deadline
+            with deadlines.deadline(budget):
+                left = deadlines.remaining()
+                if left is None:
+                    return await _dispatch(method, path, auth, route, kwargs)
+                # Bounds everything awaited, auth refresh on the shared pool included
+                try:
+                    async with asyncio.timeout(max(left, 0.0)):
+                        return await _dispatch(method, path, auth, route, kwargs)
+                except TimeoutError as exc:
+                    if isinstance(exc, DeadlineExceeded):
+                        raise
+                    raise DeadlineExceeded(route) from exc
+
+        async def _dispatch(method: str, path: str, auth: bool, route: Optional[str], kwargs):
+            key = _coalesce_key(self, method, path, auth, kwargs)
+            if key is None:
+                return await _call(method, path, auth, route, kwargs)
+            leader = False
+
+            async def lead():
+                nonlocal leader
+                leader = True
+                resp = await _call(method, path, auth, route, kwargs)
+                if getattr(resp, "_gozarpay_memo", None) is None:
+                    resp._gozarpay_memo = SharedDecode()  # followers reuse the decode
+                return resp
+
+            resp = await self._inflight.do(key, lead)
+            if not leader and self._hooks is not None:
+                self._hooks.on_coalesced(route)
+            return resp
+
+        return _request
+
+
+def _httpx_transport(transport: Optional[Transport]) -> Any:
+    if transport is None:
+        return None
+    as_httpx = getattr(transport, "as_httpx", None)
+    if as_httpx is None:
+        raise TypeError(
+            f"AsyncClient cannot use {type(transport).__name__}; pass http_client= "
+            "or a transport with as_httpx() (e.g. InMemoryTransport)"
+        )
+    return as_httpx()
+
+
+async def _asend(
+    http: "httpx.AsyncClient",
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    kwargs: Dict[str, Any],
+):
+    """One httpx call; with `stream=True` it returns once the headers are in."""
+    if not kwargs.get("stream"):
+        return await http.request(method, url, headers=headers, **kwargs)
+    kwargs = {k: v for k, v in kwargs.items() if k != "stream"}
+    request = http.build_request(method, url, headers=headers, **kwargs)
+    return await http.send(request, stream=True)
+
+
+async def _atraced(
+    hooks: Hooks,
+    http: "httpx.AsyncClient",
+    route: Optional[str],
+    method: str,
+    url: str,
+    attempt: int,
+    headers: Dict[str, str],
+    kwargs: Dict[str, Any],
+):
+    marks: Dict[str, float] = {}
+
+    async def trace(event: str, info: Any) -> None:
+        # httpcore phases, e.g. "connection.connect_tcp.started",
+        # "http11.receive_response_headers.complete"
+        marks[event] = time.perf_counter()
+
+    extensions = {**(kwargs.get("extensions") or {}), "trace": trace}
+    hooks.on_request_start(route, method, url, attempt)
+    info = RequestInfo(route, method, url, attempt)
+    start = time.perf_counter()
+    try:
+        resp = await _asend(http, method, url, headers, {**kwargs, "extensions": extensions})
+    except BaseException as exc:
+        info.error = exc
+        info.wait = info.total = time.perf_counter() - start
+        hooks.on_request_end(info)
+        raise
+    end = time.perf_counter()
+    info.total = end - start
+    headers_at = marks.get("http11.receive_response_headers.complete") or marks.get(
+        "http2.receive_response_headers.complete"
+    )
+    info.wait = (headers_at - start) if headers_at else info.total
+    info.download = info.total - info.wait
+    if headers_at:
+        opened = marks.get("connection.start_tls.complete") or marks.get(
+            "connection.connect_tcp.complete"
+        )
+        started = marks.get("connection.connect_tcp.started")
+        info.connect = (opened - started) if opened and started else 0.0
+    info.status = resp.status_code
+    info.bytes_out = body_size(resp.request.content)
+    info.bytes_in = response_size(resp, bool(kwargs.get("stream")))
+    resp._gozarpay_trace = (hooks, route)  # picked up by decoding.decode
+    hooks.on_request_end(info)
+    return resp
+
+
+# Developer-friendly alias
+AsyncGozarPayClient = AsyncClient
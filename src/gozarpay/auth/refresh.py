@@ -0,0 +1,116 @@
+from __future__ import annotations
+import base64
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional, Set
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+# Hard refresh when the token has less than this left (seconds).
+REFRESH_MARGIN = 30.0
+# Background refresh starts this long before expiry (seconds).
+REFRESH_AHEAD = 120.0
+# Fallback lifetime when the access token is not a JWT with an `exp` claim.
+TOKEN_TTL = 50 * 60
+
+
+def jwt_exp(token: Optional[str]) -> Optional[float]:
+    """Return the `exp` claim of a JWT (unverified), or None if not decodable."""
+    if not token or token.count(".") != 2:
+        return None
+    payload = token.split(".")[1]
+    try:
+        raw = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        exp = json.loads(raw).get("exp")
+    except (ValueError, AttributeError):
+        return None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+def token_expiry(token: Optional[str], now: Optional[float] = None) -> float:
+    """Absolute expiry for `token`: JWT `exp` when present, else now + TOKEN_TTL."""
+    exp = jwt_exp(token)
+    if exp is not None:
+        return exp
+    return (now if now is not None else time.time()) + TOKEN_TTL
+
+
+def due(expires_at: Optional[float], within: float, now: Optional[float] = None) -> bool:
+    """True when a token expiring at `expires_at` has less than `within` seconds left."""
+    if expires_at is None:
+        return False
+    return (now if now is not None else time.time()) >= expires_at - within
+
+
+class RefreshCoordinator:
+    """
+    Single-flight guard for token renewal (thread-safe).
+    - `run` blocks callers behind one renewal; late arrivals skip it if `is_fresh()`.
+    - `run_in_background` starts a renewal on a daemon thread unless one is in flight.
+    """
+
+    __slots__ = ("_lock",)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def run(self, renew: Callable[[], None], is_fresh: Callable[[], bool]) -> None:
+        with self._lock:
+            if is_fresh():
+                return
+            renew()
+
+    def run_in_background(self, renew: Callable[[], None]) -> None:
+        if not self._lock.acquire(blocking=False):
+            return  # a renewal is already running; its result will be shared
+
+        def _task() -> None:
+            try:
+                renew()
+            except Exception:
+                pass  # the hot path falls back to a blocking renewal near expiry
+            finally:
+                self._lock.release()
+
+        threading.Thread(target=_task, name="gozarpay-token-refresh", daemon=True).start()
+
+
+class AsyncRefreshCoordinator:
+    """asyncio twin of `RefreshCoordinator` (one renewal task per event loop)."""
+
+    __slots__ = ("_lock", "_tasks")
+
+    def __init__(self) -> None:
+        import asyncio  # deferred: sync-only users never load asyncio
+
+        self._lock = asyncio.Lock()
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+
+    async def run(
+        self, renew: Callable[[], Awaitable[None]], is_fresh: Callable[[], bool]
+    ) -> None:
+        async with self._lock:
+            if is_fresh():
+                return
+            await renew()
+
+    def run_in_background(self, renew: Callable[[], Awaitable[None]]) -> None:
+        if self._lock.locked():
+            return
+
+        async def _task() -> None:
+            if self._lock.locked():
+                return
+            async with self._lock:
+                try:
+                    await renew()
+                except Exception:
+                    pass
+
+        import asyncio
+
+        task = asyncio.get_running_loop().create_task(_task())
+        self._tasks.add(task)  # keep a strong reference until done
+        task.add_done_callback(self._tasks.discard)
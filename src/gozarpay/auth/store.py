@@ -0,0 +1,213 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Protocol
+from ..locks import FileLock
+
+
+@dataclass(frozen=True, slots=True)
+class TokenState:
+    """One access/refresh token pair and the access token's absolute expiry."""
+
+    access_token: str
+    refresh_token: Optional[str] = None
+    access_expires_at: Optional[float] = None
+
+
+class StoreLock(Protocol):
+    def acquire(self) -> Any: ...
+    def release(self) -> None: ...
+    def __enter__(self) -> Any: ...
+    def __exit__(self, *exc_info: Any) -> Any: ...
+
+
+class TokenStore(ABC):
+    """
+    Shared token cache used by ApiKeyAuth/TokenAuth.
+    Callers hold `lock(key)` around `load` + renew + `save`, so only one holder
+    (thread or process, depending on the backend) refreshes a key at a time.
+    A backend may hand out one lock for all keys (e.g. when `save` rewrites the
+    whole map), at the cost of serializing renewals of unrelated credentials.
+    """
+
+    @abstractmethod
+    def lock(self, key: Optional[str] = None) -> StoreLock: ...
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[TokenState]: ...
+
+    @abstractmethod
+    def save(self, key: str, state: TokenState) -> None: ...
+
+
+def store_key(*secrets: str) -> str:
+    """
+    Stable, non-reversible store key for a credential: a refresh token, or
+    api_key + secret_key (so a wrong secret never maps to a stored token).
+    """
+    return hashlib.sha256("\0".join(secrets).encode()).hexdigest()[:32]
+
+
+class MemoryTokenStore(TokenStore):
+    """
+    In-process store: shares tokens between clients/threads of one process.
+    Locks are per key, so logins of different credentials (e.g. ClientPool
+    tenants) run in parallel.
+    """
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._locks: Dict[Optional[str], threading.Lock] = {}
+        self._states: Dict[str, TokenState] = {}
+
+    def __reduce__(self) -> Any:
+        # Process-local by definition: a pickled copy starts empty.
+        return (MemoryTokenStore, ())
+
+    def lock(self, key: Optional[str] = None) -> StoreLock:
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def load(self, key: str) -> Optional[TokenState]:
+        return self._states.get(key)
+
+    def save(self, key: str, state: TokenState) -> None:
+        self._states[key] = state
+
+
+class FileTokenStore(TokenStore):
+    """
+    JSON file on local disk, guarded by `<path>.lock` (flock).
+    Writes are atomic (temp file + rename) and the file is created 0600.
+    One lock covers every key: `save` rewrites the whole file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self._lock = FileLock(self.path + ".lock")
+
+    def lock(self, key: Optional[str] = None) -> StoreLock:
+        return self._lock
+
+    def load(self, key: str) -> Optional[TokenState]:
+        return _decode_state(self._read_all().get(key))
+
+    def save(self, key: str, state: TokenState) -> None:
+        states = self._read_all()
+        states[key] = asdict(state)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".gozarpay-")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                json.dump(states, fh)
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _read_all(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as fh:
+                data = json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+class SharedMemoryTokenStore(TokenStore):
+    """
+    POSIX shared-memory segment (`multiprocessing.shared_memory`) holding a
+    length-prefixed JSON map; cross-process exclusion via a lock file in tmp.
+    The first process creates the segment, the others attach to it; the
+    segment outlives worker restarts until `unlink()` (or reboot).
+    """
+
+    _HEADER = struct.Struct("<I")
+
+    def __init__(self, name: str = "gozarpay-tokens", size: int = 64 * 1024) -> None:
+        from multiprocessing import shared_memory
+
+        self.name = name
+        self._lock = FileLock(os.path.join(tempfile.gettempdir(), f"{name}.lock"))
+        with self._lock:
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+                self._HEADER.pack_into(self._shm.buf, 0, 0)
+            except FileExistsError:
+                self._shm = shared_memory.SharedMemory(name=name)
+        _untrack(self._shm)
+
+    def __reduce__(self) -> Any:
+        return (SharedMemoryTokenStore, (self.name, self._shm.size))
+
+    def lock(self, key: Optional[str] = None) -> StoreLock:
+        return self._lock
+
+    def load(self, key: str) -> Optional[TokenState]:
+        return _decode_state(self._read_all().get(key))
+
+    def save(self, key: str, state: TokenState) -> None:
+        states = self._read_all()
+        states[key] = asdict(state)
+        raw = json.dumps(states).encode()
+        if self._HEADER.size + len(raw) > self._shm.size:
+            raise ValueError(f"Token map exceeds shared memory size ({self._shm.size} bytes)")
+        buf = self._shm.buf
+        buf[self._HEADER.size : self._HEADER.size + len(raw)] = raw
+        self._HEADER.pack_into(buf, 0, len(raw))
+
+    def close(self) -> None:
+        self._shm.close()
+
+    def unlink(self) -> None:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.register(self._shm._name, "shared_memory")  # undo _untrack
+        self._shm.unlink()
+
+    def _read_all(self) -> Dict[str, Any]:
+        (length,) = self._HEADER.unpack_from(self._shm.buf, 0)
+        if not length:
+            return {}
+        start = self._HEADER.size
+        try:
+            data = json.loads(bytes(self._shm.buf[start : start + length]))
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+def _decode_state(raw: Any) -> Optional[TokenState]:
+    if not isinstance(raw, dict) or not raw.get("access_token"):
+        return None
+    return TokenState(
+        access_token=raw["access_token"],
+        refresh_token=raw.get("refresh_token"),
+        access_expires_at=raw.get("access_expires_at"),
+    )
+
+
+def _untrack(shm: Any) -> None:
+    # Exiting workers must not unlink the shared segment (bpo-39959).
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:  # pragma: no cover
+        pass
+
+
+def store_from_url(url: str) -> TokenStore:
+    """`shm://<name>` → SharedMemoryTokenStore, anything else → FileTokenStore(path)."""
+    if url.startswith("shm://"):
+        return SharedMemoryTokenStore(url[len("shm://") :] or "gozarpay-tokens")
+    return FileTokenStore(url)
@@ -1,15 +1,45 @@
 from __future__ import annotations
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Dict, Optional
 import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, Tuple
 import requests
 from ..exceptions import AuthenticationError
+from .refresh import (
+    REFRESH_AHEAD,
+    REFRESH_MARGIN,
+    AsyncRefreshCoordinator,
+    RefreshCoordinator,
+    due,
+    jwt_exp,
+    token_expiry,
+)
+from .store import TokenState, TokenStore, store_key
+from ..hooks import Hooks
+
+if TYPE_CHECKING:  # pragma: no cover
+    import httpx
+
+LOGIN_PATH = "/tp/v1/usr/api-login/"
+REFRESH_PATH = "/tp/v1/usr/refresh-token/"
 
 
 class AuthStrategy(ABC):
     """Auth strategy interface."""
 
+    def bind(self, session: requests.Session) -> None:
+        """Optional: receive the Client's pooled session for token calls."""
+
+    def instrument(self, hooks: Optional[Hooks]) -> None:
+        """Optional: receive the Client's hooks (auth refresh events)."""
+
+    def identity(self) -> str:
+        """Stable id of the credentials (keys coalesced calls); "" = anonymous."""
+        return ""
+
+    def after_fork(self) -> None:
+        """Optional: reset thread state in a forked child (tokens are kept)."""
+
     @abstractmethod
     def attach(self, headers: Dict[str, str]) -> Dict[str, str]:
         """Return headers with auth information, if any."""
@@ -32,11 +62,45 @@ class TokenAuth(AuthStrategy):
     access_token: str
     refresh_token: Optional[str] = None
     access_expires_at: Optional[float] = None
+    refresh_ahead: float = REFRESH_AHEAD
+    store: Optional[TokenStore] = None
+    _session: Optional[requests.Session] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _refresher: RefreshCoordinator = field(
+        default_factory=RefreshCoordinator, init=False, repr=False, compare=False
+    )
+    _hooks: Optional[Hooks] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.access_expires_at is None:
+            self.access_expires_at = jwt_exp(self.access_token)
+
+    def bind(self, session: requests.Session) -> None:
+        self._session = session
+
+    def instrument(self, hooks: Optional[Hooks]) -> None:
+        self._hooks = hooks
+
+    def identity(self) -> str:
+        return store_key(self.refresh_token or self.access_token)
+
+    def after_fork(self) -> None:
+        # A parent thread may have held the refresh lock at fork time.
+        self._refresher = RefreshCoordinator()
 
     def attach(self, headers: Dict[str, str]) -> Dict[str, str]:
-        if self.access_expires_at and time.time() >= self.access_expires_at - 30:
-            # naive TTL; optional improvement: decode JWT exp
-            pass
+        if self.refresh_token and due(self.access_expires_at, self.refresh_ahead):
+            if due(self.access_expires_at, REFRESH_MARGIN):
+                stale = self.access_token
+                try:
+                    self._refresher.run(
+                        self._renew, lambda: self.access_token != stale
+                    )
+                except AuthenticationError:
+                    pass  # send the current token; the 401 path reports failure
+            else:
+                self._refresher.run_in_background(self._renew)
         headers = dict(headers or {})
         headers["Authorization"] = f"Bearer {self.access_token}"
         return headers
@@ -44,18 +108,27 @@ class TokenAuth(AuthStrategy):
     def on_401_and_retry(self, session: requests.Session) -> bool:
         if not self.refresh_token:
             return False
-        url = f"{self.base_url.rstrip('/')}/tp/v1/usr/refresh-token/"
-        resp = session.post(url, json={"refresh": self.refresh_token})
-        if resp.status_code != 200:
-            return False
-        data = resp.json()
-        access = data.get("access")
-        if not access:
+        stale = self.access_token
+        try:
+            self._refresher.run(
+                lambda: self._renew(session), lambda: self.access_token != stale
+            )
+        except AuthenticationError:
             return False
-        self.access_token = access
-        self.access_expires_at = time.time() + 50 * 60
         return True
 
+    def _renew(self, session: Optional[requests.Session] = None) -> None:
+        key = store_key(self.refresh_token or "")
+        _renew_shared(self, key, lambda: self._refresh(session))
+
+    def _refresh(self, session: Optional[requests.Session] = None) -> None:
+        s = session or self._session or requests.Session()
+        url = f"{self.base_url.rstrip('/')}{REFRESH_PATH}"
+        resp = s.post(url, json={"refresh": self.refresh_token})
+        access = _refreshed_access(resp)
+        self.access_token = access
+        self.access_expires_at = token_expiry(access)
+
 
 @dataclass(slots=True)
 class ApiKeyAuth(AuthStrategy):
@@ -65,55 +138,404 @@ class ApiKeyAuth(AuthStrategy):
     access_token: Optional[str] = None
     refresh_token: Optional[str] = None
     access_expires_at: Optional[float] = None
+    refresh_ahead: float = REFRESH_AHEAD
+    store: Optional[TokenStore] = None
+    _session: Optional[requests.Session] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _refresher: RefreshCoordinator = field(
+        default_factory=RefreshCoordinator, init=False, repr=False, compare=False
+    )
+    _hooks: Optional[Hooks] = field(default=None, init=False, repr=False, compare=False)
+
+    def bind(self, session: requests.Session) -> None:
+        self._session = session
+
+    def instrument(self, hooks: Optional[Hooks]) -> None:
+        self._hooks = hooks
+
+    def identity(self) -> str:
+        return store_key(self.api_key, self.secret_key)
+
+    def after_fork(self) -> None:
+        self._refresher = RefreshCoordinator()
 
     def attach(self, headers: Dict[str, str]) -> Dict[str, str]:
-        if not self.access_token:
-            self._login()
-        if self.access_expires_at and time.time() >= self.access_expires_at - 30:
-            self._refresh()
+        if not self.access_token or due(self.access_expires_at, REFRESH_MARGIN):
+            stale = self.access_token
+            self._refresher.run(
+                self._renew,
+                lambda: self.access_token is not None and self.access_token != stale,
+            )
+        elif due(self.access_expires_at, self.refresh_ahead):
+            self._refresher.run_in_background(self._renew)
         headers = dict(headers or {})
         headers["Authorization"] = f"Bearer {self.access_token}"
         return headers
 
     def on_401_and_retry(self, session: requests.Session) -> bool:
+        stale = self.access_token
         try:
-            self._refresh(session=session)
+            self._refresher.run(
+                lambda: self._renew(session), lambda: self.access_token != stale
+            )
             return True
         except AuthenticationError:
             return False
 
+    def _renew(self, session: Optional[requests.Session] = None) -> None:
+        _renew_shared(self, self.identity(), lambda: self._obtain(session))
+
+    def _obtain(self, session: Optional[requests.Session] = None) -> None:
+        """Refresh if possible; fall back to a fresh login with the API keys."""
+        if self.access_token and self.refresh_token:
+            try:
+                self._refresh(session=session)
+                return
+            except AuthenticationError:
+                pass
+        self._login(session=session)
+
     def _login(self, session: Optional[requests.Session] = None) -> None:
-        s = session or requests.Session()
-        url = f"{self.base_url.rstrip('/')}/tp/v1/usr/api-login/"
+        s = session or self._session or requests.Session()
+        url = f"{self.base_url.rstrip('/')}{LOGIN_PATH}"
         resp = s.post(
             url, json={"api_key": self.api_key, "secret_key": self.secret_key}
         )
-        if resp.status_code != 200:
-            raise AuthenticationError(
-                f"Failed API login: {resp.status_code} {resp.text}"
-            )
-        data = resp.json()
-        access = data.get("access_token") or data.get("token")
-        refresh = data.get("refresh_token")
-        if not access or not refresh:
-            raise AuthenticationError("Login response missing access/refresh tokens")
-        self.access_token = access
-        self.refresh_token = refresh
-        self.access_expires_at = time.time() + 50 * 60
+        self.access_token, self.refresh_token = _login_tokens(resp)
+        self.access_expires_at = token_expiry(self.access_token)
 
     def _refresh(self, session: Optional[requests.Session] = None) -> None:
         if not self.refresh_token:
             raise AuthenticationError("No refresh token present.")
-        s = session or requests.Session()
-        url = f"{self.base_url.rstrip('/')}/tp/v1/usr/refresh-token/"
+        s = session or self._session or requests.Session()
+        url = f"{self.base_url.rstrip('/')}{REFRESH_PATH}"
         resp = s.post(url, json={"refresh": self.refresh_token})
-        if resp.status_code != 200:
-            raise AuthenticationError(
-                f"Failed to refresh token: {resp.status_code} {resp.text}"
+        self.access_token = _refreshed_access(resp)
+        self.access_expires_at = token_expiry(self.access_token)
+
+
+# ---- asyncio counterparts (used by AsyncClient) ----
+
+
+class AsyncAuthStrategy(ABC):
+    """Async auth strategy interface; `bind` hands over the client's pool."""
+
+    def bind(self, http: "httpx.AsyncClient") -> None:
+        """Optional: receive the AsyncClient's pooled HTTP client."""
+
+    def instrument(self, hooks: Optional[Hooks]) -> None:
+        """Optional: receive the AsyncClient's hooks (auth refresh events)."""
+
+    def identity(self) -> str:
+        """Stable id of the credentials (keys coalesced calls); "" = anonymous."""
+        return ""
+
+    @abstractmethod
+    async def attach(self, headers: Dict[str, str]) -> Dict[str, str]:
+        """Return headers with auth information, if any."""
+        ...
+
+    async def on_401_and_retry(self, http: "httpx.AsyncClient") -> bool:
+        """Optional: handle 401 once (e.g., refresh). Return True to retry."""
+        return False
+
+
+@dataclass(slots=True)
+class AsyncNoAuth(AsyncAuthStrategy):
+    async def attach(self, headers: Dict[str, str]) -> Dict[str, str]:
+        return headers
+
+
+@dataclass(slots=True)
+class AsyncTokenAuth(AsyncAuthStrategy):
+    base_url: str
+    access_token: str
+    refresh_token: Optional[str] = None
+    access_expires_at: Optional[float] = None
+    refresh_ahead: float = REFRESH_AHEAD
+    store: Optional[TokenStore] = None
+    _http: Optional["httpx.AsyncClient"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _refresher: AsyncRefreshCoordinator = field(
+        default_factory=AsyncRefreshCoordinator, init=False, repr=False, compare=False
+    )
+    _hooks: Optional[Hooks] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.access_expires_at is None:
+            self.access_expires_at = jwt_exp(self.access_token)
+
+    def bind(self, http: "httpx.AsyncClient") -> None:
+        self._http = http
+
+    def instrument(self, hooks: Optional[Hooks]) -> None:
+        self._hooks = hooks
+
+    def identity(self) -> str:
+        return store_key(self.refresh_token or self.access_token)
+
+    async def attach(self, headers: Dict[str, str]) -> Dict[str, str]:
+        if self.refresh_token and due(self.access_expires_at, self.refresh_ahead):
+            if due(self.access_expires_at, REFRESH_MARGIN):
+                stale = self.access_token
+                try:
+                    await self._refresher.run(
+                        self._renew, lambda: self.access_token != stale
+                    )
+                except AuthenticationError:
+                    pass  # send the current token; the 401 path reports failure
+            else:
+                self._refresher.run_in_background(self._renew)
+        headers = dict(headers or {})
+        headers["Authorization"] = f"Bearer {self.access_token}"
+        return headers
+
+    async def on_401_and_retry(self, http: "httpx.AsyncClient") -> bool:
+        if not self.refresh_token:
+            return False
+        stale = self.access_token
+        try:
+            await self._refresher.run(
+                lambda: self._renew(http), lambda: self.access_token != stale
             )
-        data = resp.json()
-        access = data.get("access")
-        if not access:
-            raise AuthenticationError("Refresh response missing access token")
+        except AuthenticationError:
+            return False
+        return True
+
+    async def _renew(self, http: Optional["httpx.AsyncClient"] = None) -> None:
+        await _arenew_shared(
+            self, store_key(self.refresh_token or ""), lambda: self._refresh(http)
+        )
+
+    async def _refresh(self, http: Optional["httpx.AsyncClient"] = None) -> None:
+        url = f"{self.base_url.rstrip('/')}{REFRESH_PATH}"
+        resp = await _apost(http or self._http, url, {"refresh": self.refresh_token})
+        access = _refreshed_access(resp)
         self.access_token = access
-        self.access_expires_at = time.time() + 50 * 60
+        self.access_expires_at = token_expiry(access)
+
+
+@dataclass(slots=True)
+class AsyncApiKeyAuth(AsyncAuthStrategy):
+    base_url: str
+    api_key: str
+    secret_key: str
+    access_token: Optional[str] = None
+    refresh_token: Optional[str] = None
+    access_expires_at: Optional[float] = None
+    refresh_ahead: float = REFRESH_AHEAD
+    store: Optional[TokenStore] = None
+    _http: Optional["httpx.AsyncClient"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _refresher: AsyncRefreshCoordinator = field(
+        default_factory=AsyncRefreshCoordinator, init=False, repr=False, compare=False
+    )
+    _hooks: Optional[Hooks] = field(default=None, init=False, repr=False, compare=False)
+
+    def bind(self, http: "httpx.AsyncClient") -> None:
+        self._http = http
+
+    def instrument(self, hooks: Optional[Hooks]) -> None:
+        self._hooks = hooks
+
+    def identity(self) -> str:
+        return store_key(self.api_key, self.secret_key)
+
+    async def attach(self, headers: Dict[str, str]) -> Dict[str, str]:
+        if not self.access_token or due(self.access_expires_at, REFRESH_MARGIN):
+            stale = self.access_token
+            await self._refresher.run(
+                self._renew,
+                lambda: self.access_token is not None and self.access_token != stale,
+            )
+        elif due(self.access_expires_at, self.refresh_ahead):
+            self._refresher.run_in_background(self._renew)
+        headers = dict(headers or {})
+        headers["Authorization"] = f"Bearer {self.access_token}"
+        return headers
+
+    async def on_401_and_retry(self, http: "httpx.AsyncClient") -> bool:
+        stale = self.access_token
+        try:
+            await self._refresher.run(
+                lambda: self._renew(http), lambda: self.access_token != stale
+            )
+            return True
+        except AuthenticationError:
+            return False
+
+    async def _renew(self, http: Optional["httpx.AsyncClient"] = None) -> None:
+        await _arenew_shared(self, self.identity(), lambda: self._obtain(http))
+
+    async def _obtain(self, http: Optional["httpx.AsyncClient"] = None) -> None:
+        """Refresh if possible; fall back to a fresh login with the API keys."""
+        if self.access_token and self.refresh_token:
+            try:
+                await self._refresh(http)
+                return
+            except AuthenticationError:
+                pass
+        await self._login(http)
+
+    async def _login(self, http: Optional["httpx.AsyncClient"] = None) -> None:
+        url = f"{self.base_url.rstrip('/')}{LOGIN_PATH}"
+        resp = await _apost(
+            http or self._http,
+            url,
+            {"api_key": self.api_key, "secret_key": self.secret_key},
+        )
+        self.access_token, self.refresh_token = _login_tokens(resp)
+        self.access_expires_at = token_expiry(self.access_token)
+
+    async def _refresh(self, http: Optional["httpx.AsyncClient"] = None) -> None:
+        if not self.refresh_token:
+            raise AuthenticationError("No refresh token present.")
+        url = f"{self.base_url.rstrip('/')}{REFRESH_PATH}"
+        resp = await _apost(http or self._http, url, {"refresh": self.refresh_token})
+        self.access_token = _refreshed_access(resp)
+        self.access_expires_at = token_expiry(self.access_token)
+
+
+async def _apost(
+    http: Optional["httpx.AsyncClient"], url: str, payload: Dict[str, Any]
+) -> Any:
+    if http is not None:
+        return await http.post(url, json=payload)
+    import httpx
+
+    async with httpx.AsyncClient() as tmp:
+        return await tmp.post(url, json=payload)
+
+
+# ---- shared token store coordination ----
+
+
+def _adopt(auth: Any, state: Optional[TokenState]) -> bool:
+    """Take over a token another worker stored, if it is newer and still usable."""
+    if (
+        state is None
+        or state.access_token == auth.access_token
+        or due(state.access_expires_at, REFRESH_MARGIN)
+    ):
+        return False
+    auth.access_token = state.access_token
+    auth.refresh_token = state.refresh_token or auth.refresh_token
+    auth.access_expires_at = state.access_expires_at
+    return True
+
+
+def _snapshot(auth: Any) -> TokenState:
+    return TokenState(auth.access_token, auth.refresh_token, auth.access_expires_at)
+
+
+def _renew_shared(auth: Any, key: str, renew: Callable[[], None]) -> None:
+    """Run `renew` under the store lock unless another process already did."""
+    if auth._hooks is not None:
+        renew = _traced_renew(auth._hooks, renew)
+    store: Optional[TokenStore] = auth.store
+    if store is None:
+        renew()
+        return
+    with store.lock(key):
+        if _adopt(auth, store.load(key)):
+            return
+        renew()
+        store.save(key, _snapshot(auth))
+
+
+async def _arenew_shared(
+    auth: Any, key: str, renew: Callable[[], Awaitable[None]]
+) -> None:
+    if auth._hooks is not None:
+        renew = _atraced_renew(auth._hooks, renew)
+    store: Optional[TokenStore] = auth.store
+    if store is None:
+        await renew()
+        return
+    lock = store.lock(key)
+    await _aacquire(lock)  # may wait on another process
+    try:
+        if _adopt(auth, store.load(key)):
+            return
+        await renew()
+        store.save(key, _snapshot(auth))
+    finally:
+        lock.release()
+
+
+async def _aacquire(lock: Any) -> None:
+    """
+    `lock.acquire()` on a worker thread. If the waiting task is cancelled
+    (e.g. by a deadline), the thread still gets the lock: it is then released
+    right away instead of staying held for good.
+    """
+    import asyncio
+
+    acquiring = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+
+    def release_orphan(fut: "asyncio.Future[Any]") -> None:
+        if not fut.cancelled() and fut.exception() is None:
+            lock.release()
+
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        acquiring.add_done_callback(release_orphan)
+        raise
+
+
+def _traced_renew(hooks: Hooks, renew: Callable[[], None]) -> Callable[[], None]:
+    def traced() -> None:
+        start = time.perf_counter()
+        try:
+            renew()
+        except BaseException as exc:
+            hooks.on_auth_refresh(time.perf_counter() - start, exc)
+            raise
+        hooks.on_auth_refresh(time.perf_counter() - start, None)
+
+    return traced
+
+
+def _atraced_renew(
+    hooks: Hooks, renew: Callable[[], Awaitable[None]]
+) -> Callable[[], Awaitable[None]]:
+    async def traced() -> None:
+        start = time.perf_counter()
+        try:
+            await renew()
+        except BaseException as exc:
+            hooks.on_auth_refresh(time.perf_counter() - start, exc)
+            raise
+        hooks.on_auth_refresh(time.perf_counter() - start, None)
+
+    return traced
+
+
+# ---- token response parsing (shared by sync & async strategies) ----
+
+
+def _login_tokens(resp: Any) -> Tuple[str, str]:
+    if resp.status_code != 200:
+        raise AuthenticationError(f"Failed API login: {resp.status_code} {resp.text}")
+    data = resp.json()
+    access = data.get("access_token") or data.get("token")
+    refresh = data.get("refresh_token")
+    if not access or not refresh:
+        raise AuthenticationError("Login response missing access/refresh tokens")
+    return access, refresh
+
+
+def _refreshed_access(resp: Any) -> str:
+    if resp.status_code != 200:
+        raise AuthenticationError(
+            f"Failed to refresh token: {resp.status_code} {resp.text}"
+        )
+    data = resp.json()
+    access = data.get("access")
+    if not access:
+        raise AuthenticationError("Refresh response missing access token")
+    return access
@@ -0,0 +1,108 @@
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+P = TypeVar("P")
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class BatchItemResult(Generic[T]):
+    """Outcome of one batch item, in input order; `key` is its reference_id."""
+
+    key: str
+    value: Optional[T] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_batch(
+    items: Iterable[Tuple[str, P]],
+    send: Callable[[P], T],
+    *,
+    max_workers: int = 8,
+) -> List[BatchItemResult[T]]:
+    """
+    Run `send(payload)` for `(key, payload)` items on a bounded thread pool.
+    - items sharing a key send once (the first one's payload); every duplicate
+      gets that result, also when it comes after the send completed
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    results: List[Optional[BatchItemResult[T]]] = []
+    settled: Dict[str, BatchItemResult[T]] = {}  # kept for the whole batch
+    waiting: Dict[str, List[int]] = {}  # key -> input indexes awaiting its send
+    inflight: Dict[Future, str] = {}
+
+    def settle(done: Iterable[Future]) -> None:
+        for fut in done:
+            key = inflight.pop(fut)
+            exc = fut.exception()
+            result: BatchItemResult[T] = (
+                BatchItemResult(key, error=exc)  # type: ignore[arg-type]
+                if exc is not None
+                else BatchItemResult(key, value=fut.result())
+            )
+            settled[key] = result
+            for index in waiting.pop(key):
+                results[index] = result
+
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="gozarpay-batch") as pool:
+        for key, payload in items:
+            results.append(settled.get(key))
+            if key in settled:
+                continue
+            if key in waiting:
+                waiting[key].append(len(results) - 1)
+                continue
+            if len(inflight) >= max_workers * 2:
+                settle(wait(inflight, return_when=FIRST_COMPLETED).done)
+            waiting[key] = [len(results) - 1]
+            inflight[pool.submit(send, payload)] = key
+        while inflight:
+            settle(wait(inflight, return_when=FIRST_COMPLETED).done)
+    return results  # type: ignore[return-value]
+
+
+async def arun_batch(
+    items: Iterable[Tuple[str, P]],
+    send: Callable[[P], Awaitable[T]],
+    *,
+    max_workers: int = 8,
+) -> List[BatchItemResult[T]]:
+    """asyncio twin of `run_batch` (at most `max_workers` sends at a time)."""
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    import asyncio
+
+    gate = asyncio.Semaphore(max_workers)
+    keys: List[str] = []
+    first: Dict[str, P] = {}  # one send per key, with its first payload
+    for key, payload in items:
+        keys.append(key)
+        first.setdefault(key, payload)
+
+    async def one(key: str, payload: P) -> BatchItemResult[T]:
+        async with gate:
+            try:
+                return BatchItemResult(key, value=await send(payload))
+            except Exception as exc:
+                return BatchItemResult(key, error=exc)
+
+    settled = await asyncio.gather(*(one(key, payload) for key, payload in first.items()))
+    by_key = {result.key: result for result in settled}
+    return [by_key[key] for key in keys]
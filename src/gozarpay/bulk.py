@@ -0,0 +1,217 @@
+from __future__ import annotations
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (`q` in 0..100) of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+@dataclass(frozen=True, slots=True)
+class BulkStats:
+    """End-of-run summary; latencies are per key (all pages), in seconds."""
+
+    keys: int
+    succeeded: int
+    failed: int
+    items: int
+    elapsed: float
+    throughput: float  # keys per second
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+    @classmethod
+    def build(
+        cls, latencies: List[float], failed: int, items: int, elapsed: float
+    ) -> "BulkStats":
+        lat = sorted(latencies)
+        keys = len(lat)
+        return cls(
+            keys=keys,
+            succeeded=keys - failed,
+            failed=failed,
+            items=items,
+            elapsed=elapsed,
+            throughput=keys / elapsed if elapsed > 0 else 0.0,
+            p50=percentile(lat, 50),
+            p95=percentile(lat, 95),
+            p99=percentile(lat, 99),
+            max=lat[-1] if lat else 0.0,
+        )
+
+
+class BulkRun(Generic[K, V]):
+    """
+    Run `work(key)` for many keys on a bounded thread pool.
+    - Iterating yields `(key, value)` pairs as each key completes (any order).
+    - A failing key is recorded in `errors` instead of aborting the batch.
+    - `stats` is filled in once iteration ends.
+    - `executor` runs the work elsewhere (e.g. a process pool, where `work`
+      must be picklable); it is left open afterwards.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[K],
+        work: Callable[[K], List[V]],
+        *,
+        max_workers: int = 8,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self._keys = keys
+        self._work = work
+        self._executor = executor
+        self.max_workers = max_workers
+        self.errors: Dict[K, Exception] = {}
+        self.stats: Optional[BulkStats] = None
+
+    def __iter__(self) -> Iterator[Tuple[K, V]]:
+        keys = iter(self._keys)
+        latencies: List[float] = []
+        items = 0
+        started = time.perf_counter()
+        pool = self._executor or ThreadPoolExecutor(
+            self.max_workers, thread_name_prefix="gozarpay-bulk"
+        )
+        inflight: Dict[Future, K] = {}
+
+        def refill() -> None:
+            # Keep the queue short: memory stays flat for huge key streams.
+            while len(inflight) < self.max_workers * 2:
+                key = next(keys, _END)
+                if key is _END:
+                    return
+                inflight[pool.submit(_timed, self._work, key)] = key
+
+        try:
+            refill()
+            while inflight:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    key = inflight.pop(fut)
+                    try:
+                        elapsed, result = fut.result()
+                    except Exception as exc:  # e.g. a process-pool worker died
+                        elapsed, result = 0.0, exc
+                    latencies.append(elapsed)
+                    if isinstance(result, Exception):
+                        self.errors[key] = result
+                        continue
+                    items += len(result)  # type: ignore[arg-type]
+                    for value in result:  # type: ignore[attr-defined]
+                        yield key, value
+                refill()
+        finally:
+            if self._executor is None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            else:
+                for fut in inflight:
+                    fut.cancel()
+            self.stats = BulkStats.build(
+                latencies, len(self.errors), items, time.perf_counter() - started
+            )
+
+
+class AsyncBulkRun(Generic[K, V]):
+    """asyncio twin of `BulkRun` (at most `max_workers` coroutines at a time)."""
+
+    def __init__(
+        self,
+        keys: Iterable[K],
+        work: Callable[[K], Awaitable[List[V]]],
+        *,
+        max_workers: int = 8,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self._keys = keys
+        self._work = work
+        self.max_workers = max_workers
+        self.errors: Dict[K, Exception] = {}
+        self.stats: Optional[BulkStats] = None
+
+    async def _timed(self, key: K) -> Tuple[K, float, object]:
+        start = time.perf_counter()
+        try:
+            result: object = await self._work(key)
+        except Exception as exc:
+            result = exc
+        return key, time.perf_counter() - start, result
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[K, V]]:
+        import asyncio
+
+        keys = iter(self._keys)
+        latencies: List[float] = []
+        items = 0
+        started = time.perf_counter()
+        inflight: set = set()
+
+        def refill() -> None:
+            while len(inflight) < self.max_workers:
+                key = next(keys, _END)
+                if key is _END:
+                    return
+                inflight.add(asyncio.ensure_future(self._timed(key)))
+
+        try:
+            refill()
+            while inflight:
+                done, _ = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+                inflight.difference_update(done)
+                for task in done:
+                    key, elapsed, result = task.result()
+                    latencies.append(elapsed)
+                    if isinstance(result, Exception):
+                        self.errors[key] = result
+                        continue
+                    items += len(result)  # type: ignore[arg-type]
+                    for value in result:  # type: ignore[attr-defined]
+                        yield key, value
+                refill()
+        finally:
+            for task in inflight:
+                task.cancel()
+            self.stats = BulkStats.build(
+                latencies, len(self.errors), items, time.perf_counter() - started
+            )
+
+
+def _timed(work: Callable[[K], List[V]], key: K) -> Tuple[float, object]:
+    # Module level so process pools can pickle it along with `work`.
+    start = time.perf_counter()
+    try:
+        result: object = work(key)
+    except Exception as exc:
+        result = exc
+    return time.perf_counter() - start, result
+
+
+_END = object()
@@ -0,0 +1,375 @@
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    evictions: int = 0
+
+
+_RETRY = object()  # in-flight result telling waiters to load again
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    stored_at: float
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a TTL and optional stale-while-revalidate.
+    - Fresh (age < ttl): served from memory.
+    - Stale (age < ttl + stale_ttl): served from memory while ONE background
+      refresh reloads the entry for every reader.
+    - Missing/expired: concurrent callers share a single load.
+    """
+
+    def __init__(self, ttl: float = 5.0, *, stale_ttl: float = 0.0, max_size: int = 256):
+        if ttl <= 0 or max_size <= 0:
+            raise ValueError("ttl and max_size must be positive")
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._ainflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __reduce__(self) -> Any:
+        # Entries are process-local: a pickled cache arrives empty, same settings.
+        return (_ttl_cache, (self.ttl, self.stale_ttl, self.max_size))
+
+    def _after_fork(self) -> None:
+        # Keep the copied entries; loads in flight belong to the parent's threads.
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._ainflight = {}
+        self._tasks = set()
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    # ---- sync ----
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            state, value = self._lookup(key)
+            if state == "fresh":
+                return value
+            if state == "stale":
+                if key not in self._inflight:
+                    self._inflight[key] = fut = Future()
+                    threading.Thread(
+                        target=self._load, args=(key, loader, fut), daemon=True
+                    ).start()
+                return value
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                self._inflight[key] = fut = Future()
+        if owner:
+            self._load(key, loader, fut)
+        return fut.result()
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], fut: Future) -> None:
+        try:
+            value = loader()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fut.set_exception(exc)
+            return
+        with self._lock:
+            self._store(key, value)
+            self._inflight.pop(key, None)
+        fut.set_result(value)
+
+    # ---- asyncio ----
+
+    async def aget_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        import asyncio
+
+        while True:
+            with self._lock:
+                state, value = self._lookup(key)
+                if state == "fresh":
+                    return value
+                loop = asyncio.get_running_loop()
+                fut = self._ainflight.get(key)
+                owner = fut is None
+                if owner:
+                    self._ainflight[key] = fut = loop.create_future()
+            if state == "stale":
+                if owner:
+                    task = loop.create_task(self._aload(key, loader, fut))
+                    self._tasks.add(task)  # keep a strong reference until done
+                    task.add_done_callback(self._tasks.discard)
+                    fut.add_done_callback(_consume)
+                return value
+            if owner:
+                await self._aload(key, loader, fut)
+            value = await asyncio.shield(fut)
+            if value is not _RETRY:
+                return value
+            # The loading caller was cancelled: the next one in line loads instead
+
+    async def _aload(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], fut: "asyncio.Future[Any]"
+    ) -> None:
+        import asyncio
+
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            with self._lock:
+                self._ainflight.pop(key, None)
+            fut.set_result(_RETRY)  # waiters did not cancel anything: they retry
+            raise
+        except Exception as exc:
+            with self._lock:
+                self._ainflight.pop(key, None)
+            fut.set_exception(exc)
+            return
+        with self._lock:
+            self._store(key, value)
+            self._ainflight.pop(key, None)
+        fut.set_result(value)
+
+    # ---- internals (caller holds self._lock) ----
+
+    def _lookup(self, key: Hashable) -> Tuple[str, Any]:
+        entry = self._data.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if age < self.ttl:
+                self._data.move_to_end(key)
+                self.stats.hits += 1
+                return "fresh", entry.value
+            if age < self.ttl + self.stale_ttl:
+                self._data.move_to_end(key)
+                self.stats.stale_hits += 1
+                return "stale", entry.value
+        self.stats.misses += 1
+        return "miss", None
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self.stats.loads += 1
+        self._data[key] = _Entry(value, time.monotonic())
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+
+def _ttl_cache(ttl: float, stale_ttl: float, max_size: int) -> "TTLCache":
+    return TTLCache(ttl, stale_ttl=stale_ttl, max_size=max_size)
+
+
+def _consume(fut: "asyncio.Future[Any]") -> None:
+    # Background refresh errors are dropped; the stale value keeps serving.
+    if not fut.cancelled():
+        fut.exception()
+
+
+def params_key(*parts: Any, params: Optional[Dict[str, Any]] = None) -> Tuple[Any, ...]:
+    """Normalized, hashable cache key for a route + query params dict."""
+    return (*parts, tuple(sorted((params or {}).items())))
+
+
+# ---- HTTP conditional-request cache (ETag / Last-Modified) ----
+
+DEFAULT_HTTP_CACHE_BYTES = 16 * 1024 * 1024
+_ENTRY_OVERHEAD = 512  # key, validators, response shell
+
+
+@dataclass(slots=True)
+class HTTPCacheStats:
+    revalidated: int = 0  # 304: served the cached body/models
+    misses: int = 0  # no entry, or the server sent a new body
+    stores: int = 0
+    evictions: int = 0
+
+
+@dataclass(slots=True)
+class _HTTPEntry:
+    response: Any  # MemoryResponse replaying the cached 200 (shares the decode memo)
+    etag: Optional[str]
+    last_modified: Optional[str]
+    size: int
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """
+    Validator cache for GETs, shared by a client's services.
+    - Stores responses that carry `ETag` / `Last-Modified` (not `no-store`),
+      together with their decoded models; the next call for the same path and
+      params revalidates with `If-None-Match` / `If-Modified-Since` and a 304
+      returns the cached models without reading or parsing a body.
+    - Entries are keyed by the full URL and the auth identity: hosts and
+      tenants never share them.
+    - LRU, bounded by `max_bytes` (body size plus a small per-entry overhead).
+    - `routes` limits caching to some route keys (default: every GET).
+    Cached results are shared between callers; treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_HTTP_CACHE_BYTES,
+        *,
+        routes: Optional[Iterable[str]] = None,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.routes: Optional[FrozenSet[str]] = (
+            frozenset(routes) if routes is not None else None
+        )
+        self.stats = HTTPCacheStats()
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, _HTTPEntry]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __reduce__(self) -> Any:
+        return (_http_cache, (self.max_bytes, self.routes))
+
+    def _after_fork(self) -> None:
+        # Cached responses carry decode locks a parent thread may hold: start empty.
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def key(
+        self,
+        route: Optional[str],
+        url: str,
+        params: Any,
+        headers: Dict[str, str],
+        identity: Optional[str],
+    ) -> Optional[Hashable]:
+        """
+        Cache key for a GET, or None when the call is not cacheable. `url` is the
+        full URL (base URL included), so clients of different hosts sharing one
+        cache never get each other's entries.
+        """
+        if self.routes is not None and route not in self.routes:
+            return None
+        if params is not None and not isinstance(params, dict):
+            return None
+        return (identity, url, *params_key(params=params), tuple(sorted(headers.items())))
+
+    def lookup(self, key: Hashable) -> Optional[_HTTPEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def revalidated(self, key: Hashable, entry: _HTTPEntry, resp: Any) -> Any:
+        """Handle a 304: refresh validators the server re-sent; return the cached response."""
+        with self._lock:
+            self.stats.revalidated += 1
+            entry.etag = resp.headers.get("ETag") or entry.etag
+            entry.last_modified = resp.headers.get("Last-Modified") or entry.last_modified
+        return entry.response
+
+    def store(self, key: Hashable, resp: Any) -> None:
+        """Remember a 2xx response if it has validators (else drop any old entry)."""
+        from .decoding import SharedDecode
+        from .transport import MemoryResponse
+
+        headers = resp.headers
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        size = len(resp.content) + _ENTRY_OVERHEAD
+        cacheable = (
+            (etag or last_modified)
+            and "no-store" not in (headers.get("Cache-Control") or "")
+            and size <= self.max_bytes
+        )
+        with self._lock:
+            self.stats.misses += 1
+            self._drop(key)
+            if not cacheable:
+                return
+            memo = getattr(resp, "_gozarpay_memo", None) or SharedDecode()
+            resp._gozarpay_memo = memo  # this caller's decode fills the cache
+            replay = MemoryResponse(resp.status_code, resp.content, dict(headers))
+            replay.url = str(resp.url)
+            replay._gozarpay_memo = memo
+            self._data[key] = _HTTPEntry(replay, etag, last_modified, size)
+            self._bytes += size
+            self.stats.stores += 1
+            while self._bytes > self.max_bytes:
+                _, old = self._data.popitem(last=False)
+                self._bytes -= old.size
+                self.stats.evictions += 1
+
+    def invalidate(self, identity: Optional[str] = None) -> None:
+        """Drop everything, or only the entries of one auth identity."""
+        with self._lock:
+            if identity is None:
+                self._data.clear()
+                self._bytes = 0
+                return
+            for key in [k for k in self._data if k[0] == identity]:
+                self._drop(key)
+
+    def _drop(self, key: Hashable) -> None:
+        old = self._data.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+
+
+def _http_cache(max_bytes: int, routes: Optional[FrozenSet[str]]) -> HTTPCache:
+    return HTTPCache(max_bytes, routes=routes)
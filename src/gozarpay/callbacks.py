@@ -0,0 +1,308 @@
+from __future__ import annotations
+import asyncio
+import inspect
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from .decoding import adapter
+from .models import ReceiptCallback, VerifyReceipt
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY = 64 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class CallbackEvent:
+    """One accepted callback, as handed to the receiver's handler."""
+
+    callback: ReceiptCallback
+    verified: Optional[VerifyReceipt]  # receipt.verify result when verify=True
+    received_at: float  # time.time()
+
+
+@dataclass(slots=True)
+class ReceiverStats:
+    received: int = 0
+    accepted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    rejected: int = 0  # queue full: answered 503 so the gateway retries
+    processed: int = 0
+    failed: int = 0
+
+
+class _Seen:
+    """Bounded LRU of delivery keys seen in the last `ttl` seconds."""
+
+    __slots__ = ("max_size", "ttl", "_data")
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def add(self, key: Hashable, now: float) -> bool:
+        """Record `key`; False when it was already seen within the TTL."""
+        seen = self._data.get(key)
+        if seen is not None and now - seen < self.ttl:
+            return False
+        self._data[key] = now
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+
+class CallbackReceiver:
+    """
+    Embeddable asyncio endpoint for receipt callbacks (stdlib HTTP/1.1, keep-alive).
+    - POST (JSON or form body) or GET (query string) on `path` is validated into
+      a ReceiptCallback; anything else is answered 400/404/405.
+    - Repeated deliveries (same reference_id and status within `dedupe_ttl`) are
+      acknowledged but not processed twice; a new status is a new delivery.
+    - Accepted callbacks are acknowledged (200) before any processing and queued;
+      with `queue_size` callbacks waiting the sender gets 503 + Retry-After.
+    - `workers` tasks drain the queue: with `verify=True` each callback is first
+      confirmed via `client.receipt.verify` (an AsyncClient), then
+      `handler(CallbackEvent)` runs (plain or async function).
+    A failed verify/handler calls `on_error(callback, exc)` and forgets the
+    delivery, so the gateway's redelivery is processed again (an `on_error`
+    that raises is logged; the worker keeps going).
+    Already behind another web framework? `start(listen=False)` and feed parsed
+    payloads to `submit()`.
+    """
+
+    def __init__(
+        self,
+        handler: Optional[Callable[[CallbackEvent], Any]] = None,
+        *,
+        client: Any = None,
+        verify: bool = False,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = "/callback",
+        queue_size: int = 10_000,
+        workers: int = 4,
+        dedupe_size: int = 100_000,
+        dedupe_ttl: float = 3600.0,
+        max_body: int = MAX_BODY,
+        on_error: Optional[Callable[[ReceiptCallback, BaseException], Any]] = None,
+    ) -> None:
+        if verify and client is None:
+            raise ValueError("verify=True needs an AsyncClient (client=...)")
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be >= 1")
+        self.handler = handler
+        self.verify = verify
+        self.host = host
+        self.port = port
+        self.path = path
+        self.queue_size = queue_size
+        self.workers = workers
+        self.max_body = max_body
+        self.on_error = on_error
+        self.stats = ReceiverStats()
+        self._client = client
+        self._seen = _Seen(dedupe_size, dedupe_ttl)
+        self._queue: Optional["asyncio.Queue[Tuple[ReceiptCallback, float]]"] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("CallbackReceiver is not listening")
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}{self.path}"
+
+    async def start(self, *, listen: bool = True) -> "CallbackReceiver":
+        """Start the workers and (unless `listen=False`, for `submit()` only) the server."""
+        self._queue = asyncio.Queue(self.queue_size)
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+        if listen:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        return self
+
+    async def join(self) -> None:
+        """Wait until every queued callback has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def aclose(self, *, drain: bool = True) -> None:
+        """Stop listening; by default finish the queued callbacks first."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if drain:
+            await self.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def __aenter__(self) -> "CallbackReceiver":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def submit(self, callback: ReceiptCallback) -> int:
+        """Dedupe and enqueue one callback; returns the HTTP status to answer."""
+        if self._queue is None:
+            raise RuntimeError("CallbackReceiver is not started")
+        key = (callback.reference_id, callback.status)
+        if not self._seen.add(key, time.monotonic()):
+            self.stats.duplicates += 1
+            return 200
+        try:
+            self._queue.put_nowait((callback, time.time()))
+        except asyncio.QueueFull:
+            self._seen.discard(key)  # let the retry in
+            self.stats.rejected += 1
+            return 503
+        self.stats.accepted += 1
+        return 200
+
+    # ---- processing ----
+
+    async def _work(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            callback, received_at = await queue.get()
+            try:
+                verified = None
+                if self.verify:
+                    verified = await self._client.receipt.verify(
+                        reference_id=callback.reference_id
+                    )
+                if self.handler is not None:
+                    result = self.handler(CallbackEvent(callback, verified, received_at))
+                    if inspect.isawaitable(result):
+                        await result
+                self.stats.processed += 1
+            except Exception as exc:
+                self.stats.failed += 1
+                self._seen.discard((callback.reference_id, callback.status))
+                if self.on_error is not None:
+                    try:
+                        self.on_error(callback, exc)
+                    except Exception:  # must not kill the worker
+                        logger.exception("on_error failed for %r", callback.reference_id)
+            finally:
+                queue.task_done()
+
+    # ---- HTTP ----
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                status, keep_alive = await self._handle(head, reader)
+                writer.write(_response(status, keep_alive))
+                if not keep_alive:
+                    break
+                if writer.transport.get_write_buffer_size() > 64 * 1024:
+                    await writer.drain()
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # peer went away (mid-body for IncompleteReadError)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle(
+        self, head: bytes, reader: asyncio.StreamReader
+    ) -> Tuple[int, bool]:
+        self.stats.received += 1
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            self.stats.invalid += 1
+            return 400, False
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = (
+            connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        )
+        if "chunked" in headers.get("transfer-encoding", ""):
+            self.stats.invalid += 1
+            return 411, False
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            self.stats.invalid += 1
+            return 400, False
+        if length > self.max_body:
+            self.stats.invalid += 1
+            return 413, False
+        body = await reader.readexactly(length) if length else b""
+
+        split = urlsplit(target)
+        if split.path != self.path:
+            return 404, keep_alive
+        try:
+            if method == "POST":
+                callback = _parse_body(body, headers.get("content-type", ""))
+            elif method == "GET":
+                callback = ReceiptCallback.model_validate(dict(parse_qsl(split.query)))
+            else:
+                return 405, keep_alive
+        except ValueError:  # includes pydantic.ValidationError
+            self.stats.invalid += 1
+            return 400, keep_alive
+        return self.submit(callback), keep_alive
+
+
+def _parse_body(body: bytes, content_type: str) -> ReceiptCallback:
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return ReceiptCallback.model_validate(dict(parse_qsl(body.decode())))
+    return adapter(ReceiptCallback).validate_json(body)
+
+
+@lru_cache(maxsize=None)
+def _response(status: int, keep_alive: bool) -> bytes:
+    reason = _REASONS[status]
+    body = json.dumps({"ok": True} if status == 200 else {"detail": reason}).encode()
+    lines = [
+        f"HTTP/1.1 {status} {reason}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Connection: keep-alive" if keep_alive else "Connection: close",
+    ]
+    if status == 503:
+        lines.append("Retry-After: 1")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
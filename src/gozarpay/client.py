@@ -1,12 +1,30 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional, Callable
+from functools import cached_property
+import os
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Optional, Callable, Tuple
 import requests
+from . import deadlines
+from .decoding import ResponseMode, SharedDecode
 from .exceptions import APIError
 from .auth.strategies import AuthStrategy, NoAuth
-from .services import MarketService, ReceiptService, WalletService
+from .hooks import Hooks, RequestInfo, body_size, response_size
+from .retry import NO_RETRY, RetryPolicy, breaker_for
+from .transport import DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT, HTTPTransport, Transport
 from .versioning import ApiVersion, SPECS, VersionRouter
 
-DEFAULT_TIMEOUT = 30
+if TYPE_CHECKING:  # pragma: no cover
+    from .auth.store import TokenState
+    from .cache import HTTPCache, TTLCache
+    from .config import ClientConfig
+    from .hedging import HedgePolicy, HedgePool, HedgeStats
+    from .ratelimit import RateLimiter
+    from .services import MarketService, ReceiptService, WalletService
+    from .singleflight import SingleFlight
+
+# Every live Client, re-armed in a forked child (see Client._after_fork).
+_LIVE: "weakref.WeakSet[Client]" = weakref.WeakSet()
 
 
 class Client:
@@ -15,6 +33,25 @@ class Client:
     - Auth is injected via an AuthStrategy (factory decides).
     - Versioned paths are resolved via VersionRouter.
     - Services live in separate modules/files.
+    - `price_cache` (a TTLCache) opts market.price_stats into in-memory caching.
+    - `response_mode="raw"` returns unvalidated record views on read paths.
+    - `retry` (a RetryPolicy) opts into backoff retries and the per-host breaker
+      (default: one attempt, no breaker).
+    - `rate_limiter` (a RateLimiter) paces sends per route key.
+    - `hooks` (gozarpay.hooks.Hooks) receives request/retry/auth/decode events.
+    - `coalesce=True` lets identical concurrent GETs share one call and decode.
+    - `http_cache` (an HTTPCache) revalidates GETs with ETag / Last-Modified.
+    - `deadline` (seconds) caps each call in total: auth refresh, retries and
+      backoff included. Read methods take a per-call `deadline=` too, and
+      `gozarpay.deadlines.deadline()` budgets a whole block.
+    - `hedge` (a HedgePolicy) duplicates slow idempotent GETs past the route's
+      observed latency percentile; first response wins (see `hedge_stats()`).
+    - `transport` (gozarpay.transport) sends the bytes; share one HTTPTransport
+      between clients to share its connection pool. `session` is still
+      accepted and wrapped in an HTTPTransport.
+    Fork-safe: in a forked child the client mounts fresh connection pools and
+    resets its locks, keeping its tokens. Clients built by `create_client`
+    pickle as their ClientConfig plus current tokens (see `gozarpay.procpool`).
     """
 
     def __init__(
@@ -24,6 +61,16 @@ class Client:
         version: ApiVersion | str = ApiVersion.v1,
         auth_strategy: Optional[AuthStrategy] = None,
         session: Optional[requests.Session] = None,
+        transport: Optional[Transport] = None,
+        price_cache: Optional[TTLCache] = None,
+        response_mode: ResponseMode | str = ResponseMode.model,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hooks: Optional[Hooks] = None,
+        coalesce: bool = False,
+        http_cache: Optional[HTTPCache] = None,
+        deadline: Optional[float] = None,
+        hedge: Optional[HedgePolicy] = None,
     ) -> None:
         if not base_url:
             raise ValueError("base_url is required (e.g., 'https://api.gozarpay.com')")
@@ -32,54 +79,403 @@ class Client:
             ApiVersion(version) if not isinstance(version, ApiVersion) else version
         )
 
-        self._session = session or requests.Session()
+        self._owns_transport = transport is None and session is None
+        self._transport: Transport = transport or HTTPTransport(session=session)
         self._auth: AuthStrategy = auth_strategy or NoAuth()
+        self._hooks = hooks
+        # Token login/refresh reuses the pooled transport (keep-alive)
+        self._auth.bind(self._transport)
+        if hooks is not None:
+            self._auth.instrument(hooks)
 
         # Version router
         self._router = VersionRouter(SPECS[self.version])
 
+        self._retry = retry or NO_RETRY  # retries and the breaker are opt-in
+        self._breaker = breaker_for(self.base_url, self._retry)
+        self._limiter = rate_limiter
+        if rate_limiter is not None:
+            rate_limiter.validate(self._router.spec.routes)
+
+        # Identical concurrent GETs share one HTTP call (opt-in)
+        self._inflight: Optional[SingleFlight] = None
+        if coalesce:
+            from .singleflight import SingleFlight
+
+            self._inflight = SingleFlight()
+        # ETag / Last-Modified revalidation for GETs (opt-in)
+        self._http_cache = http_cache
+        # Total time budget per call, and hedged reads (opt-in)
+        self._deadline = deadline
+        self._hedger = None
+        self._hedge_pool: Optional[HedgePool] = None
+        if hedge is not None:
+            from .hedging import Hedger
+
+            self._hedger = Hedger(hedge)
+            # Built here, not on the first hedged call: concurrent first calls
+            # would each build (and leak) a pool. Its threads start on demand.
+            self._hedge_pool = self._new_hedge_pool()
+
         # Bind a tiny request function for services
         self._request: Callable[..., requests.Response] = self._build_request_fn()
 
-        # Services (receive request callable + router)
-        self.market = MarketService(self._request, self._router)
-        self.receipt = ReceiptService(self._request, self._router)
-        self.wallet = WalletService(self._request, self._router)
+        self._price_cache = price_cache
+        self._response_mode = response_mode
+
+        # Set by create_client: what a pickled copy is rebuilt from
+        self._config: Optional[ClientConfig] = None
+        _LIVE.add(self)
+
+    # Services (receive request callable + router); imported and built on first
+    # access so cold start only pays for what is used.
+
+    @cached_property
+    def market(self) -> MarketService:
+        from .services.market import MarketService
+
+        return MarketService(
+            self._request, self._router, self._price_cache, self._response_mode
+        )
+
+    @cached_property
+    def receipt(self) -> ReceiptService:
+        from .services.receipt import ReceiptService
+
+        return ReceiptService(self._request, self._router, self._response_mode)
+
+    @cached_property
+    def wallet(self) -> WalletService:
+        from .services.wallet import WalletService
+
+        return WalletService(self._request, self._router, self._response_mode)
+
+    @property
+    def coalesced(self) -> int:
+        """Calls answered by another caller's in-flight request (coalesce=True)."""
+        return self._inflight.shared if self._inflight is not None else 0
+
+    def hedge_stats(self) -> Dict[str, HedgeStats]:
+        """Per-route hedging outcome and latency percentiles (empty without `hedge`)."""
+        return self._hedger.stats() if self._hedger is not None else {}
+
+    def close(self) -> None:
+        """Close the transport if this client created it."""
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+        if self._owns_transport:
+            self._transport.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __reduce__(self) -> Any:
+        if self._config is None:
+            raise TypeError(
+                "only clients built by create_client() can be pickled (they are "
+                "rebuilt from their ClientConfig)"
+            )
+        return (_unpickle_client, (_portable(self._config), _tokens(self._auth)))
+
+    def _after_fork(self) -> None:
+        """Forked child: new sockets and locks; tokens and cached data are kept."""
+        self._transport.after_fork()
+        self._auth.after_fork()
+        self._breaker = breaker_for(self.base_url, self._retry)
+        if self._inflight is not None:
+            self._inflight = type(self._inflight)()
+        if self._price_cache is not None:
+            self._price_cache._after_fork()
+        if self._http_cache is not None:
+            self._http_cache._after_fork()
+        if self._limiter is not None:
+            self._limiter.backend._after_fork()
+        if self._hooks is not None:
+            self._hooks.after_fork()
+        if self._hedger is not None:
+            self._hedger._after_fork()
+            self._hedge_pool = self._new_hedge_pool()  # its threads stayed in the parent
+
+    def _new_hedge_pool(self) -> HedgePool:
+        from .hedging import HedgePool
+
+        # As many hedge workers as pooled connections, unless set
+        size = self._hedger.policy.max_workers or getattr(
+            self._transport, "pool_size", DEFAULT_POOL_SIZE
+        )
+        return HedgePool(size)
 
     def _build_request_fn(self) -> Callable[..., requests.Response]:
-        def _request(
-            method: str, path: str, *, auth: bool = True, **kwargs
+        def _http(
+            method: str, url: str, headers: Dict[str, str], kwargs, route, attempt
         ) -> requests.Response:
-            url = f"{self.base_url}{path}"
-            headers: Dict[str, str] = dict(kwargs.pop("headers", {}) or {})
-            if auth:
-                headers = self._auth.attach(headers)
+            def send() -> requests.Response:
+                return self._transport.request(method, url, headers=headers, **kwargs)
 
-            resp = self._session.request(
-                method, url, headers=headers, timeout=DEFAULT_TIMEOUT, **kwargs
+            if self._hooks is None:
+                return send()
+            return _traced(
+                self._hooks, send, route, method, url, attempt, bool(kwargs.get("stream"))
             )
 
+        def _send(
+            method: str,
+            url: str,
+            base_headers: Dict[str, str],
+            auth: bool,
+            kwargs,
+            route: Optional[str],
+            attempt: int,
+        ) -> requests.Response:
+            headers = self._auth.attach(base_headers) if auth else base_headers
+            resp = _http(method, url, headers, kwargs, route, attempt)
+
             # One retry on 401 if strategy supports it
             if resp.status_code == 401 and auth:
-                if self._auth.on_401_and_retry(self._session):
-                    headers = self._auth.attach(dict(kwargs.get("headers") or {}))
-                    resp = self._session.request(
-                        method, url, headers=headers, timeout=DEFAULT_TIMEOUT, **kwargs
-                    )
+                if self._auth.on_401_and_retry(self._transport):
+                    deadlines.check(route)  # the refresh may have used up the budget
+                    if kwargs.get("stream"):
+                        resp.close()  # hand the unread connection back to the pool
+                    headers = self._auth.attach(base_headers)
+                    resp = _http(method, url, headers, kwargs, route, attempt)
+            return resp
+
+        def _hedged_send(
+            method: str,
+            url: str,
+            base_headers: Dict[str, str],
+            auth: bool,
+            kwargs,
+            route: str,
+            attempt: int,
+        ) -> requests.Response:
+            from .hedging import hedged
+
+            return hedged(
+                self._hedger,
+                self._hedge_pool,
+                route,
+                lambda: _send(method, url, base_headers, auth, kwargs, route, attempt),
+                self._hooks,
+            )
 
-            if not (200 <= resp.status_code < 300):
-                raise APIError(
-                    resp.status_code,
-                    "Request failed",
-                    url=url,
-                    method=method,
-                    payload=_safe_json(resp),
+        def _call(
+            method: str, path: str, auth: bool, route: Optional[str], kwargs
+        ) -> requests.Response:
+            url = f"{self.base_url}{path}"
+            base_headers: Dict[str, str] = dict(kwargs.pop("headers", {}) or {})
+            retryable = self._retry.allows(method, route, base_headers)
+            # A streamed body is read by the caller: never cached, never hedged
+            stream = bool(kwargs.get("stream"))
+            cache_key = entry = None
+            if self._http_cache is not None and method == "GET" and not stream:
+                cache_key = self._http_cache.key(
+                    route,
+                    url,
+                    kwargs.get("params"),
+                    base_headers,
+                    self._auth.identity() if auth else None,
                 )
+                if cache_key is not None:
+                    entry = self._http_cache.lookup(cache_key)
+                if entry is not None:
+                    base_headers.update(entry.conditional_headers())
+            send = (
+                _hedged_send
+                if self._hedger is not None
+                and not stream
+                and self._hedger.eligible(method, route)
+                else _send
+            )
+            attempt = 0
+            while True:
+                deadlines.check(route)
+                self._breaker.check()
+                if self._limiter is not None:
+                    self._limiter.acquire(route)
+                attempt += 1
+                try:
+                    resp = send(method, url, base_headers, auth, kwargs, route, attempt)
+                except (requests.ConnectionError, requests.Timeout) as exc:
+                    self._breaker.record_failure()
+                    delay = self._retry.wait_for(attempt) if retryable else None
+                    if delay is None or not deadlines.fits(delay):
+                        deadlines.check(route, exc)  # a timeout cut short by the budget
+                        raise
+                    if self._hooks is not None:
+                        self._hooks.on_retry(route, attempt, delay, None)
+                    time.sleep(delay)
+                    continue
+                self._breaker.record(resp.status_code)
+
+                if resp.status_code == 304 and entry is not None:
+                    return self._http_cache.revalidated(cache_key, entry, resp)
+                if 200 <= resp.status_code < 300:
+                    if cache_key is not None:
+                        self._http_cache.store(cache_key, resp)
+                    return resp
+                delay = (
+                    self._retry.wait_for(
+                        attempt, resp.status_code, resp.headers.get("Retry-After")
+                    )
+                    if retryable
+                    else None
+                )
+                if delay is None or not deadlines.fits(delay):
+                    raise _api_error(resp, url, method)  # no time left to retry
+                if stream:
+                    resp.close()
+                if self._hooks is not None:
+                    self._hooks.on_retry(route, attempt, delay, resp.status_code)
+                time.sleep(delay)
+
+        def _request(
+            method: str,
+            path: str,
+            *,
+            auth: bool = True,
+            route: Optional[str] = None,
+            deadline: Optional[float] = None,
+            **kwargs,
+        ) -> requests.Response:
+            budget = deadline if deadline is not None else self._deadline
+            if budget is None:
+                return _dispatch(method, path, auth, route, kwargs)
+            with deadlines.deadline(budget):
+                return _dispatch(method, path, auth, route, kwargs)
+
+        def _dispatch(
+            method: str, path: str, auth: bool, route: Optional[str], kwargs
+        ) -> requests.Response:
+            key = _coalesce_key(self, method, path, auth, kwargs)
+            if key is None:
+                return _call(method, path, auth, route, kwargs)
+            leader = False
+
+            def lead() -> requests.Response:
+                nonlocal leader
+                leader = True
+                resp = _call(method, path, auth, route, kwargs)
+                if getattr(resp, "_gozarpay_memo", None) is None:
+                    resp._gozarpay_memo = SharedDecode()  # followers reuse the decode
+                return resp
+
+            resp = self._inflight.do(key, lead)
+            if not leader and self._hooks is not None:
+                self._hooks.on_coalesced(route)
             return resp
 
         return _request
 
 
+def _reinit_after_fork() -> None:
+    # Hooks shared by several clients are reset once per client: harmless,
+    # the child runs no other thread yet.
+    for client in list(_LIVE):
+        client._after_fork()
+
+
+if hasattr(os, "register_at_fork"):  # POSIX
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def _portable(cfg: ClientConfig) -> ClientConfig:
+    """The config minus process-local connections (rebuilt from pool_size etc.)."""
+    from dataclasses import replace
+
+    if isinstance(cfg.transport, HTTPTransport):
+        return replace(cfg, transport=None)
+    return cfg
+
+
+def _tokens(auth: AuthStrategy) -> Optional[TokenState]:
+    from .auth.store import TokenState
+
+    access = getattr(auth, "access_token", None)
+    if not access:
+        return None
+    return TokenState(access, auth.refresh_token, auth.access_expires_at)  # type: ignore[attr-defined]
+
+
+def _unpickle_client(cfg: ClientConfig, tokens: Optional[TokenState]) -> Client:
+    from .auth.strategies import _adopt
+    from .factory import create_client
+
+    client = create_client(cfg)
+    if tokens is not None and hasattr(client._auth, "access_token"):
+        _adopt(client._auth, tokens)  # no new login when the token is still good
+    return client
+
+
+def _coalesce_key(
+    client: Any, method: str, path: str, auth: bool, kwargs: Dict[str, Any]
+) -> Optional[Tuple[Any, ...]]:
+    """
+    Single-flight key for a coalescable call (GET/HEAD with plain params), else
+    None. Requests with different credentials never share a response.
+    """
+    if client._inflight is None or method not in ("GET", "HEAD"):
+        return None
+    if set(kwargs) - {"params", "headers"}:
+        return None  # e.g. stream=True: the body must not be shared
+    params = kwargs.get("params") or {}
+    headers = kwargs.get("headers") or {}
+    if not isinstance(params, dict):
+        return None
+    return (
+        method,
+        path,
+        tuple(sorted(params.items())),
+        tuple(sorted(headers.items())),
+        client._auth.identity() if auth else None,
+    )
+
+
+def _traced(
+    hooks: Hooks,
+    send: Callable[[], requests.Response],
+    route: Optional[str],
+    method: str,
+    url: str,
+    attempt: int,
+    stream: bool = False,
+) -> requests.Response:
+    hooks.on_request_start(route, method, url, attempt)
+    info = RequestInfo(route, method, url, attempt)
+    start = time.perf_counter()
+    try:
+        resp = send()
+    except BaseException as exc:
+        info.error = exc
+        info.wait = info.total = time.perf_counter() - start
+        hooks.on_request_end(info)
+        raise
+    # requests reads the body eagerly (unless streamed); `elapsed` stops at the headers.
+    info.total = time.perf_counter() - start
+    info.wait = min(resp.elapsed.total_seconds(), info.total)
+    info.download = info.total - info.wait
+    info.status = resp.status_code
+    info.bytes_out = body_size(resp.request.body)
+    info.bytes_in = response_size(resp, stream)
+    resp._gozarpay_trace = (hooks, route)  # picked up by decoding.decode
+    hooks.on_request_end(info)
+    return resp
+
+
+def _api_error(resp: Any, url: str, method: str) -> APIError:
+    return APIError(
+        resp.status_code,
+        "Request failed",
+        url=url,
+        method=method,
+        payload=_safe_json(resp),
+        headers=dict(resp.headers),
+    )
+
+
 def _safe_json(resp: requests.Response) -> Dict[str, Any]:
     try:
         return resp.json()
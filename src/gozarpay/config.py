@@ -1,7 +1,17 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 from .versioning import ApiVersion
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .auth.store import TokenStore
+    from .cache import HTTPCache, TTLCache
+    from .hedging import HedgePolicy
+    from .hooks import Hooks
+    from .ratelimit import RateLimiter
+    from .retry import RetryPolicy
+    from .transport import Transport
+
 
 @dataclass(slots=True)
 class ClientConfig:
@@ -20,3 +30,41 @@ class ClientConfig:
     # Pre-acquired tokens
     access_token: str | None = None
     refresh_token: str | None = None
+
+    # Shared token cache (e.g. FileTokenStore) so workers reuse one login
+    token_store: TokenStore | None = None
+
+    # Opt-in TTL/stale-while-revalidate cache for market.price_stats
+    price_cache: TTLCache | None = None
+
+    # Opt-in ETag / Last-Modified revalidation cache for GETs (per auth identity)
+    http_cache: HTTPCache | None = None
+
+    # "model" (validated Pydantic models) or "raw" (record views) for read paths
+    response_mode: str = "model"
+
+    # Opt-in backoff retries + per-host circuit breaker (None: one attempt, no breaker)
+    retry: RetryPolicy | None = None
+
+    # Client-side token buckets per route key (share via a file/shm backend)
+    rate_limiter: RateLimiter | None = None
+
+    # Identical concurrent GETs share one HTTP call and decoded result
+    coalesce: bool = False
+
+    # Total seconds per call (auth refresh + retries); per-call `deadline=` overrides
+    deadline: float | None = None
+
+    # Duplicate slow idempotent GETs past the route's observed latency percentile
+    hedge: HedgePolicy | None = None
+
+    # Event hooks (e.g. gozarpay.metrics.MetricsHooks) for tracing / metrics
+    hooks: Hooks | None = None
+
+    # Transport: pass one to share its pool between clients (or InMemoryTransport
+    # for socket-free load tests); otherwise a pooled HTTP transport is built
+    # from pool_size / keep_alive / timeout (async: httpx pool limits).
+    transport: Transport | None = None
+    pool_size: int | None = None
+    keep_alive: bool = True
+    timeout: float = 30.0
@@ -0,0 +1,63 @@
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+from .exceptions import DeadlineExceeded
+
+# Absolute time.monotonic() by which the current call must be done (None: no budget).
+# A ContextVar, so it follows the call into asyncio tasks and copied contexts.
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("gozarpay_deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget (None when there is none; may be negative)."""
+    at = _DEADLINE.get()
+    return None if at is None else at - time.monotonic()
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Give every SDK call inside the block at most `seconds` in total: auth
+    login/refresh, retries and backoff sleeps included. Nested budgets only
+    tighten (the earliest deadline wins); `None` adds none.
+    """
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    current = _DEADLINE.get()
+    token = _DEADLINE.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def check(route: Optional[str] = None, cause: Optional[BaseException] = None) -> None:
+    """Raise DeadlineExceeded (from `cause`) once the budget is spent."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(route) from cause
+
+
+def fits(delay: float) -> bool:
+    """True when sleeping `delay` seconds still leaves time to send again."""
+    left = remaining()
+    return left is None or delay < left
+
+
+def cap(timeout: Any, route: Optional[str] = None) -> Any:
+    """
+    A requests timeout (seconds or a (connect, read) tuple) shortened to the
+    remaining budget; DeadlineExceeded when it is spent.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded(route)
+    if isinstance(timeout, tuple):
+        return tuple(left if t is None else min(t, left) for t in timeout)
+    return left if timeout is None else min(timeout, left)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+import json
+import threading
+import time
+from enum import Enum
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Type, TypeVar, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+
+class ResponseMode(str, Enum):
+    model = "model"  # validated Pydantic models (default)
+    raw = "raw"  # unvalidated slotted record views (gozarpay.records)
+
+
+@lru_cache(maxsize=1)
+def _json_loads() -> Callable[[Any], Any]:
+    # Resolved on first parse, not at import (keeps cold start light).
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover - optional speedup
+        return json.loads
+    return orjson.loads
+
+
+def json_backend() -> str:
+    """Name of the JSON backend used for raw (non-model) parsing."""
+    return "json" if _json_loads() is json.loads else "orjson"
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse JSON with the fastest available backend (orjson if installed)."""
+    return _json_loads()(data)
+
+
+@lru_cache(maxsize=None)
+def adapter(tp: Any) -> TypeAdapter:
+    """Build (once) and cache the TypeAdapter for `tp`, e.g. `List[MarketPrice]`."""
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(tp)
+
+
+def decode(resp: Any, tp: Type[T], validate: bool = True) -> T:
+    """
+    Validate the raw response body straight into `tp`.
+    pydantic-core parses the bytes itself, so no intermediate dict/list tree
+    is built in Python (unlike `tp.model_validate(resp.json())`).
+    With `validate=False` the body is only parsed and wrapped in record views.
+    """
+    memo = getattr(resp, "_gozarpay_memo", None)  # coalesced response
+    if memo is not None:
+        return memo.get((tp, validate), lambda: _traced_decode(resp, tp, validate))
+    return _traced_decode(resp, tp, validate)
+
+
+def _traced_decode(resp: Any, tp: Type[T], validate: bool) -> T:
+    trace = getattr(resp, "_gozarpay_trace", None)  # (hooks, route) when traced
+    if trace is None:
+        return _decode(resp.content, tp, validate)
+    start = time.perf_counter()
+    result = _decode(resp.content, tp, validate)
+    hooks, route = trace
+    hooks.on_decode(
+        route,
+        "validate" if validate else "decode",
+        time.perf_counter() - start,
+        len(resp.content),
+    )
+    return result
+
+
+def _decode(content: bytes, tp: Type[T], validate: bool) -> T:
+    if validate:
+        return adapter(tp).validate_json(content)
+    from .records import view_for
+
+    return view_for(tp)(loads(content))
+
+
+class SharedDecode:
+    """
+    Per-response decode memo for coalesced calls: every caller sharing one
+    response gets the same decoded result (decoded once, thread-safe).
+    """
+
+    __slots__ = ("_lock", "_results")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._results: Dict[Any, Any] = {}
+
+    def get(self, key: Any, load: Callable[[], T]) -> T:
+        with self._lock:
+            try:
+                return self._results[key]
+            except KeyError:
+                value = self._results[key] = load()
+                return value
+
+
+def wants_validation(mode: ResponseMode | str, validate: bool | None) -> bool:
+    """Per-call `validate` wins; otherwise follow the client's response mode."""
+    if validate is not None:
+        return validate
+    return ResponseMode(mode) is ResponseMode.model
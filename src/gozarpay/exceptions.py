@@ -27,7 +27,43 @@ class APIError(GozarPayError):
             detail += f" {method} {url}"
         super().__init__(f"{detail}: {message}")
         self.status_code = status_code
+        self.message = message
         self.url = url
         self.method = method
         self.payload = payload or {}
         self.headers = headers or {}
+
+    def __reduce__(self) -> Any:
+        # Keyword-only fields do not survive Exception's default pickling
+        # (process-pool workers send errors back to the parent).
+        fields = dict(url=self.url, method=self.method, payload=self.payload, headers=self.headers)
+        return (_api_error, (type(self), self.status_code, self.message, fields))
+
+
+class CircuitOpenError(GozarPayError):
+    """Raised without sending while the host's circuit breaker is open."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"Circuit open for {host}; retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+    def __reduce__(self) -> Any:
+        return (type(self), (self.host, self.retry_in))
+
+
+class DeadlineExceeded(GozarPayError, TimeoutError):
+    """The call's time budget ran out (raised instead of sending or retrying again)."""
+
+    def __init__(self, route: Optional[str] = None) -> None:
+        super().__init__(f"Deadline exceeded for {route or 'request'}")
+        self.route = route
+
+    def __reduce__(self) -> Any:
+        return (type(self), (self.route,))
+
+
+def _api_error(
+    cls: Any, status_code: int, message: str, fields: Dict[str, Any]
+) -> APIError:
+    return cls(status_code, message, **fields)
@@ -1,15 +1,67 @@
 from __future__ import annotations
 import os
-from typing import Iterable, Optional, Protocol
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Protocol
 from .client import Client
 from .config import ClientConfig
-from .auth.strategies import ApiKeyAuth, TokenAuth, NoAuth
+from .auth.strategies import (
+    ApiKeyAuth,
+    TokenAuth,
+    NoAuth,
+    AsyncApiKeyAuth,
+    AsyncTokenAuth,
+    AsyncNoAuth,
+)
+from .auth.store import TokenStore, store_from_url
+from .transport import DEFAULT_POOL_SIZE, HTTPTransport, Transport
 from .versioning import ApiVersion
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .async_client import AsyncClient
+
 
 # ---- Builder protocol & concrete builders ----
 
 
+def _client_options(cfg: ClientConfig) -> Dict[str, Any]:
+    """Client keyword options shared by every builder (sync and async)."""
+    return {
+        "price_cache": cfg.price_cache,
+        "response_mode": cfg.response_mode,
+        "retry": cfg.retry,
+        "rate_limiter": cfg.rate_limiter,
+        "hooks": cfg.hooks,
+        "coalesce": cfg.coalesce,
+        "http_cache": cfg.http_cache,
+        "deadline": cfg.deadline,
+        "hedge": cfg.hedge,
+    }
+
+
+def _transport(cfg: ClientConfig) -> Transport:
+    if cfg.transport is not None:
+        return cfg.transport
+    return HTTPTransport(
+        pool_size=cfg.pool_size or DEFAULT_POOL_SIZE,
+        keep_alive=cfg.keep_alive,
+        timeout=cfg.timeout,
+    )
+
+
+def _async_pool_options(cfg: ClientConfig) -> Dict[str, Any]:
+    """The same transport settings, mapped onto AsyncClient's httpx pool."""
+    from .async_client import DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_KEEPALIVE
+
+    size = cfg.pool_size or DEFAULT_MAX_CONNECTIONS
+    return {
+        "transport": cfg.transport,
+        "timeout": cfg.timeout,
+        "max_connections": size,
+        "max_keepalive_connections": min(size, DEFAULT_MAX_KEEPALIVE)
+        if cfg.keep_alive
+        else 0,
+    }
+
+
 class ClientBuilder(Protocol):
     def can_build(self, cfg: ClientConfig) -> bool: ...
     def build(self, cfg: ClientConfig) -> Client: ...
@@ -23,7 +75,14 @@ class TokensBuilder:
         return Client(
             base_url=cfg.base_url,
             version=cfg.version,
-            auth_strategy=TokenAuth(cfg.base_url, cfg.access_token, cfg.refresh_token),
+            auth_strategy=TokenAuth(
+                cfg.base_url,
+                cfg.access_token,
+                cfg.refresh_token,
+                store=cfg.token_store,
+            ),
+            transport=_transport(cfg),
+            **_client_options(cfg),
         )
 
 
@@ -35,7 +94,11 @@ class ApiKeysBuilder:
         return Client(
             base_url=cfg.base_url,
             version=cfg.version,
-            auth_strategy=ApiKeyAuth(cfg.base_url, cfg.api_key, cfg.secret_key),
+            auth_strategy=ApiKeyAuth(
+                cfg.base_url, cfg.api_key, cfg.secret_key, store=cfg.token_store
+            ),
+            transport=_transport(cfg),
+            **_client_options(cfg),
         )
 
 
@@ -46,7 +109,11 @@ class PublicBuilder:
 
     def build(self, cfg: ClientConfig) -> Client:
         return Client(
-            base_url=cfg.base_url, version=cfg.version, auth_strategy=NoAuth()
+            base_url=cfg.base_url,
+            version=cfg.version,
+            auth_strategy=NoAuth(),
+            transport=_transport(cfg),
+            **_client_options(cfg),
         )
 
 
@@ -57,10 +124,83 @@ _BUILDERS: tuple[ClientBuilder, ...] = (
 )
 
 
+# ---- asyncio builders (same selection rules, AsyncClient output) ----
+
+
+class AsyncClientBuilder(Protocol):
+    def can_build(self, cfg: ClientConfig) -> bool: ...
+    def build(self, cfg: ClientConfig) -> AsyncClient: ...
+
+
+class AsyncTokensBuilder(TokensBuilder):
+    def build(self, cfg: ClientConfig) -> AsyncClient:  # type: ignore[override]
+        from .async_client import AsyncClient  # httpx is loaded only when needed
+
+        return AsyncClient(
+            base_url=cfg.base_url,
+            version=cfg.version,
+            auth_strategy=AsyncTokenAuth(
+                cfg.base_url,
+                cfg.access_token,
+                cfg.refresh_token,
+                store=cfg.token_store,
+            ),
+            **_async_pool_options(cfg),
+            **_client_options(cfg),
+        )
+
+
+class AsyncApiKeysBuilder(ApiKeysBuilder):
+    def build(self, cfg: ClientConfig) -> AsyncClient:  # type: ignore[override]
+        from .async_client import AsyncClient  # httpx is loaded only when needed
+
+        return AsyncClient(
+            base_url=cfg.base_url,
+            version=cfg.version,
+            auth_strategy=AsyncApiKeyAuth(
+                cfg.base_url, cfg.api_key, cfg.secret_key, store=cfg.token_store
+            ),
+            **_async_pool_options(cfg),
+            **_client_options(cfg),
+        )
+
+
+class AsyncPublicBuilder(PublicBuilder):
+    def build(self, cfg: ClientConfig) -> AsyncClient:  # type: ignore[override]
+        from .async_client import AsyncClient  # httpx is loaded only when needed
+
+        return AsyncClient(
+            base_url=cfg.base_url,
+            version=cfg.version,
+            auth_strategy=AsyncNoAuth(),
+            **_async_pool_options(cfg),
+            **_client_options(cfg),
+        )
+
+
+_ASYNC_BUILDERS: tuple[AsyncClientBuilder, ...] = (
+    AsyncTokensBuilder(),
+    AsyncApiKeysBuilder(),
+    AsyncPublicBuilder(),
+)
+
+
 def create_client(
     cfg: ClientConfig, builders: Iterable[ClientBuilder] = _BUILDERS
 ) -> Client:
     """Decide how to build the client with a builder chain (no if/elif inside Client)."""
+    for b in builders:
+        if b.can_build(cfg):
+            client = b.build(cfg)
+            client._config = cfg  # makes it picklable (rebuilt from cfg)
+            return client
+    raise ValueError("No suitable client builder found.")
+
+
+def create_async_client(
+    cfg: ClientConfig, builders: Iterable[AsyncClientBuilder] = _ASYNC_BUILDERS
+) -> AsyncClient:
+    """Async twin of `create_client`; same builder chain, returns an AsyncClient."""
     for b in builders:
         if b.can_build(cfg):
             return b.build(cfg)
@@ -76,6 +216,7 @@ def client_with_tokens(
     access_token: str,
     refresh_token: str,
     version: ApiVersion | str = ApiVersion.v1,
+    token_store: Optional[TokenStore] = None,
 ) -> Client:
     return create_client(
         ClientConfig(
@@ -83,6 +224,7 @@ def client_with_tokens(
             access_token=access_token,
             refresh_token=refresh_token,
             version=version,
+            token_store=token_store,
         )
     )
 
@@ -93,10 +235,15 @@ def client_with_api_keys(
     api_key: str,
     secret_key: str,
     version: ApiVersion | str = ApiVersion.v1,
+    token_store: Optional[TokenStore] = None,
 ) -> Client:
     return create_client(
         ClientConfig(
-            base_url=base_url, api_key=api_key, secret_key=secret_key, version=version
+            base_url=base_url,
+            api_key=api_key,
+            secret_key=secret_key,
+            version=version,
+            token_store=token_store,
         )
     )
 
@@ -111,15 +258,138 @@ def from_env(
     *, base_url: Optional[str] = None, version: ApiVersion | str = ApiVersion.v1
 ) -> Client:
     """OpenAI-style factory using env vars; selection is delegated to the builders."""
+    return create_client(_config_from_env(base_url, version))
+
+
+def _config_from_env(
+    base_url: Optional[str], version: ApiVersion | str
+) -> ClientConfig:
     base = (base_url or os.getenv("GOZARPAY_BASE_URL") or "").strip()
     ver = os.getenv("GOZARPAY_API_VERSION") or version
-    return create_client(
+    cache = os.getenv("GOZARPAY_TOKEN_CACHE")
+    price_ttl = os.getenv("GOZARPAY_PRICE_CACHE_TTL")
+    http_cache_mb = os.getenv("GOZARPAY_HTTP_CACHE_MB")
+    mode = os.getenv("GOZARPAY_RESPONSE_MODE") or "model"
+    attempts = os.getenv("GOZARPAY_MAX_ATTEMPTS")
+    limits = os.getenv("GOZARPAY_RATE_LIMITS")
+    pool_size = os.getenv("GOZARPAY_POOL_SIZE")
+    keep_alive = os.getenv("GOZARPAY_KEEP_ALIVE", "1").strip().lower()
+    timeout = os.getenv("GOZARPAY_TIMEOUT")
+    coalesce = os.getenv("GOZARPAY_COALESCE", "0").strip().lower()
+    deadline = os.getenv("GOZARPAY_DEADLINE")
+    return ClientConfig(
+        base_url=base,
+        api_key=os.getenv("GOZARPAY_API_KEY"),
+        secret_key=os.getenv("GOZARPAY_SECRET_KEY"),
+        access_token=os.getenv("GOZARPAY_ACCESS_TOKEN"),
+        refresh_token=os.getenv("GOZARPAY_REFRESH_TOKEN"),
+        version=ver,
+        token_store=store_from_url(cache) if cache else None,
+        price_cache=_price_cache(price_ttl),
+        http_cache=_http_cache(http_cache_mb),
+        response_mode=mode,
+        retry=_retry_policy(attempts),
+        rate_limiter=_rate_limiter(limits, os.getenv("GOZARPAY_RATE_LIMIT_STORE")),
+        pool_size=int(pool_size) if pool_size else None,
+        keep_alive=keep_alive not in ("0", "false", "no", "off"),
+        timeout=float(timeout) if timeout else 30.0,
+        coalesce=coalesce in ("1", "true", "yes", "on"),
+        deadline=float(deadline) if deadline else None,
+        hedge=_hedge_policy(os.getenv("GOZARPAY_HEDGE_PERCENTILE")),
+    )
+
+
+def _hedge_policy(pct: Optional[str]) -> Any:
+    if not pct:
+        return None
+    from .hedging import HedgePolicy
+
+    return HedgePolicy(percentile=float(pct))
+
+
+def _http_cache(megabytes: Optional[str]) -> Any:
+    if not megabytes:
+        return None
+    from .cache import HTTPCache
+
+    return HTTPCache(max_bytes=int(float(megabytes) * 1024 * 1024))
+
+
+def _price_cache(ttl: Optional[str]) -> Any:
+    if not ttl:
+        return None
+    from .cache import TTLCache
+
+    return TTLCache(float(ttl))
+
+
+def _retry_policy(attempts: Optional[str]) -> Any:
+    if not attempts:
+        return None
+    from .retry import RetryPolicy
+
+    return RetryPolicy(max_attempts=int(attempts))
+
+
+def _rate_limiter(limits: Optional[str], store: Optional[str]) -> Any:
+    if not limits:
+        return None
+    from .ratelimit import RateLimiter, backend_from_url, parse_limits
+
+    return RateLimiter(
+        parse_limits(limits), backend=backend_from_url(store) if store else None
+    )
+
+
+# ---- Async shortcuts ----
+
+
+def async_client_with_tokens(
+    *,
+    base_url: str,
+    access_token: str,
+    refresh_token: str,
+    version: ApiVersion | str = ApiVersion.v1,
+    token_store: Optional[TokenStore] = None,
+) -> AsyncClient:
+    return create_async_client(
+        ClientConfig(
+            base_url=base_url,
+            access_token=access_token,
+            refresh_token=refresh_token,
+            version=version,
+            token_store=token_store,
+        )
+    )
+
+
+def async_client_with_api_keys(
+    *,
+    base_url: str,
+    api_key: str,
+    secret_key: str,
+    version: ApiVersion | str = ApiVersion.v1,
+    token_store: Optional[TokenStore] = None,
+) -> AsyncClient:
+    return create_async_client(
         ClientConfig(
-            base_url=base,
-            api_key=os.getenv("GOZARPAY_API_KEY"),
-            secret_key=os.getenv("GOZARPAY_SECRET_KEY"),
-            access_token=os.getenv("GOZARPAY_ACCESS_TOKEN"),
-            refresh_token=os.getenv("GOZARPAY_REFRESH_TOKEN"),
-            version=ver,
+            base_url=base_url,
+            api_key=api_key,
+            secret_key=secret_key,
+            version=version,
+            token_store=token_store,
         )
     )
+
+
+def async_client_public(
+    *, base_url: str, version: ApiVersion | str = ApiVersion.v1
+) -> AsyncClient:
+    return create_async_client(ClientConfig(base_url=base_url, version=version))
+
+
+def async_from_env(
+    *, base_url: Optional[str] = None, version: ApiVersion | str = ApiVersion.v1
+) -> AsyncClient:
+    """Async twin of `from_env`; reads the same GOZARPAY_* variables."""
+    return create_async_client(_config_from_env(base_url, version))
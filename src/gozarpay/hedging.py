@@ -0,0 +1,290 @@
+from __future__ import annotations
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, FrozenSet, List, Optional, TypeVar
+from . import deadlines
+from .bulk import percentile
+from .exceptions import DeadlineExceeded
+from .hooks import Hooks
+
+T = TypeVar("T")
+
+# Idempotent reads: a duplicate is harmless
+HEDGE_ROUTES = frozenset(
+    {"market.price_stats", "receipt.get", "receipt.list", "wallet.list_by_phone"}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class HedgePolicy:
+    """
+    When to send a duplicate of a slow idempotent GET.
+    - The duplicate goes out once the first attempt has taken longer than the
+      route's observed `percentile` latency (clamped to min_delay..max_delay;
+      `max_delay` until `min_samples` calls have been seen).
+    - At most `max_extra` duplicates per call on average (0.1: +10% requests),
+      so a slow backend is not hit twice as hard.
+    - Only GETs on `routes` (route keys) are hedged; the first response wins.
+    """
+
+    percentile: float = 95.0
+    min_delay: float = 0.005
+    max_delay: float = 1.0
+    min_samples: int = 32
+    window: int = 512  # latencies kept per route
+    max_extra: float = 0.1
+    routes: FrozenSet[str] = HEDGE_ROUTES
+    # Sync clients: threads running hedged calls (None: the transport's pool_size).
+    # When all are busy, calls run inline and unhedged instead of queueing.
+    max_workers: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class HedgeStats:
+    """
+    Per-route outcome. `p*` are the latencies callers saw; `primary_p*` those
+    of the first attempt alone (what callers would have seen without hedging;
+    a lower bound when a losing first attempt was cancelled).
+    """
+
+    calls: int
+    hedged: int  # duplicates sent
+    wins: int  # duplicates that answered first
+    delay: float  # current hedge delay, seconds
+    p50: float
+    p95: float
+    p99: float
+    primary_p50: float
+    primary_p95: float
+    primary_p99: float
+    saturated: int = 0  # calls run unhedged: no idle hedge worker
+
+
+class _RouteLatency:
+    __slots__ = ("primary", "observed", "calls", "hedged", "wins", "saturated", "delay", "fresh")
+
+    def __init__(self, window: int) -> None:
+        self.primary: Deque[float] = deque(maxlen=window)
+        self.observed: Deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.hedged = 0
+        self.wins = 0
+        self.saturated = 0
+        self.delay: Optional[float] = None
+        self.fresh = 0  # samples since `delay` was computed
+
+
+class Hedger:
+    """Latency tracker and hedge-delay source shared by one client's calls (thread-safe)."""
+
+    def __init__(self, policy: Optional[HedgePolicy] = None) -> None:
+        self.policy = policy or HedgePolicy()
+        self._lock = threading.Lock()
+        self._routes: Dict[str, _RouteLatency] = {}
+
+    def eligible(self, method: str, route: Optional[str]) -> bool:
+        return method == "GET" and route is not None and route in self.policy.routes
+
+    def delay(self, route: str) -> Optional[float]:
+        """Seconds to wait before the duplicate; None: do not hedge this call."""
+        policy = self.policy
+        with self._lock:
+            r = self._route(route)
+            r.calls += 1
+            if r.hedged >= policy.max_extra * r.calls:
+                return None
+            if len(r.primary) < policy.min_samples:
+                return policy.max_delay
+            if r.delay is None or r.fresh >= max(1, policy.window // 8):
+                # Recomputed every window/8 samples, not on every call
+                p = percentile(sorted(r.primary), policy.percentile)
+                r.delay = min(policy.max_delay, max(policy.min_delay, p))
+                r.fresh = 0
+            return r.delay
+
+    def observe_primary(self, route: str, seconds: float) -> None:
+        with self._lock:
+            r = self._route(route)
+            r.primary.append(seconds)
+            r.fresh += 1
+
+    def finish(
+        self, route: str, seconds: float, hedged: bool, won: bool, saturated: bool = False
+    ) -> None:
+        with self._lock:
+            r = self._route(route)
+            r.observed.append(seconds)
+            r.hedged += hedged
+            r.wins += won
+            r.saturated += saturated
+
+    def stats(self) -> Dict[str, HedgeStats]:
+        with self._lock:
+            routes = {k: (r, sorted(r.observed), sorted(r.primary)) for k, r in self._routes.items()}
+        return {
+            route: HedgeStats(
+                calls=r.calls,
+                hedged=r.hedged,
+                wins=r.wins,
+                delay=r.delay if r.delay is not None else self.policy.max_delay,
+                p50=percentile(observed, 50),
+                p95=percentile(observed, 95),
+                p99=percentile(observed, 99),
+                primary_p50=percentile(primary, 50),
+                primary_p95=percentile(primary, 95),
+                primary_p99=percentile(primary, 99),
+                saturated=r.saturated,
+            )
+            for route, (r, observed, primary) in routes.items()
+        }
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def _route(self, route: str) -> _RouteLatency:
+        r = self._routes.get(route)
+        if r is None:
+            r = self._routes[route] = _RouteLatency(self.policy.window)
+        return r
+
+
+class HedgePool:
+    """
+    Worker threads for hedged calls that never queue: `try_submit` returns None
+    while all `size` workers are busy, so under load a call runs inline or goes
+    without its hedge rather than waiting behind other calls' attempts.
+    """
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self.size = size
+        self._idle = threading.BoundedSemaphore(size)
+        self._pool = ThreadPoolExecutor(size, thread_name_prefix="gozarpay-hedge")
+
+    def try_submit(self, fn: Callable[[], T]) -> Optional["Future[T]"]:
+        """Run `fn` (in a copy of the current context) on an idle worker, if any."""
+        if not self._idle.acquire(blocking=False):
+            return None
+        try:
+            fut = self._pool.submit(contextvars.copy_context().run, fn)
+        except BaseException:
+            self._idle.release()
+            raise
+        fut.add_done_callback(lambda _: self._idle.release())
+        return fut
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+def hedged(
+    hedger: Hedger,
+    pool: HedgePool,
+    route: str,
+    send: Callable[[], T],
+    hooks: Optional[Hooks] = None,
+) -> T:
+    """
+    Run `send` on `pool`; if it has not answered after the hedge delay, run it
+    again and return whichever succeeds first (the loser finishes unobserved:
+    requests calls cannot be cancelled). Honors the current deadline.
+    With no idle worker the call runs inline, or the duplicate is skipped.
+    """
+    delay = hedger.delay(route)
+    start = time.perf_counter()
+    primary = pool.try_submit(send) if delay is not None else None
+    if primary is None:
+        try:
+            return send()
+        finally:
+            elapsed = time.perf_counter() - start
+            hedger.observe_primary(route, elapsed)
+            hedger.finish(route, elapsed, False, False, delay is not None)
+
+    primary.add_done_callback(
+        lambda _: hedger.observe_primary(route, time.perf_counter() - start)
+    )
+    left = deadlines.remaining()
+    done, _ = wait([primary], timeout=delay if left is None else max(0.0, min(delay, left)))
+    backup, saturated = None, False
+    if not done and (left is None or delay < left):
+        backup = pool.try_submit(send)
+        saturated = backup is None  # every worker busy: wait for the primary alone
+    if backup is not None:
+        winner = _first_success([primary, backup], route)
+        won = winner is backup
+        hedger.finish(route, time.perf_counter() - start, True, won)
+        if hooks is not None:
+            hooks.on_hedge(route, won)
+        return winner.result()
+    winner = _first_success([primary], route)
+    hedger.finish(route, time.perf_counter() - start, False, False, saturated)
+    return winner.result()
+
+
+def _first_success(futures: List[Future], route: str) -> Future:
+    """The first future to succeed; else the first one's error (DeadlineExceeded on timeout)."""
+    pending = set(futures)
+    while pending:
+        left = deadlines.remaining()
+        done, pending = wait(
+            pending, timeout=None if left is None else max(0.0, left), return_when=FIRST_COMPLETED
+        )
+        if not done:
+            raise DeadlineExceeded(route)
+        for fut in futures:
+            if fut in done and fut.exception() is None:
+                return fut
+    return futures[0]  # all failed: .result() re-raises the first attempt's error
+
+
+async def ahedged(
+    hedger: Hedger,
+    route: str,
+    send: Callable[[], Awaitable[T]],
+    hooks: Optional[Hooks] = None,
+) -> T:
+    """asyncio twin of `hedged`; the losing attempt is cancelled."""
+    delay = hedger.delay(route)
+    start = time.perf_counter()
+    if delay is None:
+        try:
+            return await send()
+        finally:
+            elapsed = time.perf_counter() - start
+            hedger.observe_primary(route, elapsed)
+            hedger.finish(route, elapsed, False, False)
+
+    primary = asyncio.ensure_future(send())
+    primary.add_done_callback(
+        lambda _: hedger.observe_primary(route, time.perf_counter() - start)
+    )
+    tasks = [primary]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            tasks.append(asyncio.ensure_future(send()))
+        pending = set(tasks)
+        winner = primary
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            ok = [t for t in tasks if t in done and t.exception() is None]
+            if ok:
+                winner = ok[0]
+                break
+        hedged_call = len(tasks) > 1
+        won = winner is not primary
+        hedger.finish(route, time.perf_counter() - start, hedged_call, won)
+        if hedged_call and hooks is not None:
+            hooks.on_hedge(route, won)
+        return winner.result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()  # also on our own cancellation (e.g. deadline)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(slots=True)
+class RequestInfo:
+    """
+    One HTTP exchange as seen by the client (each retry / 401 replay is its own).
+    Timings are in seconds:
+    - `connect`: opening the connection (httpx only; 0.0 when reused, None if unknown).
+    - `wait`: send until response headers (connection setup + server time).
+    - `download`: reading the body; `total` = wait + download.
+    """
+
+    route: Optional[str]
+    method: str
+    url: str
+    attempt: int
+    status: Optional[int] = None  # None when the send raised
+    error: Optional[BaseException] = None
+    bytes_out: int = 0
+    bytes_in: int = 0
+    connect: Optional[float] = None
+    wait: float = 0.0
+    download: float = 0.0
+    total: float = 0.0
+
+
+class Hooks:
+    """
+    Client event hooks; subclass and override what you need (all no-ops here).
+    Pass an instance as `Client(hooks=...)` / `ClientConfig(hooks=...)`; with
+    no hooks the request path skips all timing work.
+    Hooks run inline on the calling thread (or event loop): keep them cheap.
+    """
+
+    def on_request_start(
+        self, route: Optional[str], method: str, url: str, attempt: int
+    ) -> None:
+        """Before a send (after auth headers and rate limiting)."""
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        """After a send completed or raised."""
+
+    def on_retry(
+        self, route: Optional[str], attempt: int, delay: float, status: Optional[int]
+    ) -> None:
+        """A failed attempt will be retried after `delay`; `status` None = connection error."""
+
+    def on_auth_refresh(self, elapsed: float, error: Optional[BaseException]) -> None:
+        """A token login/refresh call finished (shared-store adoptions excluded)."""
+
+    def on_coalesced(self, route: Optional[str]) -> None:
+        """A call was answered by an identical in-flight request (coalesce=True)."""
+
+    def on_decode(
+        self, route: Optional[str], phase: str, elapsed: float, nbytes: int
+    ) -> None:
+        """
+        A response body was turned into results. `phase` is "validate" (pydantic
+        parses and validates the bytes in one pass) or "decode" (JSON parse into
+        record views, response_mode="raw").
+        """
+
+    def on_hedge(self, route: Optional[str], won: bool) -> None:
+        """A duplicate of a slow read was sent; `won` when it answered first."""
+
+    def after_fork(self) -> None:
+        """The process forked and this is the child: reset locks / per-process state."""
+
+
+class MultiHooks(Hooks):
+    """Fan events out to several hooks, in order."""
+
+    def __init__(self, *hooks: Hooks) -> None:
+        self.hooks = hooks
+
+    def on_request_start(
+        self, route: Optional[str], method: str, url: str, attempt: int
+    ) -> None:
+        for h in self.hooks:
+            h.on_request_start(route, method, url, attempt)
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        for h in self.hooks:
+            h.on_request_end(info)
+
+    def on_retry(
+        self, route: Optional[str], attempt: int, delay: float, status: Optional[int]
+    ) -> None:
+        for h in self.hooks:
+            h.on_retry(route, attempt, delay, status)
+
+    def on_auth_refresh(self, elapsed: float, error: Optional[BaseException]) -> None:
+        for h in self.hooks:
+            h.on_auth_refresh(elapsed, error)
+
+    def on_coalesced(self, route: Optional[str]) -> None:
+        for h in self.hooks:
+            h.on_coalesced(route)
+
+    def on_decode(
+        self, route: Optional[str], phase: str, elapsed: float, nbytes: int
+    ) -> None:
+        for h in self.hooks:
+            h.on_decode(route, phase, elapsed, nbytes)
+
+    def on_hedge(self, route: Optional[str], won: bool) -> None:
+        for h in self.hooks:
+            h.on_hedge(route, won)
+
+    def after_fork(self) -> None:
+        for h in self.hooks:
+            h.after_fork()
+
+
+def body_size(body: object) -> int:
+    """Length in bytes of a request body as held by requests/httpx."""
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode())
+    try:
+        return len(body)  # type: ignore[arg-type]
+    except TypeError:  # streaming / generator bodies
+        return 0
+
+
+def response_size(resp: Any, stream: bool = False) -> int:
+    """
+    Length in bytes of a response body. A streamed body is not read yet: its
+    Content-Length (as sent, so compressed) stands in, 0 when unknown.
+    """
+    if not stream:
+        return len(resp.content)
+    try:
+        return int(resp.headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
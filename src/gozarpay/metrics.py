@@ -0,0 +1,198 @@
+from __future__ import annotations
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .hooks import Hooks, RequestInfo
+
+# Latency buckets (seconds), Prometheus-client defaults plus a 30s tail.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0, 30.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative on export); not locked, see MetricsHooks."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding quantile `q` (0..1); inf past the last."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsHooks(Hooks):
+    """
+    In-process aggregator: histograms and counters per route key.
+    - `prometheus()` renders the Prometheus text exposition format.
+    - `serve(port)` exposes it on `/metrics` from a daemon thread.
+    One lock guards all series; updates are a few dict/list operations.
+    """
+
+    def __init__(
+        self, buckets: Sequence[float] = DEFAULT_BUCKETS, prefix: str = "gozarpay"
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._hists: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+
+    def __reduce__(self) -> Any:
+        # Series are per process: a pickled copy (e.g. in a pool worker) starts empty.
+        return (MetricsHooks, (self.buckets, self.prefix))
+
+    def after_fork(self) -> None:
+        # The child reports its own traffic only, not a copy of the parent's.
+        self._lock = threading.Lock()
+        self._hists = {}
+        self._counters = {}
+
+    # ---- hooks ----
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        route = info.route or "unknown"
+        status = str(info.status) if info.status is not None else "error"
+        with self._lock:
+            self._observe("request_duration_seconds", info.total, route=route)
+            self._observe("request_wait_seconds", info.wait, route=route)
+            self._observe("request_download_seconds", info.download, route=route)
+            if info.connect is not None:
+                self._observe("request_connect_seconds", info.connect, route=route)
+            self._inc("requests_total", 1, route=route, method=info.method, status=status)
+            self._inc("request_bytes_total", info.bytes_out, route=route)
+            self._inc("response_bytes_total", info.bytes_in, route=route)
+
+    def on_retry(
+        self, route: Optional[str], attempt: int, delay: float, status: Optional[int]
+    ) -> None:
+        reason = str(status) if status is not None else "connection"
+        with self._lock:
+            self._inc("retries_total", 1, route=route or "unknown", reason=reason)
+
+    def on_auth_refresh(self, elapsed: float, error: Optional[BaseException]) -> None:
+        with self._lock:
+            self._observe("auth_refresh_seconds", elapsed)
+            self._inc("auth_refresh_total", 1, outcome="error" if error else "ok")
+
+    def on_coalesced(self, route: Optional[str]) -> None:
+        with self._lock:
+            self._inc("coalesced_total", 1, route=route or "unknown")
+
+    def on_hedge(self, route: Optional[str], won: bool) -> None:
+        with self._lock:
+            self._inc(
+                "hedged_total", 1, route=route or "unknown", winner="hedge" if won else "primary"
+            )
+
+    def on_decode(
+        self, route: Optional[str], phase: str, elapsed: float, nbytes: int
+    ) -> None:
+        with self._lock:
+            self._observe("decode_seconds", elapsed, route=route or "unknown", phase=phase)
+
+    # ---- reading ----
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        """Snapshot access, e.g. `histogram("request_duration_seconds", route=...)`."""
+        return self._hists.get((name, tuple(sorted(labels.items()))))
+
+    def prometheus(self) -> str:
+        p = self.prefix
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted({n for n, _ in self._hists}):
+                lines.append(f"# TYPE {p}_{name} histogram")
+                for (n, labels), h in sorted(self._hists.items()):
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(h.bounds + (float("inf"),), h.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(
+                            f"{p}_{name}_bucket{_fmt(labels + (('le', le),))} {cumulative}"
+                        )
+                    lines.append(f"{p}_{name}_sum{_fmt(labels)} {h.sum!r}")
+                    lines.append(f"{p}_{name}_count{_fmt(labels)} {h.count}")
+            for name in sorted({n for n, _ in self._counters}):
+                lines.append(f"# TYPE {p}_{name} counter")
+                for (n, labels), value in sorted(self._counters.items()):
+                    if n == name:
+                        lines.append(f"{p}_{name}{_fmt(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hists.clear()
+            self._counters.clear()
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve `prometheus()` at http://host:port/metrics; returns the server."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(
+            target=server.serve_forever, name="gozarpay-metrics", daemon=True
+        ).start()
+        return server
+
+    # ---- internals (caller holds the lock) ----
+
+    def _observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        h = self._hists.get(key)
+        if h is None:
+            h = self._hists[key] = Histogram(self.buckets)
+        h.observe(value)
+
+    def _inc(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + value
+
+
+def _fmt(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
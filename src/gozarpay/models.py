@@ -1,8 +1,9 @@
 from __future__ import annotations
+from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Union
-from pydantic import BaseModel, ConfigDict, field_validator
-import json
+from typing import Annotated, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from .decoding import loads
 
 
 class ReceiptStatus(str, Enum):
@@ -19,6 +20,13 @@ class ReceiptStatus(str, Enum):
     divar_verification_notified = "divar_verification_notified"
 
 
+# Lenient response fields: a status this SDK does not know yet, or a date that
+# is not ISO 8601 (e.g. "1403/07/01"), is kept as the raw string instead of
+# failing the whole receipt and the page it came in.
+StatusField = Annotated[Union[ReceiptStatus, str], Field(union_mode="left_to_right")]
+DateTimeField = Annotated[Union[datetime, str], Field(union_mode="left_to_right")]
+
+
 class Network(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: int
@@ -90,19 +98,30 @@ class MarketPrice(BaseModel):
     price: str
     buy_price: str
     sell_price: str
+    # Market legs (code = code1 + code2); currency ids, when the server sends them
+    code1: Optional[str] = None
+    code2: Optional[str] = None
+    currency1: Optional[int] = None
+    currency2: Optional[int] = None
+    title: Optional[str] = None
+    tradable: Optional[bool] = None
+
+    @field_validator("currency1", "currency2", mode="before")
+    @classmethod
+    def _currency_id(cls, v):
+        # Either a bare id or a nested currency object carrying one
+        return v.get("id") if isinstance(v, dict) else v
 
     @field_validator("price_info", mode="before")
     @classmethod
     def _coerce_price_info(cls, v):
-        # If server returned a dict, parse to PriceInfo
-        if isinstance(v, dict):
-            return PriceInfo.model_validate(v)
+        # Dicts are validated into PriceInfo by pydantic-core itself (Union arm).
         # If server returned a JSON string, try to parse → dict → PriceInfo
         if isinstance(v, str):
             try:
-                obj = json.loads(v)
+                obj = loads(v)
                 if isinstance(obj, dict):
-                    return PriceInfo.model_validate(obj)
+                    return obj
             except Exception:
                 # keep as raw string if not JSON
                 return v
@@ -121,11 +140,28 @@ class ReceiptCreate(BaseModel):
 class VerifyReceipt(BaseModel):
     model_config = ConfigDict(extra="ignore")
     reference_id: str
+    # Response only (never sent): the receipt status, when the server reports it
+    status: Optional[StatusField] = Field(default=None, exclude=True)
 
 
 class Receipt(BaseModel):
     model_config = ConfigDict(extra="ignore")
     redirect_url: str
+    id: Optional[int] = None
+    reference_id: Optional[str] = None
+    status: Optional[StatusField] = None
+    irt_amount: Optional[str] = None
+    created_at: Optional[DateTimeField] = None
+
+
+class ReceiptCallback(BaseModel):
+    """Body (JSON or form) / query the gateway sends to a receipt's `callback` URL."""
+
+    model_config = ConfigDict(extra="ignore")
+    reference_id: str
+    status: Optional[StatusField] = None
+    id: Optional[int] = None
+    irt_amount: Optional[str] = None
 
 
 class PaginatedReceiptList(BaseModel):
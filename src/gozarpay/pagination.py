@@ -0,0 +1,238 @@
+from __future__ import annotations
+import math
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+)
+from .exceptions import APIError
+
+T = TypeVar("T")
+
+
+class Page(Protocol[T]):
+    """Shape shared by PaginatedReceiptList / PaginatedWalletList."""
+
+    count: int
+    next: Optional[str]
+    results: List[T]
+
+
+def _plan(first: Page) -> int:
+    """Total pages implied by page 1 (`count` / page size)."""
+    size = len(first.results)
+    if not first.next or size == 0:
+        return 1
+    return max(2, math.ceil(first.count / size))
+
+
+def _past_end(exc: BaseException) -> bool:
+    # DRF answers 404 "Invalid page" when `count` shrank during the crawl.
+    return isinstance(exc, APIError) and exc.status_code == 404
+
+
+class Paginator(Generic[T]):
+    """
+    Iterate every item of a paginated endpoint, prefetching pages concurrently.
+    - Page 1 is fetched first; its `count` sizes the crawl.
+    - Up to `concurrency` pages are in flight, at most `window` pages ahead of the
+      consumer (bounded memory); items are yielded in page order.
+    - If the server still reports `next` after the planned last page, the walk
+      continues page by page.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int], Page[T]],
+        *,
+        concurrency: int = 4,
+        window: Optional[int] = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self._fetch = fetch
+        self.concurrency = concurrency
+        self.window = max(window or concurrency * 2, concurrency)
+
+    def __iter__(self) -> Iterator[T]:
+        first = self._fetch(1)
+        yield from first.results
+        if not first.next:
+            return
+        last = _plan(first)
+        if self.concurrency == 1:
+            yield from self._sequential(2)
+            return
+
+        pool = ThreadPoolExecutor(self.concurrency, thread_name_prefix="gozarpay-page")
+        pending: Deque[Tuple[int, Future]] = deque()
+        upcoming = 2
+        try:
+            while pending or upcoming <= last:
+                while upcoming <= last and len(pending) < self.window:
+                    pending.append((upcoming, pool.submit(self._fetch, upcoming)))
+                    upcoming += 1
+                number, fut = pending.popleft()
+                try:
+                    page = fut.result()
+                except Exception as exc:
+                    if _past_end(exc):
+                        return
+                    raise
+                yield from page.results
+                if number == last and page.next:
+                    yield from self._sequential(last + 1)
+                    return
+                if not page.next:
+                    return
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _sequential(self, page_no: int) -> Iterator[T]:
+        while True:
+            try:
+                page = self._fetch(page_no)
+            except Exception as exc:
+                if _past_end(exc):
+                    return
+                raise
+            yield from page.results
+            if not page.next:
+                return
+            page_no += 1
+
+
+class AsyncPaginator(Generic[T]):
+    """asyncio twin of `Paginator` (tasks instead of threads)."""
+
+    def __init__(
+        self,
+        fetch: Callable[[int], Awaitable[Page[T]]],
+        *,
+        concurrency: int = 4,
+        window: Optional[int] = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self._fetch = fetch
+        self.concurrency = concurrency
+        self.window = max(window or concurrency * 2, concurrency)
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        first = await self._fetch(1)
+        for item in first.results:
+            yield item
+        if not first.next:
+            return
+        last = _plan(first)
+        if self.concurrency == 1:
+            async for item in self._sequential(2):
+                yield item
+            return
+
+        import asyncio
+
+        gate = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(number: int) -> Any:
+            async with gate:
+                return await self._fetch(number)
+
+        pending: Deque[Tuple[int, "asyncio.Task[Any]"]] = deque()
+        upcoming = 2
+        try:
+            while pending or upcoming <= last:
+                while upcoming <= last and len(pending) < self.window:
+                    pending.append((upcoming, asyncio.ensure_future(fetch(upcoming))))
+                    upcoming += 1
+                number, task = pending.popleft()
+                try:
+                    page = await task
+                except Exception as exc:
+                    if _past_end(exc):
+                        return
+                    raise
+                for item in page.results:
+                    yield item
+                if number == last and page.next:
+                    async for item in self._sequential(last + 1):
+                        yield item
+                    return
+                if not page.next:
+                    return
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _sequential(self, page_no: int) -> AsyncIterator[T]:
+        while True:
+            try:
+                page = await self._fetch(page_no)
+            except Exception as exc:
+                if _past_end(exc):
+                    return
+                raise
+            for item in page.results:
+                yield item
+            if not page.next:
+                return
+            page_no += 1
+
+
+# A page opener for streamed crawls: (page number, meta) -> the page's items as
+# they are decoded; `meta` gets the page's other fields (`next`, ...) once read.
+StreamPage = Callable[[int, Dict[str, Any]], Iterator[T]]
+AsyncStreamPage = Callable[[int, Dict[str, Any]], AsyncIterator[T]]
+
+
+def _check_stream(stream: bool, concurrency: int) -> None:
+    if stream and concurrency != 1:
+        raise ValueError("stream=True reads pages one after another (concurrency=1)")
+
+
+def iter_streamed(open_page: StreamPage[T]) -> Iterator[T]:
+    """
+    Every item, page after page (no prefetch), each page streamed: memory
+    holds one item at a time instead of one or more decoded pages.
+    """
+    page_no = 1
+    while True:
+        meta: Dict[str, Any] = {}
+        try:
+            yield from open_page(page_no, meta)
+        except APIError as exc:
+            if page_no > 1 and _past_end(exc):
+                return
+            raise
+        if not meta.get("next"):
+            return
+        page_no += 1
+
+
+async def aiter_streamed(open_page: AsyncStreamPage[T]) -> AsyncIterator[T]:
+    """asyncio twin of `iter_streamed`."""
+    page_no = 1
+    while True:
+        meta: Dict[str, Any] = {}
+        try:
+            async for item in open_page(page_no, meta):
+                yield item
+        except APIError as exc:
+            if page_no > 1 and _past_end(exc):
+                return
+            raise
+        if not meta.get("next"):
+            return
+        page_no += 1
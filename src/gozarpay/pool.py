@@ -0,0 +1,197 @@
+from __future__ import annotations
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Tuple
+from .auth.store import MemoryTokenStore
+from .client import Client
+from .config import ClientConfig
+from .factory import _async_pool_options, _client_options, _transport, create_client
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .async_client import AsyncClient
+
+Credentials = Tuple[str, str]  # (api_key, secret_key)
+
+
+@dataclass(slots=True)
+class PoolStats:
+    hits: int = 0
+    misses: int = 0  # client built: first use, or again after eviction
+    evictions: int = 0  # over max_clients (least recently used first)
+    expired: int = 0  # idle for idle_timeout
+
+
+@dataclass(slots=True)
+class _Slot:
+    client: Any
+    last_used: float
+
+
+class _TenantPool(ABC):
+    """LRU of per-credentials clients with idle expiry (subclasses build them)."""
+
+    def __init__(self, config: ClientConfig, max_clients: int, idle_timeout: float) -> None:
+        if max_clients < 1 or idle_timeout <= 0:
+            raise ValueError("max_clients must be >= 1 and idle_timeout positive")
+        # Tenant-independent template; tokens live in the shared store, not here.
+        self._config = replace(
+            config,
+            api_key=None,
+            secret_key=None,
+            access_token=None,
+            refresh_token=None,
+            token_store=config.token_store or MemoryTokenStore(),
+        )
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.stats = PoolStats()
+        self._lock = threading.Lock()
+        self._slots: "OrderedDict[Credentials, _Slot]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def get(self, api_key: str, secret_key: str) -> Any:
+        """The client for these credentials (built on first use; no network)."""
+        key = (api_key, secret_key)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            slot = self._slots.get(key)
+            if slot is not None:
+                slot.last_used = now
+                self._slots.move_to_end(key)
+                self.stats.hits += 1
+                return slot.client
+            self.stats.misses += 1
+            client = self._build(api_key, secret_key)
+            self._slots[key] = _Slot(client, now)
+            while len(self._slots) > self.max_clients:
+                self._slots.popitem(last=False)
+                self.stats.evictions += 1
+            return client
+
+    def discard(self, api_key: str, secret_key: str) -> None:
+        """Forget a tenant's client (e.g. after its credentials were rotated)."""
+        with self._lock:
+            self._slots.pop((api_key, secret_key), None)
+
+    def _expire(self, now: float) -> None:
+        # Slots are in last-used order, so idle ones sit at the front.
+        while self._slots:
+            slot = next(iter(self._slots.values()))
+            if now - slot.last_used < self.idle_timeout:
+                return
+            self._slots.popitem(last=False)
+            self.stats.expired += 1
+
+    @abstractmethod
+    def _build(self, api_key: str, secret_key: str) -> Any: ...
+
+
+class ClientPool(_TenantPool):
+    """
+    Clients for many merchants (api_key/secret_key pairs) behind one connection pool.
+    - `config` is the template (base_url, version, retry, hooks, ...); every
+      tenant client shares its transport (built once from pool_size /
+      keep_alive / timeout unless `config.transport` is given) and token store
+      (a MemoryTokenStore unless `config.token_store` is given).
+    - `get(api_key, secret_key)` is a dict lookup once the tenant is warm;
+      clients are evicted least-recently-used past `max_clients`, or after
+      `idle_timeout` seconds unused. An evicted tenant's tokens stay in the
+      store, so rebuilding its client does not log in again.
+    Close the pool (or use `with`) to release the shared transport.
+    """
+
+    def __init__(
+        self,
+        config: ClientConfig,
+        *,
+        max_clients: int = 1024,
+        idle_timeout: float = 900.0,
+    ) -> None:
+        super().__init__(config, max_clients, idle_timeout)
+        self._owns_transport = config.transport is None
+        self._config.transport = _transport(self._config)
+
+    def get(self, api_key: str, secret_key: str) -> Client:
+        return super().get(api_key, secret_key)
+
+    def close(self) -> None:
+        with self._lock:
+            self._slots.clear()
+        if self._owns_transport:
+            self._config.transport.close()  # type: ignore[union-attr]
+
+    def __enter__(self) -> "ClientPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _build(self, api_key: str, secret_key: str) -> Client:
+        return create_client(replace(self._config, api_key=api_key, secret_key=secret_key))
+
+
+class AsyncClientPool(_TenantPool):
+    """
+    asyncio twin of `ClientPool`: AsyncClients sharing one `httpx.AsyncClient`
+    (sized by the config's pool_size / keep_alive / timeout) and token store.
+    Use `async with`, or `await aclose()`.
+    """
+
+    def __init__(
+        self,
+        config: ClientConfig,
+        *,
+        max_clients: int = 1024,
+        idle_timeout: float = 900.0,
+    ) -> None:
+        from .async_client import _httpx_transport, httpx
+
+        if httpx is None:
+            raise ImportError(
+                "AsyncClientPool requires httpx; install with `pip install gozarpay[async]`"
+            )
+        super().__init__(config, max_clients, idle_timeout)
+        opts = _async_pool_options(self._config)
+        self._http = httpx.AsyncClient(
+            timeout=opts["timeout"],
+            limits=httpx.Limits(
+                max_connections=opts["max_connections"],
+                max_keepalive_connections=opts["max_keepalive_connections"],
+            ),
+            transport=_httpx_transport(opts["transport"]),
+        )
+
+    def get(self, api_key: str, secret_key: str) -> AsyncClient:
+        return super().get(api_key, secret_key)
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._slots.clear()
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncClientPool":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _build(self, api_key: str, secret_key: str) -> AsyncClient:
+        from .async_client import AsyncClient
+        from .auth.strategies import AsyncApiKeyAuth
+
+        cfg = self._config
+        return AsyncClient(
+            base_url=cfg.base_url,
+            version=cfg.version,
+            auth_strategy=AsyncApiKeyAuth(
+                cfg.base_url, api_key, secret_key, store=cfg.token_store
+            ),
+            http_client=self._http,
+            **_client_options(cfg),
+        )
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+from .bulk import BulkRun
+from .client import Client
+from .models import Receipt, Wallet
+from .pagination import _plan
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# The worker process's own Client (forked copy or unpickled from its config)
+_client: Optional[Client] = None
+
+
+def _init_worker(client: Client) -> None:
+    global _client
+    _client = client
+
+
+def _in_worker(fn: Callable[[Client, K], List[V]], key: K) -> List[V]:
+    return fn(_client, key)  # type: ignore[arg-type]
+
+
+def wallets_of(
+    client: Client, phone: str, *, search: Optional[str] = None, validate: Optional[bool] = None
+) -> List[Wallet]:
+    """Every wallet of `phone` (all pages)."""
+    return list(client.wallet.iter_by_phone(phone=phone, search=search, validate=validate))
+
+
+def receipt_page(
+    client: Client, page: int, *, validate: Optional[bool] = None
+) -> List[Receipt]:
+    """The receipts of one `receipt.list` page."""
+    return client.receipt.list(page=page, validate=validate).results
+
+
+class ProcessExecutor:
+    """
+    Spread fetch + decode of bulk calls across CPU cores.
+    JSON parsing and Pydantic validation of big pages hold the GIL, so threads
+    stop scaling once decode dominates; here each of `processes` workers owns
+    a copy of `client` (forked, or rebuilt from its ClientConfig under spawn /
+    forkserver, with the current tokens: no new login) and sends the decoded
+    models back as they complete.
+    - `run(fn, keys)` calls `fn(client, key) -> list` in the workers and
+      returns a BulkRun: iterate for `(key, value)` pairs in completion order,
+      then read `.errors` / `.stats`. `fn` must be a module-level function
+      (picklable); `functools.partial` for extra arguments is fine.
+    - `wallets(phones)` and `receipts()` cover the common reconciliation reads.
+    The client must come from `create_client` (so it can be pickled); hooks
+    and caches in its config are per worker. Use `with`, or `close()`.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        *,
+        processes: Optional[int] = None,
+        mp_context: Any = None,
+    ) -> None:
+        self.processes = processes or os.cpu_count() or 1
+        if self.processes < 1:
+            raise ValueError("processes must be >= 1")
+        self._client = client
+        self._pool = ProcessPoolExecutor(
+            self.processes,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(client,),
+        )
+
+    def run(self, fn: Callable[[Client, K], List[V]], keys: Iterable[K]) -> BulkRun[K, V]:
+        return BulkRun(
+            keys,
+            partial(_in_worker, fn),
+            max_workers=self.processes,
+            executor=self._pool,
+        )
+
+    def wallets(
+        self,
+        phones: Iterable[str],
+        *,
+        search: Optional[str] = None,
+        validate: Optional[bool] = None,
+    ) -> BulkRun[str, Wallet]:
+        """`wallet.list_many` on processes: `(phone, Wallet)` pairs."""
+        return self.run(partial(wallets_of, search=search, validate=validate), phones)
+
+    def receipts(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        *,
+        validate: Optional[bool] = None,
+    ) -> BulkRun[int, Receipt]:
+        """
+        `(page, Receipt)` pairs for `pages`, or for every page: page 1 is then
+        read here first, as raw records (no validation), to size the crawl.
+        """
+        if pages is None:
+            first = self._client.receipt.list(page=1, validate=False)
+            pages = range(1, _plan(first) + 1)
+        return self.run(partial(receipt_page, validate=validate), pages)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "ProcessExecutor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,263 @@
+from __future__ import annotations
+import json
+import math
+import os
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from . import deadlines
+from .exceptions import DeadlineExceeded
+from .locks import FileLock
+
+# Bucket key used for requests that carry no route key.
+DEFAULT_KEY = "default"
+
+_UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+@dataclass(frozen=True, slots=True)
+class Rate:
+    """`per_second` sustained requests with bursts of up to `burst` (>= 1)."""
+
+    per_second: float
+    burst: int = 0
+
+    def __post_init__(self) -> None:
+        if self.per_second <= 0:
+            raise ValueError("per_second must be positive")
+        if self.burst <= 0:
+            object.__setattr__(self, "burst", max(1, math.ceil(self.per_second)))
+
+    @classmethod
+    def parse(cls, spec: str) -> "Rate":
+        """`"10/s"`, `"120/m"`, `"5000/h"`; an optional `"@burst"` suffix sets the burst."""
+        spec, _, burst = spec.strip().partition("@")
+        count, _, unit = spec.partition("/")
+        per = _UNITS.get(unit.strip() or "s")
+        if per is None:
+            raise ValueError(f"Unknown rate unit in {spec!r} (use /s, /m or /h)")
+        return cls(float(count) / per, int(burst) if burst else 0)
+
+
+def parse_limits(spec: str) -> Dict[str, Rate]:
+    """`"market.price_stats=10/s, receipt.create=2/s@5"` → {route key: Rate}."""
+    limits: Dict[str, Rate] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, sep, rate = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected <route>=<rate>, got {item!r}")
+        limits[route.strip()] = Rate.parse(rate)
+    return limits
+
+
+def _take(state: Optional[List[float]], rate: Rate, now: float) -> Tuple[List[float], float]:
+    """
+    Reserve one token. Returns the new `[tokens, updated_at]` and the wait in
+    seconds before the reservation is due (tokens may go negative: callers queue).
+    """
+    if state is None:
+        tokens = float(rate.burst)
+    else:
+        tokens, updated_at = state
+        tokens = min(float(rate.burst), tokens + max(0.0, now - updated_at) * rate.per_second)
+    tokens -= 1.0
+    wait = -tokens / rate.per_second if tokens < 0 else 0.0
+    return [tokens, now], wait
+
+
+class BucketBackend(ABC):
+    """Where bucket state lives; `take` is atomic for everyone sharing the backend."""
+
+    @abstractmethod
+    def take(self, key: str, rate: Rate, now: float) -> float: ...
+
+    def _after_fork(self) -> None:
+        """Forked child: reset thread locks (no-op for cross-process backends)."""
+
+
+class MemoryBucketBackend(BucketBackend):
+    """In-process buckets: shared by clients/threads of one process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, List[float]] = {}
+
+    def __reduce__(self) -> Any:
+        # Per-process budget: a pickled copy starts with full buckets.
+        return (MemoryBucketBackend, ())
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: Rate, now: float) -> float:
+        with self._lock:
+            self._buckets[key], wait = _take(self._buckets.get(key), rate, now)
+        return wait
+
+
+class FileBucketBackend(BucketBackend):
+    """JSON file of buckets guarded by `<path>.lock` (flock): one host, many processes."""
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self._lock = FileLock(self.path + ".lock")
+
+    def take(self, key: str, rate: Rate, now: float) -> float:
+        with self._lock:
+            buckets = self._read_all()
+            buckets[key], wait = _take(buckets.get(key), rate, now)
+            with open(self.path, "w") as fh:
+                json.dump(buckets, fh)
+        return wait
+
+    def _read_all(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as fh:
+                data = json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+class SharedMemoryBucketBackend(BucketBackend):
+    """
+    Buckets in a POSIX shared-memory segment (length-prefixed JSON), guarded by
+    a lock file in tmp; attach from every worker with the same `name`.
+    """
+
+    _HEADER = struct.Struct("<I")
+
+    def __init__(self, name: str = "gozarpay-ratelimit", size: int = 16 * 1024) -> None:
+        from multiprocessing import shared_memory
+        from .auth.store import _untrack
+
+        self.name = name
+        self._lock = FileLock(os.path.join(tempfile.gettempdir(), f"{name}.lock"))
+        with self._lock:
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+                self._HEADER.pack_into(self._shm.buf, 0, 0)
+            except FileExistsError:
+                self._shm = shared_memory.SharedMemory(name=name)
+        _untrack(self._shm)
+
+    def __reduce__(self) -> Any:
+        return (SharedMemoryBucketBackend, (self.name, self._shm.size))
+
+    def take(self, key: str, rate: Rate, now: float) -> float:
+        with self._lock:
+            buckets = self._read_all()
+            buckets[key], wait = _take(buckets.get(key), rate, now)
+            raw = json.dumps(buckets).encode()
+            if self._HEADER.size + len(raw) > self._shm.size:
+                raise ValueError(
+                    f"Bucket map exceeds shared memory size ({self._shm.size} bytes)"
+                )
+            buf = self._shm.buf
+            buf[self._HEADER.size : self._HEADER.size + len(raw)] = raw
+            self._HEADER.pack_into(buf, 0, len(raw))
+        return wait
+
+    def close(self) -> None:
+        self._shm.close()
+
+    def unlink(self) -> None:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.register(self._shm._name, "shared_memory")  # undo _untrack
+        self._shm.unlink()
+
+    def _read_all(self) -> Dict[str, Any]:
+        (length,) = self._HEADER.unpack_from(self._shm.buf, 0)
+        if not length:
+            return {}
+        start = self._HEADER.size
+        try:
+            data = json.loads(bytes(self._shm.buf[start : start + length]))
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+def backend_from_url(url: str) -> BucketBackend:
+    """`shm://<name>` → SharedMemoryBucketBackend, anything else → FileBucketBackend(path)."""
+    if url.startswith("shm://"):
+        return SharedMemoryBucketBackend(url[len("shm://") :] or "gozarpay-ratelimit")
+    return FileBucketBackend(url)
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter consulted before every send.
+    - `limits` maps route keys (see VersionSpec.routes) to a Rate; `default`
+      covers other routes and un-keyed requests (None: unlimited).
+    - Buckets live in `backend` (memory by default; file / shared memory to
+      share one budget between worker processes); `namespace` prefixes the
+      bucket keys so several accounts can share a backend.
+    - Callers reserve a slot and sleep until it is due, so waiters are served
+      in arrival order instead of racing for the next token.
+    - A wait longer than the call's remaining deadline raises DeadlineExceeded
+      at once instead of sleeping.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, Rate | str],
+        *,
+        default: Rate | str | None = None,
+        backend: Optional[BucketBackend] = None,
+        namespace: str = "",
+    ) -> None:
+        self.limits: Dict[str, Rate] = {
+            route: Rate.parse(rate) if isinstance(rate, str) else rate
+            for route, rate in limits.items()
+        }
+        self.default = Rate.parse(default) if isinstance(default, str) else default
+        self.backend = backend or MemoryBucketBackend()
+        self.namespace = namespace
+
+    def validate(self, routes: Iterable[str]) -> None:
+        """Raise KeyError for limits on route keys the API version does not define."""
+        unknown = sorted(set(self.limits) - set(routes))
+        if unknown:
+            raise KeyError(f"Rate limits for unknown route keys: {', '.join(unknown)}")
+
+    def reserve(self, route: Optional[str]) -> float:
+        """Take a token for `route`; returns seconds to wait before sending."""
+        rate = self.limits.get(route) if route is not None else None
+        key = route if rate is not None else DEFAULT_KEY
+        rate = rate or self.default
+        if rate is None:
+            return 0.0
+        return self.backend.take(f"{self.namespace}:{key}", rate, time.time())
+
+    def acquire(self, route: Optional[str]) -> float:
+        """Block until `route` may send; returns the seconds waited."""
+        wait = self._check(route, self.reserve(route))
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, route: Optional[str]) -> float:
+        """asyncio twin of `acquire`; file / shared-memory backends lock in a worker thread."""
+        import asyncio
+
+        if isinstance(self.backend, MemoryBucketBackend):
+            wait = self.reserve(route)
+        else:
+            wait = await asyncio.to_thread(self.reserve, route)
+        wait = self._check(route, wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    @staticmethod
+    def _check(route: Optional[str], wait: float) -> float:
+        # Fail fast rather than sleep past the call's deadline (the slot stays taken).
+        if wait > 0 and not deadlines.fits(wait):
+            raise DeadlineExceeded(route)
+        return wait
@@ -0,0 +1,142 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Type, get_args, get_origin
+from pydantic import BaseModel
+from . import models
+from .decoding import loads
+
+
+class Record:
+    """
+    Unvalidated, read-only view over one decoded JSON object.
+    - One slot (the source dict): far lighter than a BaseModel instance.
+    - Attributes resolve lazily from the dict; nested objects are wrapped on access.
+      An absent optional field reads as its model default (None).
+    - `to_model()` upgrades the view to the full, validated Pydantic model.
+    """
+
+    __slots__ = ("_data",)
+
+    model: ClassVar[Optional[Type[BaseModel]]] = None
+    # field name -> converter applied to the raw value on attribute access
+    nested: ClassVar[Dict[str, Callable[[Any], Any]]] = {}
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            value = self._data[name]
+        except KeyError:
+            # An optional field the server left out reads as its default (None),
+            # as on the model; only names the model does not declare raise.
+            field = self.model.model_fields.get(name) if self.model is not None else None
+            if field is None or field.is_required():
+                raise AttributeError(
+                    f"{type(self).__name__!s} has no field '{name}'"
+                ) from None
+            return field.get_default(call_default_factory=True)
+        convert = self.nested.get(name)
+        return convert(value) if convert is not None and value is not None else value
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and other._data == self._data  # type: ignore[attr-defined]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+    def __reduce__(self) -> Any:
+        return (type(self), (self._data,))
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """The underlying decoded JSON object."""
+        return self._data
+
+    def to_model(self) -> BaseModel:
+        if self.model is None:
+            raise TypeError(f"{type(self).__name__} has no model to upgrade to")
+        return self.model.model_validate(self._data)
+
+
+def _many(cls: Type[Record]) -> Callable[[Any], List[Record]]:
+    return lambda items: [cls(item) for item in items]
+
+
+def _price_info(value: Any) -> Any:
+    # Mirrors MarketPrice._coerce_price_info: JSON strings become views too.
+    if isinstance(value, str):
+        try:
+            value = loads(value)
+        except ValueError:
+            return value
+    return PriceInfoRecord(value) if isinstance(value, dict) else value
+
+
+class NetworkRecord(Record):
+    __slots__ = ()
+    model = models.Network
+
+
+class CurrencyRecord(Record):
+    __slots__ = ()
+    model = models.Currency
+    nested = {"networks": _many(NetworkRecord)}
+
+
+class CurrencySummeryRecord(Record):
+    __slots__ = ()
+    model = models.CurrencySummery
+
+
+class WalletRecord(Record):
+    __slots__ = ()
+    model = models.Wallet
+    nested = {"currency": CurrencySummeryRecord}
+
+
+class PaginatedWalletListRecord(Record):
+    __slots__ = ()
+    model = models.PaginatedWalletList
+    nested = {"results": _many(WalletRecord)}
+
+
+class PriceInfoRecord(Record):
+    __slots__ = ()
+    model = models.PriceInfo
+
+
+class MarketPriceRecord(Record):
+    __slots__ = ()
+    model = models.MarketPrice
+    nested = {"price_info": _price_info}
+
+
+class ReceiptRecord(Record):
+    __slots__ = ()
+    model = models.Receipt
+
+
+class PaginatedReceiptListRecord(Record):
+    __slots__ = ()
+    model = models.PaginatedReceiptList
+    nested = {"results": _many(ReceiptRecord)}
+
+
+_VIEWS: Dict[Type[BaseModel], Type[Record]] = {
+    cls.model: cls for cls in Record.__subclasses__() if cls.model is not None
+}
+
+
+@lru_cache(maxsize=None)
+def view_for(tp: Any) -> Callable[[Any], Any]:
+    """Converter from decoded JSON to record views for `tp` (model or List[model])."""
+    if get_origin(tp) in (list, List):
+        (item_tp,) = get_args(tp)
+        return _many(_VIEWS[item_tp])
+    return _VIEWS[tp]
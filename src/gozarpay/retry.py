@@ -0,0 +1,195 @@
+from __future__ import annotations
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+from .exceptions import CircuitOpenError
+
+# Route keys whose calls are safe to repeat (reads, and verify which is a no-op
+# once a receipt is verified).
+IDEMPOTENT_ROUTES: FrozenSet[str] = frozenset(
+    {
+        "market.price_stats",
+        "receipt.get",
+        "receipt.list",
+        "receipt.verify",
+        "wallet.list_by_phone",
+    }
+)
+# Route keys retried only when the request carries IDEMPOTENCY_HEADER.
+GUARDED_ROUTES: FrozenSet[str] = frozenset({"receipt.create"})
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+RETRY_STATUSES: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when - (now if now is not None else time.time()))
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """
+    When and how long to wait before repeating a failed request.
+    - Only idempotent route keys are retried (plus GUARDED_ROUTES that send an
+      `Idempotency-Key` header); requests without a route key fall back to the
+      HTTP method (GET/HEAD).
+    - Retries connection errors and RETRY_STATUSES, up to `max_attempts` sends.
+    - Backoff is exponential with full jitter; a `Retry-After` header sets the
+      floor, and one longer than `max_retry_after` is not waited out.
+    - `breaker_threshold` consecutive failures (5xx / connection errors) open the
+      per-host circuit for `breaker_reset` seconds; 0 disables the breaker.
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.25
+    backoff_max: float = 10.0
+    max_retry_after: float = 60.0
+    statuses: FrozenSet[int] = RETRY_STATUSES
+    idempotent_routes: FrozenSet[str] = IDEMPOTENT_ROUTES
+    guarded_routes: FrozenSet[str] = GUARDED_ROUTES
+    breaker_threshold: int = 5
+    breaker_reset: float = 30.0
+
+    def allows(
+        self, method: str, route: Optional[str], headers: Mapping[str, str]
+    ) -> bool:
+        """True when a request may be sent more than once."""
+        if self.max_attempts <= 1:
+            return False
+        if route is None:
+            return method.upper() in ("GET", "HEAD")
+        if route in self.idempotent_routes:
+            return True
+        return route in self.guarded_routes and IDEMPOTENCY_HEADER in headers
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before send number `attempt + 1` (attempt >= 1)."""
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def wait_for(
+        self, attempt: int, status: Optional[int] = None, retry_after: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Delay before retrying after `attempt` failed sends, or None to give up.
+        `status` is None for connection errors.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if status is not None and status not in self.statuses:
+            return None
+        delay = self.backoff(attempt)
+        hinted = parse_retry_after(retry_after)
+        if hinted is not None:
+            if hinted > self.max_retry_after:
+                return None
+            delay = max(delay, hinted)
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1, breaker_threshold=0)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (thread-safe).
+    - closed: requests flow; `threshold` failures in a row open the circuit.
+    - open: `check()` raises CircuitOpenError until `reset_timeout` elapses.
+    - half-open: one probe goes through; success closes, failure re-opens.
+    """
+
+    __slots__ = ("host", "threshold", "reset_timeout", "_lock", "_failures", "_opened_at")
+
+    def __init__(self, host: str, threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.host = host
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def check(self) -> None:
+        """Raise CircuitOpenError while open; let a single probe through when due."""
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(self.host, remaining)
+            # Half-open: restart the timer so concurrent callers keep failing
+            # fast while this probe is in flight (and a lost probe is retried).
+            self._opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.threshold or self._opened_at is not None:
+                self._opened_at = time.monotonic()
+
+    def record(self, status: int) -> None:
+        """Count a response: 5xx is a failure, anything else proves the host is up."""
+        if status >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+_BREAKERS: Dict[Tuple[str, int, float], CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def _reset_breakers() -> None:
+    # A forked child starts with closed circuits and an unheld registry lock;
+    # clients pick up their new breaker in Client._after_fork.
+    global _BREAKERS_LOCK
+    _BREAKERS_LOCK = threading.Lock()
+    _BREAKERS.clear()
+
+
+if hasattr(os, "register_at_fork"):  # POSIX
+    os.register_at_fork(after_in_child=_reset_breakers)
+
+
+def breaker_for(base_url: str, policy: RetryPolicy) -> CircuitBreaker:
+    """The process-wide breaker for `base_url`'s host (shared by every client)."""
+    host = urlsplit(base_url).netloc or base_url
+    key = (host, policy.breaker_threshold, policy.breaker_reset)
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(key)
+        if breaker is None:
+            breaker = _BREAKERS[key] = CircuitBreaker(
+                host, policy.breaker_threshold, policy.breaker_reset
+            )
+        return breaker
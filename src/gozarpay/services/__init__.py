@@ -1,5 +1,27 @@
-from .market import MarketService
-from .receipt import ReceiptService
-from .wallet import WalletService
+from __future__ import annotations
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["MarketService", "ReceiptService", "WalletService"]
+if TYPE_CHECKING:  # pragma: no cover
+    from .market import MarketService, AsyncMarketService
+    from .receipt import ReceiptService, AsyncReceiptService
+    from .wallet import WalletService, AsyncWalletService
+
+# Loaded on first access so a client only imports the services it uses.
+_EXPORTS = {
+    "MarketService": ".market",
+    "ReceiptService": ".receipt",
+    "WalletService": ".wallet",
+    "AsyncMarketService": ".market",
+    "AsyncReceiptService": ".receipt",
+    "AsyncWalletService": ".wallet",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
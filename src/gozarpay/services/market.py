@@ -1,14 +1,51 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from ..cache import TTLCache, params_key
 from ..models import MarketPrice
+from ..decoding import ResponseMode, decode, wants_validation
+from ..snapshot import MarketSnapshot
+from ..streaming import aiter_items, iter_items
 from ..versioning import VersionRouter
 
 
+def _price_stats_params(
+    code1: Optional[str],
+    code2: Optional[str],
+    currency1: Optional[int],
+    currency2: Optional[int],
+    title: Optional[str],
+    tradable: Optional[bool],
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    if code1 is not None:
+        params["code1"] = code1
+    if code2 is not None:
+        params["code2"] = code2
+    if currency1 is not None:
+        params["currency1"] = currency1
+    if currency2 is not None:
+        params["currency2"] = currency2
+    if title is not None:
+        params["title"] = title
+    if tradable is not None:
+        params["tradable"] = str(tradable).lower()
+    return params
+
+
 class MarketService:
-    def __init__(self, request, router: VersionRouter):
+    def __init__(
+        self,
+        request,
+        router: VersionRouter,
+        cache: Optional[TTLCache] = None,
+        response_mode: ResponseMode | str = ResponseMode.model,
+    ):
         # `request` is a callable injected by Client to perform HTTP calls.
         self._request = request
         self._router = router
+        # Opt-in price_stats cache keyed by the normalized params dict
+        self._cache = cache
+        self._response_mode = response_mode
 
     def price_stats(
         self,
@@ -19,23 +56,177 @@ class MarketService:
         currency2: Optional[int] = None,
         title: Optional[str] = None,
         tradable: Optional[bool] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> List[MarketPrice]:
+        """
+        Public endpoint: market price stats (no auth header).
+        `validate=False` returns MarketPriceRecord views instead of models;
+        `deadline` caps the call in seconds (retries included).
+        """
+        params = _price_stats_params(code1, code2, currency1, currency2, title, tradable)
+        path = self._router.path("market.price_stats")
+        validate = wants_validation(self._response_mode, validate)
+        if self._cache is None:
+            return self._fetch(path, params, validate, deadline)
+        key = params_key(path, validate, params=params)
+        return list(
+            self._cache.get_or_load(
+                key, lambda: self._fetch(path, params, validate, deadline)
+            )
+        )
+
+    def iter_price_stats(
+        self,
+        *,
+        code1: Optional[str] = None,
+        code2: Optional[str] = None,
+        currency1: Optional[int] = None,
+        currency2: Optional[int] = None,
+        title: Optional[str] = None,
+        tradable: Optional[bool] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> Iterator[MarketPrice]:
+        """
+        price_stats, streamed: markets are yielded one by one while the body
+        arrives (memory stays flat; the first one does not wait for the last
+        byte). Bypasses the price cache; `deadline` covers the call up to the
+        response headers.
+        """
+        params = _price_stats_params(code1, code2, currency1, currency2, title, tradable)
+        resp = self._request(
+            "GET",
+            self._router.path("market.price_stats"),
+            params=params,
+            auth=False,
+            route="market.price_stats",
+            deadline=deadline,
+            stream=True,
+        )
+        yield from iter_items(
+            resp, MarketPrice, wants_validation(self._response_mode, validate)
+        )
+
+    def snapshot(
+        self,
+        *,
+        tradable: Optional[bool] = None,
+        max_legs: int = 3,
+    ) -> MarketSnapshot:
+        """
+        One price_stats fetch, indexed as a MarketSnapshot (pair lookups and
+        cross rates in memory). Reads record views: no model validation.
+        """
+        return MarketSnapshot(
+            self.price_stats(tradable=tradable, validate=False), max_legs=max_legs
+        )
+
+    def _fetch(
+        self, path: str, params: Dict[str, Any], validate: bool, deadline: Optional[float]
     ) -> List[MarketPrice]:
-        """Public endpoint: market price stats (no auth header)."""
-        params: Dict[str, Any] = {}
-        if code1 is not None:
-            params["code1"] = code1
-        if code2 is not None:
-            params["code2"] = code2
-        if currency1 is not None:
-            params["currency1"] = currency1
-        if currency2 is not None:
-            params["currency2"] = currency2
-        if title is not None:
-            params["title"] = title
-        if tradable is not None:
-            params["tradable"] = str(tradable).lower()
+        resp = self._request(
+            "GET",
+            path,
+            params=params,
+            auth=False,
+            route="market.price_stats",
+            deadline=deadline,
+        )
+        return decode(resp, List[MarketPrice], validate)
+
+
+class AsyncMarketService:
+    def __init__(
+        self,
+        request,
+        router: VersionRouter,
+        cache: Optional[TTLCache] = None,
+        response_mode: ResponseMode | str = ResponseMode.model,
+    ):
+        # `request` is a coroutine function injected by AsyncClient.
+        self._request = request
+        self._router = router
+        self._cache = cache
+        self._response_mode = response_mode
 
+    async def price_stats(
+        self,
+        *,
+        code1: Optional[str] = None,
+        code2: Optional[str] = None,
+        currency1: Optional[int] = None,
+        currency2: Optional[int] = None,
+        title: Optional[str] = None,
+        tradable: Optional[bool] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> List[MarketPrice]:
+        """
+        Public endpoint: market price stats (no auth header).
+        `validate=False` returns MarketPriceRecord views instead of models;
+        `deadline` caps the call in seconds (retries included).
+        """
+        params = _price_stats_params(code1, code2, currency1, currency2, title, tradable)
         path = self._router.path("market.price_stats")
-        resp = self._request("GET", path, params=params, auth=False)
-        data = resp.json()
-        return [MarketPrice.model_validate(item) for item in data]
+        validate = wants_validation(self._response_mode, validate)
+        if self._cache is None:
+            return await self._fetch(path, params, validate, deadline)
+        key = params_key(path, validate, params=params)
+        return list(
+            await self._cache.aget_or_load(
+                key, lambda: self._fetch(path, params, validate, deadline)
+            )
+        )
+
+    async def iter_price_stats(
+        self,
+        *,
+        code1: Optional[str] = None,
+        code2: Optional[str] = None,
+        currency1: Optional[int] = None,
+        currency2: Optional[int] = None,
+        title: Optional[str] = None,
+        tradable: Optional[bool] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[MarketPrice]:
+        """price_stats, streamed (see MarketService.iter_price_stats)."""
+        params = _price_stats_params(code1, code2, currency1, currency2, title, tradable)
+        resp = await self._request(
+            "GET",
+            self._router.path("market.price_stats"),
+            params=params,
+            auth=False,
+            route="market.price_stats",
+            deadline=deadline,
+            stream=True,
+        )
+        async for item in aiter_items(
+            resp, MarketPrice, wants_validation(self._response_mode, validate)
+        ):
+            yield item
+
+    async def snapshot(
+        self,
+        *,
+        tradable: Optional[bool] = None,
+        max_legs: int = 3,
+    ) -> MarketSnapshot:
+        """One price_stats fetch, indexed as a MarketSnapshot."""
+        return MarketSnapshot(
+            await self.price_stats(tradable=tradable, validate=False), max_legs=max_legs
+        )
+
+    async def _fetch(
+        self, path: str, params: Dict[str, Any], validate: bool, deadline: Optional[float]
+    ) -> List[MarketPrice]:
+        resp = await self._request(
+            "GET",
+            path,
+            params=params,
+            auth=False,
+            route="market.price_stats",
+            deadline=deadline,
+        )
+        return decode(resp, List[MarketPrice], validate)
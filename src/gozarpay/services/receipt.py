@@ -1,58 +1,401 @@
 from __future__ import annotations
-from typing import Iterator, Optional
+import uuid
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from pydantic import BaseModel
+from ..batch import BatchItemResult, arun_batch, run_batch
 from ..models import Receipt, VerifyReceipt, ReceiptCreate, PaginatedReceiptList
+from ..pagination import (
+    AsyncPaginator,
+    Paginator,
+    _check_stream,
+    aiter_streamed,
+    iter_streamed,
+)
+from ..decoding import ResponseMode, decode, wants_validation
+from ..streaming import aiter_items, iter_items
+from ..retry import IDEMPOTENCY_HEADER
 from ..versioning import VersionRouter
 
+M = TypeVar("M", bound=BaseModel)
+CreateItem = Union[ReceiptCreate, Mapping[str, Any]]
+VerifyItem = Union[VerifyReceipt, Mapping[str, Any], str]
+
+
+def _create_payloads(items: Iterable[CreateItem]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Validate + dump every item once, up front (bad input fails before sending)."""
+    out = []
+    for item in items:
+        model = item if isinstance(item, ReceiptCreate) else ReceiptCreate.model_validate(item)
+        out.append((model.reference_id, model.model_dump()))
+    return out
+
+
+def _verify_payloads(items: Iterable[VerifyItem]) -> List[Tuple[str, Dict[str, Any]]]:
+    out = []
+    for item in items:
+        if isinstance(item, str):
+            model = VerifyReceipt(reference_id=item)
+        elif isinstance(item, VerifyReceipt):
+            model = item
+        else:
+            model = VerifyReceipt.model_validate(item)
+        out.append((model.reference_id, model.model_dump()))
+    return out
+
+
+def _idempotency_headers(key: Optional[str]) -> Dict[str, str]:
+    return {IDEMPOTENCY_HEADER: key} if key else {}
+
+
+def _new_key() -> str:
+    """Idempotency-Key for one batch create (one per reference_id: sent once)."""
+    return uuid.uuid4().hex
+
 
 class ReceiptService:
-    def __init__(self, request, router: VersionRouter):
+    def __init__(
+        self,
+        request,
+        router: VersionRouter,
+        response_mode: ResponseMode | str = ResponseMode.model,
+    ):
         self._request = request
         self._router = router
+        self._response_mode = response_mode
 
     def create(
-        self, *, irt_amount: str, reference_id: str, phone_number: str, callback: str
+        self,
+        *,
+        irt_amount: str,
+        reference_id: str,
+        phone_number: str,
+        callback: str,
+        idempotency_key: Optional[str] = None,
     ) -> Receipt:
+        """
+        Create a receipt. Pass `idempotency_key` (sent as `Idempotency-Key`) to let
+        the client retry the POST on 5xx/connection errors.
+        """
         payload = ReceiptCreate(
             irt_amount=irt_amount,
             reference_id=reference_id,
             phone_number=phone_number,
             callback=callback,
         ).model_dump()
-        path = self._router.path("receipt.create")
-        resp = self._request("POST", path, json=payload)
-        return Receipt.model_validate(resp.json())
+        return self._post("receipt.create", payload, Receipt, idempotency_key)
 
     def verify(self, *, reference_id: str) -> VerifyReceipt:
-        path = self._router.path("receipt.verify")
+        payload = VerifyReceipt(reference_id=reference_id).model_dump()
+        return self._post("receipt.verify", payload, VerifyReceipt)
+
+    def refund(self, *, reference_id: str) -> VerifyReceipt:
+        payload = VerifyReceipt(reference_id=reference_id).model_dump()
+        return self._post("receipt.refund", payload, VerifyReceipt)
+
+    def create_many(
+        self, items: Iterable[CreateItem], *, max_workers: int = 8
+    ) -> List[BatchItemResult[Receipt]]:
+        """
+        Create many receipts with bounded concurrency; results follow input order.
+        Duplicate reference_ids send one POST and share its result. Each POST
+        carries its own Idempotency-Key, so it is retried on 5xx/connection errors.
+        """
+        return run_batch(
+            _create_payloads(items),
+            lambda payload: self._post("receipt.create", payload, Receipt, _new_key()),
+            max_workers=max_workers,
+        )
+
+    def verify_many(
+        self, items: Iterable[VerifyItem], *, max_workers: int = 8
+    ) -> List[BatchItemResult[VerifyReceipt]]:
+        """Verify many receipts (reference_id strings or VerifyReceipt payloads)."""
+        return run_batch(
+            _verify_payloads(items),
+            lambda payload: self._post("receipt.verify", payload, VerifyReceipt),
+            max_workers=max_workers,
+        )
+
+    def _post(
+        self,
+        route: str,
+        payload: Dict[str, Any],
+        model: Type[M],
+        idempotency_key: Optional[str] = None,
+    ) -> M:
+        path = self._router.path(route)
+        headers = _idempotency_headers(idempotency_key)
+
+        resp = self._request("POST", path, json=payload, headers=headers, route=route)
+        return decode(resp, model)
+
+    def get(
+        self,
+        *,
+        receipt_id: int,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> Receipt:
+        path = self._router.path("receipt.get", id=receipt_id)
         resp = self._request(
-            "POST", path, json=VerifyReceipt(reference_id=reference_id).model_dump()
+            "GET", path, route="receipt.get", deadline=deadline
         )
-        return VerifyReceipt.model_validate(resp.json())
+        return decode(resp, Receipt, wants_validation(self._response_mode, validate))
 
-    def refund(self, *, reference_id: str) -> VerifyReceipt:
-        path = self._router.path("receipt.refund")
+    def list(
+        self,
+        *,
+        page: Optional[int] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> PaginatedReceiptList:
+        params = {"page": page} if page is not None else {}
+        path = self._router.path("receipt.list")
+        resp = self._request(
+            "GET", path, params=params, route="receipt.list", deadline=deadline
+        )
+        return decode(
+            resp,
+            PaginatedReceiptList,
+            wants_validation(self._response_mode, validate),
+        )
+
+    def iter_list(
+        self,
+        *,
+        page: Optional[int] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> Iterator[Receipt]:
+        """
+        One `list` page, streamed: receipts are yielded while the body arrives
+        (flat memory). `deadline` covers the call up to the response headers.
+        """
+        return self._stream_page(page, validate, deadline)
+
+    def iter_receipts(
+        self,
+        *,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+        validate: Optional[bool] = None,
+        stream: bool = False,
+    ) -> Iterator[Receipt]:
+        """
+        Yield every receipt; `concurrency > 1` prefetches pages in parallel.
+        `stream=True` reads the pages one after another, each streamed.
+        """
+        _check_stream(stream, concurrency)
+        if stream:
+            return iter_streamed(
+                lambda page, meta: self._stream_page(page, validate, meta=meta)
+            )
+        return iter(
+            Paginator(
+                lambda page: self.list(page=page, validate=validate),
+                concurrency=concurrency,
+                window=window,
+            )
+        )
+
+    def _stream_page(
+        self,
+        page: Optional[int],
+        validate: Optional[bool],
+        deadline: Optional[float] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Receipt]:
+        params = {"page": page} if page is not None else {}
         resp = self._request(
-            "POST", path, json=VerifyReceipt(reference_id=reference_id).model_dump()
+            "GET",
+            self._router.path("receipt.list"),
+            params=params,
+            route="receipt.list",
+            deadline=deadline,
+            stream=True,
+        )
+        yield from iter_items(
+            resp,
+            Receipt,
+            wants_validation(self._response_mode, validate),
+            key="results",
+            meta=meta,
         )
-        return VerifyReceipt.model_validate(resp.json())
 
-    def get(self, *, receipt_id: int) -> Receipt:
+
+class AsyncReceiptService:
+    def __init__(
+        self,
+        request,
+        router: VersionRouter,
+        response_mode: ResponseMode | str = ResponseMode.model,
+    ):
+        self._request = request
+        self._router = router
+        self._response_mode = response_mode
+
+    async def create(
+        self,
+        *,
+        irt_amount: str,
+        reference_id: str,
+        phone_number: str,
+        callback: str,
+        idempotency_key: Optional[str] = None,
+    ) -> Receipt:
+        """
+        Create a receipt. Pass `idempotency_key` (sent as `Idempotency-Key`) to let
+        the client retry the POST on 5xx/connection errors.
+        """
+        payload = ReceiptCreate(
+            irt_amount=irt_amount,
+            reference_id=reference_id,
+            phone_number=phone_number,
+            callback=callback,
+        ).model_dump()
+        return await self._post("receipt.create", payload, Receipt, idempotency_key)
+
+    async def verify(self, *, reference_id: str) -> VerifyReceipt:
+        payload = VerifyReceipt(reference_id=reference_id).model_dump()
+        return await self._post("receipt.verify", payload, VerifyReceipt)
+
+    async def refund(self, *, reference_id: str) -> VerifyReceipt:
+        payload = VerifyReceipt(reference_id=reference_id).model_dump()
+        return await self._post("receipt.refund", payload, VerifyReceipt)
+
+    async def create_many(
+        self, items: Iterable[CreateItem], *, max_workers: int = 8
+    ) -> List[BatchItemResult[Receipt]]:
+        return await arun_batch(
+            _create_payloads(items),
+            lambda payload: self._post("receipt.create", payload, Receipt, _new_key()),
+            max_workers=max_workers,
+        )
+
+    async def verify_many(
+        self, items: Iterable[VerifyItem], *, max_workers: int = 8
+    ) -> List[BatchItemResult[VerifyReceipt]]:
+        return await arun_batch(
+            _verify_payloads(items),
+            lambda payload: self._post("receipt.verify", payload, VerifyReceipt),
+            max_workers=max_workers,
+        )
+
+    async def _post(
+        self,
+        route: str,
+        payload: Dict[str, Any],
+        model: Type[M],
+        idempotency_key: Optional[str] = None,
+    ) -> M:
+        path = self._router.path(route)
+        headers = _idempotency_headers(idempotency_key)
+
+        resp = await self._request(
+            "POST", path, json=payload, headers=headers, route=route
+        )
+        return decode(resp, model)
+
+    async def get(
+        self,
+        *,
+        receipt_id: int,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> Receipt:
         path = self._router.path("receipt.get", id=receipt_id)
-        resp = self._request("GET", path)
-        return Receipt.model_validate(resp.json())
+        resp = await self._request(
+            "GET", path, route="receipt.get", deadline=deadline
+        )
+        return decode(resp, Receipt, wants_validation(self._response_mode, validate))
 
-    def list(self, *, page: Optional[int] = None) -> PaginatedReceiptList:
+    async def list(
+        self,
+        *,
+        page: Optional[int] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> PaginatedReceiptList:
         params = {"page": page} if page is not None else {}
         path = self._router.path("receipt.list")
-        resp = self._request("GET", path, params=params)
-        return PaginatedReceiptList.model_validate(resp.json())
-
-    def iter_receipts(self) -> Iterator[Receipt]:
-        page: Optional[int] = 1
-        while True:
-            pg = self.list(page=page)
-            for item in pg.results:
-                yield item
-            if not pg.next:
-                break
-            page = (page or 1) + 1
+        resp = await self._request(
+            "GET", path, params=params, route="receipt.list", deadline=deadline
+        )
+        return decode(
+            resp,
+            PaginatedReceiptList,
+            wants_validation(self._response_mode, validate),
+        )
+
+    def iter_list(
+        self,
+        *,
+        page: Optional[int] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[Receipt]:
+        """One `list` page, streamed (see ReceiptService.iter_list)."""
+        return self._stream_page(page, validate, deadline)
+
+    def iter_receipts(
+        self,
+        *,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+        validate: Optional[bool] = None,
+        stream: bool = False,
+    ) -> AsyncIterator[Receipt]:
+        """
+        Yield every receipt; `concurrency > 1` prefetches pages in parallel.
+        `stream=True` reads the pages one after another, each streamed.
+        """
+        _check_stream(stream, concurrency)
+        if stream:
+            return aiter_streamed(
+                lambda page, meta: self._stream_page(page, validate, meta=meta)
+            )
+        return aiter(
+            AsyncPaginator(
+                lambda page: self.list(page=page, validate=validate),
+                concurrency=concurrency,
+                window=window,
+            )
+        )
+
+    async def _stream_page(
+        self,
+        page: Optional[int],
+        validate: Optional[bool],
+        deadline: Optional[float] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Receipt]:
+        params = {"page": page} if page is not None else {}
+        resp = await self._request(
+            "GET",
+            self._router.path("receipt.list"),
+            params=params,
+            route="receipt.list",
+            deadline=deadline,
+            stream=True,
+        )
+        async for item in aiter_items(
+            resp,
+            Receipt,
+            wants_validation(self._response_mode, validate),
+            key="results",
+            meta=meta,
+        ):
+            yield item
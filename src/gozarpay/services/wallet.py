@@ -1,22 +1,261 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
-from ..models import PaginatedWalletList
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional
+from ..bulk import AsyncBulkRun, BulkRun
+from ..models import PaginatedWalletList, Wallet
+from ..pagination import (
+    AsyncPaginator,
+    Paginator,
+    _check_stream,
+    aiter_streamed,
+    iter_streamed,
+)
+from ..decoding import ResponseMode, decode, wants_validation
+from ..streaming import aiter_items, iter_items
 from ..versioning import VersionRouter
 
 
+def _list_by_phone_params(page: Optional[int], search: Optional[str]) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    if page is not None:
+        params["page"] = page
+    if search is not None:
+        params["search"] = search
+    return params
+
+
 class WalletService:
-    def __init__(self, request, router: VersionRouter):
+    def __init__(
+        self,
+        request,
+        router: VersionRouter,
+        response_mode: ResponseMode | str = ResponseMode.model,
+    ):
         self._request = request
         self._router = router
+        self._response_mode = response_mode
 
     def list_by_phone(
-        self, *, phone: str, page: Optional[int] = None, search: Optional[str] = None
+        self,
+        *,
+        phone: str,
+        page: Optional[int] = None,
+        search: Optional[str] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
     ) -> PaginatedWalletList:
-        params: Dict[str, Any] = {}
-        if page is not None:
-            params["page"] = page
-        if search is not None:
-            params["search"] = search
+        params = _list_by_phone_params(page, search)
         path = self._router.path("wallet.list_by_phone", phone=phone)
-        resp = self._request("GET", path, params=params)
-        return PaginatedWalletList.model_validate(resp.json())
+        resp = self._request(
+            "GET", path, params=params, route="wallet.list_by_phone", deadline=deadline
+        )
+        return decode(
+            resp,
+            PaginatedWalletList,
+            wants_validation(self._response_mode, validate),
+        )
+
+    def iter_list_by_phone(
+        self,
+        *,
+        phone: str,
+        page: Optional[int] = None,
+        search: Optional[str] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> Iterator[Wallet]:
+        """
+        One `list_by_phone` page, streamed: wallets are yielded while the body
+        arrives. `deadline` covers the call up to the response headers.
+        """
+        return self._stream_page(phone, page, search, validate, deadline)
+
+    def iter_by_phone(
+        self,
+        *,
+        phone: str,
+        search: Optional[str] = None,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+        validate: Optional[bool] = None,
+        stream: bool = False,
+    ) -> Iterator[Wallet]:
+        """
+        Yield every wallet of `phone` across pages (optionally prefetched);
+        `stream=True` reads the pages one after another, each streamed.
+        """
+        _check_stream(stream, concurrency)
+        if stream:
+            return iter_streamed(
+                lambda page, meta: self._stream_page(phone, page, search, validate, meta=meta)
+            )
+        return iter(
+            Paginator(
+                lambda page: self.list_by_phone(
+                    phone=phone, page=page, search=search, validate=validate
+                ),
+                concurrency=concurrency,
+                window=window,
+            )
+        )
+
+    def list_many(
+        self,
+        phones: Iterable[str],
+        *,
+        search: Optional[str] = None,
+        max_workers: int = 8,
+        validate: Optional[bool] = None,
+    ) -> BulkRun[str, Wallet]:
+        """
+        Look up wallets for many phones on a bounded worker pool (shared session).
+        Iterate for `(phone, Wallet)` pairs as each phone completes; afterwards
+        `.errors` maps failed phones to their exception and `.stats` has
+        throughput/latency figures.
+        """
+        return BulkRun(
+            phones,
+            lambda phone: list(
+                self.iter_by_phone(phone=phone, search=search, validate=validate)
+            ),
+            max_workers=max_workers,
+        )
+
+    def _stream_page(
+        self,
+        phone: str,
+        page: Optional[int],
+        search: Optional[str],
+        validate: Optional[bool],
+        deadline: Optional[float] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Wallet]:
+        resp = self._request(
+            "GET",
+            self._router.path("wallet.list_by_phone", phone=phone),
+            params=_list_by_phone_params(page, search),
+            route="wallet.list_by_phone",
+            deadline=deadline,
+            stream=True,
+        )
+        yield from iter_items(
+            resp,
+            Wallet,
+            wants_validation(self._response_mode, validate),
+            key="results",
+            meta=meta,
+        )
+
+
+class AsyncWalletService:
+    def __init__(
+        self,
+        request,
+        router: VersionRouter,
+        response_mode: ResponseMode | str = ResponseMode.model,
+    ):
+        self._request = request
+        self._router = router
+        self._response_mode = response_mode
+
+    async def list_by_phone(
+        self,
+        *,
+        phone: str,
+        page: Optional[int] = None,
+        search: Optional[str] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> PaginatedWalletList:
+        params = _list_by_phone_params(page, search)
+        path = self._router.path("wallet.list_by_phone", phone=phone)
+        resp = await self._request(
+            "GET", path, params=params, route="wallet.list_by_phone", deadline=deadline
+        )
+        return decode(
+            resp,
+            PaginatedWalletList,
+            wants_validation(self._response_mode, validate),
+        )
+
+    def iter_list_by_phone(
+        self,
+        *,
+        phone: str,
+        page: Optional[int] = None,
+        search: Optional[str] = None,
+        validate: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[Wallet]:
+        """One `list_by_phone` page, streamed (see WalletService.iter_list_by_phone)."""
+        return self._stream_page(phone, page, search, validate, deadline)
+
+    def iter_by_phone(
+        self,
+        *,
+        phone: str,
+        search: Optional[str] = None,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+        validate: Optional[bool] = None,
+        stream: bool = False,
+    ) -> AsyncIterator[Wallet]:
+        """
+        Yield every wallet of `phone` across pages (optionally prefetched);
+        `stream=True` reads the pages one after another, each streamed.
+        """
+        _check_stream(stream, concurrency)
+        if stream:
+            return aiter_streamed(
+                lambda page, meta: self._stream_page(phone, page, search, validate, meta=meta)
+            )
+        return aiter(
+            AsyncPaginator(
+                lambda page: self.list_by_phone(
+                    phone=phone, page=page, search=search, validate=validate
+                ),
+                concurrency=concurrency,
+                window=window,
+            )
+        )
+
+    def list_many(
+        self,
+        phones: Iterable[str],
+        *,
+        search: Optional[str] = None,
+        max_workers: int = 8,
+        validate: Optional[bool] = None,
+    ) -> AsyncBulkRun[str, Wallet]:
+        """Async `list_many`: `async for phone, wallet in run`, then `.errors`/`.stats`."""
+
+        async def lookup(phone: str):
+            wallets = self.iter_by_phone(phone=phone, search=search, validate=validate)
+            return [w async for w in wallets]
+
+        return AsyncBulkRun(phones, lookup, max_workers=max_workers)
+
+    async def _stream_page(
+        self,
+        phone: str,
+        page: Optional[int],
+        search: Optional[str],
+        validate: Optional[bool],
+        deadline: Optional[float] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Wallet]:
+        resp = await self._request(
+            "GET",
+            self._router.path("wallet.list_by_phone", phone=phone),
+            params=_list_by_phone_params(page, search),
+            route="wallet.list_by_phone",
+            deadline=deadline,
+            stream=True,
+        )
+        async for item in aiter_items(
+            resp,
+            Wallet,
+            wants_validation(self._response_mode, validate),
+            key="results",
+            meta=meta,
+        ):
+            yield item
@@ -0,0 +1,77 @@
+from __future__ import annotations
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution (thread-safe).
+    Callers that arrive while the leader runs wait for, and share, its outcome;
+    `shared` counts how many calls were absorbed that way.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return fut.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._forget(key)
+            fut.set_exception(exc)
+            raise
+        self._forget(key)
+        fut.set_result(result)
+        return result
+
+    def _forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """asyncio twin of `SingleFlight` (one event loop; asyncio is imported on use)."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        import asyncio
+
+        fut = self._calls.get(key)
+        if fut is not None:
+            self.shared += 1
+            return await asyncio.shield(fut)
+        fut = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self._calls.pop(key, None)
+            fut.cancel()
+            raise
+        except BaseException as exc:
+            self._calls.pop(key, None)
+            fut.set_exception(exc)
+            fut.exception()  # mark retrieved: the leader re-raises it below
+            raise
+        self._calls.pop(key, None)
+        fut.set_result(result)
+        return result
@@ -0,0 +1,285 @@
+from __future__ import annotations
+import time
+from collections import deque
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .decoding import loads
+
+_ONE = Decimal(1)
+
+
+@dataclass(frozen=True, slots=True)
+class Market:
+    """One price-stats market with its prices parsed to Decimal (once)."""
+
+    id: int
+    code: str
+    code1: Optional[str]
+    code2: Optional[str]
+    currency1: Optional[int]
+    currency2: Optional[int]
+    title: Optional[str]
+    tradable: Optional[bool]
+    price: Decimal  # code2 per one code1
+    buy_price: Optional[Decimal]
+    sell_price: Optional[Decimal]
+    info: Dict[str, Any]  # decoded price_info ({} when absent or not JSON)
+
+
+@dataclass(frozen=True, slots=True)
+class CrossRate:
+    """
+    `base` priced in `quote`, composed along `path` (currency codes, base first).
+    A leg walked against its market's direction is inverted, with buy and sell
+    swapped (1/sell, 1/buy) so each side stays on the same side of the spread.
+    """
+
+    base: str
+    quote: str
+    price: Decimal
+    buy_price: Optional[Decimal]
+    sell_price: Optional[Decimal]
+    path: Tuple[str, ...]
+    markets: Tuple[Market, ...]
+
+    @property
+    def direct(self) -> bool:
+        return len(self.markets) == 1
+
+
+# One directed edge of the market graph: (to currency, market, walked inverted?)
+_Edge = Tuple[str, Market, bool]
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    if value is None or value == "":
+        return None
+    try:
+        out = Decimal(str(value))
+    except InvalidOperation:
+        return None
+    return out if out.is_finite() else None
+
+
+def _info(value: Any) -> Dict[str, Any]:
+    if isinstance(value, str):
+        try:
+            value = loads(value)
+        except ValueError:
+            return {}
+    if isinstance(value, dict):
+        return value
+    if hasattr(value, "model_dump"):  # PriceInfo
+        return value.model_dump(exclude_none=True)
+    if hasattr(value, "raw"):  # PriceInfoRecord
+        return dict(value.raw)
+    return {}
+
+
+def _currency_id(value: Any) -> Optional[int]:
+    if isinstance(value, dict):
+        value = value.get("id")
+    return value if isinstance(value, int) else None
+
+
+def _market(item: Any) -> Optional[Market]:
+    """A Market from a MarketPrice, MarketPriceRecord or raw dict (None: no price)."""
+    get = item.get if isinstance(item, dict) else (lambda name: getattr(item, name, None))
+    info = _info(get("price_info"))
+    price = _decimal(get("price"))
+    if price is None:
+        price = _decimal(info.get("price"))
+    if price is None:
+        return None
+    return Market(
+        id=get("id"),
+        code=get("code"),
+        code1=get("code1"),
+        code2=get("code2"),
+        currency1=_currency_id(get("currency1")),
+        currency2=_currency_id(get("currency2")),
+        title=get("title"),
+        tradable=get("tradable"),
+        price=price,
+        buy_price=_decimal(get("buy_price")),
+        sell_price=_decimal(get("sell_price")),
+        info=info,
+    )
+
+
+def _scale(acc: List[Any], num: Optional[Decimal], den: Optional[Decimal]) -> None:
+    """Multiply a [numerator, denominator] pair; a missing side poisons it."""
+    if acc[0] is None:
+        return
+    value = num if num is not None else den
+    if not value:
+        acc[0] = None
+    else:
+        acc[0 if num is not None else 1] *= value
+
+
+def _ratio(acc: List[Any]) -> Optional[Decimal]:
+    return None if acc[0] is None else acc[0] / acc[1]
+
+
+class MarketSnapshot:
+    """
+    Immutable, indexed view of one `market.price_stats` response.
+    - Lookups are dict hits: `snapshot["BTCIRT"]`, `by_id`, `pair("BTC", "IRT")`
+      (either direction), `by_currency(code or currency id)`.
+    - `rate(base, quote)` composes a cross rate over the market graph when no
+      market trades the pair directly (USDT -> IRT -> BTC): fewest legs wins,
+      at most `max_legs`, preferring tradable markets. Results are memoized.
+    Prices are Decimals (no float drift when multiplying legs); zero or
+    unparseable prices are left out. Build one with `client.market.snapshot()`
+    or `MarketSnapshot(client.market.price_stats(validate=False))`.
+    """
+
+    def __init__(
+        self,
+        prices: Iterable[Any],
+        *,
+        max_legs: int = 3,
+        taken_at: Optional[float] = None,
+    ) -> None:
+        if max_legs < 1:
+            raise ValueError("max_legs must be >= 1")
+        self.max_legs = max_legs
+        self.taken_at = time.time() if taken_at is None else taken_at
+        self._by_code: Dict[str, Market] = {}
+        self._by_id: Dict[int, Market] = {}
+        self._pairs: Dict[Tuple[str, str], Market] = {}
+        self._by_currency: Dict[Any, List[Market]] = {}
+        self._graph: Dict[str, List[_Edge]] = {}
+        self._rates: Dict[Tuple[str, str], Optional[CrossRate]] = {}
+        for item in prices:
+            market = _market(item)
+            if market is None or not market.price:
+                continue
+            self._by_code[market.code] = market
+            self._by_id[market.id] = market
+            for key in {market.code1, market.code2, market.currency1, market.currency2}:
+                if key is not None:
+                    self._by_currency.setdefault(key, []).append(market)
+            if market.code1 and market.code2:
+                self._add_pair(market)
+
+    def _add_pair(self, market: Market) -> None:
+        key = (market.code1, market.code2)
+        known = self._pairs.get(key)
+        if known is not None and (known.tradable is not False or market.tradable is False):
+            return  # keep the first tradable market for a pair
+        self._pairs[key] = market
+        if known is not None:
+            for code in key:
+                self._graph[code] = [e for e in self._graph[code] if e[1] is not known]
+        self._graph.setdefault(market.code1, []).append((market.code2, market, False))
+        self._graph.setdefault(market.code2, []).append((market.code1, market, True))
+
+    # ---- lookups ----
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+    def __iter__(self) -> Iterator[Market]:
+        return iter(self._by_code.values())
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._by_code
+
+    def __getitem__(self, code: str) -> Market:
+        return self._by_code[code]
+
+    def get(self, code: str) -> Optional[Market]:
+        return self._by_code.get(code)
+
+    def by_id(self, market_id: int) -> Optional[Market]:
+        return self._by_id.get(market_id)
+
+    def pair(self, code1: str, code2: str) -> Optional[Market]:
+        """The market trading code1 against code2, in either direction."""
+        return self._pairs.get((code1, code2)) or self._pairs.get((code2, code1))
+
+    def by_currency(self, currency: str | int) -> List[Market]:
+        """Markets with `currency` (a code or a currency id) on either leg."""
+        return list(self._by_currency.get(currency, ()))
+
+    @property
+    def currencies(self) -> List[str]:
+        return sorted(self._graph)
+
+    # ---- cross rates ----
+
+    def rate(self, base: str, quote: str) -> Optional[CrossRate]:
+        """`base` priced in `quote` (None when no path within max_legs)."""
+        key = (base, quote)
+        if key not in self._rates:
+            self._rates[key] = self._route(base, quote)
+        return self._rates[key]
+
+    def price(self, base: str, quote: str) -> Decimal:
+        """Mid/last price of `base` in `quote`; KeyError when unreachable."""
+        found = self.rate(base, quote)
+        if found is None:
+            raise KeyError(f"no market path from {base} to {quote}")
+        return found.price
+
+    def convert(self, amount: Decimal | int | str, base: str, quote: str) -> Decimal:
+        """`amount` of `base` expressed in `quote` at the snapshot's mid/last price."""
+        return Decimal(str(amount)) * self.price(base, quote)
+
+    def _route(self, base: str, quote: str) -> Optional[CrossRate]:
+        if base == quote:
+            return CrossRate(base, quote, _ONE, _ONE, _ONE, (base,), ())
+        if base not in self._graph or quote not in self._graph:
+            return None
+        # Breadth-first: the fewest legs, tradable markets tried first
+        parent: Dict[str, Optional[Tuple[str, _Edge]]] = {base: None}
+        frontier = deque([(base, 0)])
+        while frontier:
+            node, depth = frontier.popleft()
+            if depth == self.max_legs:
+                continue
+            for edge in sorted(self._graph[node], key=lambda e: e[1].tradable is False):
+                to = edge[0]
+                if to in parent:
+                    continue
+                parent[to] = (node, edge)
+                if to == quote:
+                    return self._compose(base, quote, parent)
+                frontier.append((to, depth + 1))
+        return None
+
+    @staticmethod
+    def _compose(
+        base: str, quote: str, parent: Dict[str, Optional[Tuple[str, _Edge]]]
+    ) -> CrossRate:
+        legs: List[_Edge] = []
+        node = quote
+        while node != base:
+            node, edge = parent[node]  # type: ignore[misc]
+            legs.append(edge)
+        legs.reverse()
+        # Numerators and denominators apart: one division per side, at the end
+        price, buy, sell = [_ONE, _ONE], [_ONE, _ONE], [_ONE, _ONE]
+        path = [base]
+        for to, market, inverted in legs:
+            if inverted:
+                price[1] *= market.price
+                _scale(buy, None, market.sell_price)
+                _scale(sell, None, market.buy_price)
+            else:
+                price[0] *= market.price
+                _scale(buy, market.buy_price, None)
+                _scale(sell, market.sell_price, None)
+            path.append(to)
+        return CrossRate(
+            base,
+            quote,
+            price[0] / price[1],
+            _ratio(buy),
+            _ratio(sell),
+            tuple(path),
+            tuple(m for _, m, _ in legs),
+        )
@@ -0,0 +1,227 @@
+from __future__ import annotations
+import codecs
+import json
+import re
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from .decoding import adapter
+
+T = TypeVar("T")
+
+CHUNK_SIZE = 64 * 1024
+
+_SPACE = re.compile(r"[\s,]*")  # separators between items / members are skipped
+_BLANK = re.compile(r"\s*")
+_AFTER_VALUE = frozenset(",:]} \t\r\n")
+# The stdlib C scanner: parses one value at an offset and says where it ended
+_raw_decode = json.JSONDecoder().raw_decode
+
+# Scanner states
+_START, _MEMBERS, _ITEMS, _DONE = range(4)
+
+
+class ArrayScanner:
+    """
+    Incremental JSON splitter: `feed()` body chunks as they arrive and get back
+    each complete item of one array, parsed. The array is the whole body
+    (`key=None`, e.g. price-stats) or the top-level member `key` (e.g.
+    "results" of a DRF page); the body's other top-level members are parsed
+    into `meta` (`count`, `next`, ...). Only the item being received is
+    buffered; an item cut by a chunk boundary is parsed again once complete.
+    """
+
+    def __init__(self, key: Optional[str] = None) -> None:
+        self.key = key
+        self.meta: Dict[str, Any] = {}
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._state = _START
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buf += self._text.decode(chunk)
+        items, pos = self._scan(False)
+        self._buf = self._buf[pos:]
+        return items
+
+    def close(self) -> List[Any]:
+        """Items left at the end of the body; ValueError when it was cut short."""
+        self._buf += self._text.decode(b"", True)
+        items, pos = self._scan(True)
+        self._buf = self._buf[pos:]
+        if self._state != _DONE or self._buf.strip():
+            raise ValueError("incomplete or malformed JSON body")
+        return items
+
+    def _value(self, pos: int, final: bool) -> Tuple[Any, int]:
+        """(value, end) of the JSON value at `pos`; end -1 while it is not all here."""
+        try:
+            value, end = _raw_decode(self._buf, pos)
+        except ValueError:
+            if final:
+                raise
+            return None, -1
+        # A number may go on in the next chunk ("2" of "2.5"): only trust a
+        # value once the byte after it is a separator (or the body ended)
+        if end < len(self._buf) and self._buf[end] in _AFTER_VALUE:
+            return value, end
+        if final and end >= len(self._buf):
+            return value, end
+        if final:
+            raise ValueError(f"malformed JSON at offset {end}")
+        return None, -1
+
+    def _scan(self, final: bool) -> Tuple[List[Any], int]:
+        buf, items = self._buf, []
+        pos, size = 0, len(buf)
+        while True:
+            pos = _SPACE.match(buf, pos).end()
+            if pos >= size:
+                return items, pos
+            c = buf[pos]
+            if self._state == _START:
+                opener = "[" if self.key is None else "{"
+                if c != opener:
+                    raise ValueError(f"expected {opener!r} at the start of the body")
+                pos += 1
+                self._state = _ITEMS if self.key is None else _MEMBERS
+            elif self._state == _ITEMS:
+                if c == "]":
+                    pos += 1
+                    self._state = _DONE if self.key is None else _MEMBERS
+                    continue
+                item, end = self._value(pos, final)
+                if end < 0:
+                    return items, pos
+                items.append(item)
+                pos = end
+            elif self._state == _MEMBERS:
+                if c == "}":
+                    pos += 1
+                    self._state = _DONE
+                    continue
+                # `"name": value`, consumed whole or not at all
+                if c != '"':
+                    raise ValueError("expected an object member")
+                name, name_end = self._value(pos, final)
+                if name_end < 0:
+                    return items, pos
+                colon = _BLANK.match(buf, name_end).end()
+                if colon >= size:
+                    return items, pos
+                if buf[colon] != ":":
+                    raise ValueError("expected ':' after an object member name")
+                start = _BLANK.match(buf, colon + 1).end()
+                if start >= size:
+                    return items, pos
+                if name == self.key and buf[start] == "[":
+                    pos = start + 1
+                    self._state = _ITEMS
+                    continue
+                value, end = self._value(start, final)
+                if end < 0:
+                    return items, pos
+                self.meta[name] = value
+                pos = end
+            else:
+                raise ValueError("unexpected data after the JSON body")
+
+
+def _item_decoder(tp: Type[T], validate: bool) -> Callable[[Any], T]:
+    if validate:
+        return adapter(tp).validate_python
+    from .records import view_for
+
+    return view_for(tp)
+
+
+class _Decoder:
+    """Scanner + per-item decode, timed for `Hooks.on_decode` when the call is traced."""
+
+    __slots__ = ("scanner", "decode", "trace", "phase", "seconds", "bytes")
+
+    def __init__(self, resp: Any, tp: Type[T], validate: bool, key: Optional[str]) -> None:
+        self.scanner = ArrayScanner(key)
+        self.decode = _item_decoder(tp, validate)
+        self.trace = getattr(resp, "_gozarpay_trace", None)
+        self.phase = "validate" if validate else "decode"
+        self.seconds = 0.0
+        self.bytes = 0
+
+    def feed(self, chunk: Optional[bytes]) -> List[Any]:
+        start = time.perf_counter()
+        if chunk is None:
+            raw = self.scanner.close()
+        else:
+            self.bytes += len(chunk)
+            raw = self.scanner.feed(chunk)
+        items = [self.decode(r) for r in raw]
+        self.seconds += time.perf_counter() - start
+        return items
+
+    def done(self) -> None:
+        if self.trace is not None:
+            hooks, route = self.trace
+            hooks.on_decode(route, self.phase, self.seconds, self.bytes)
+
+
+def iter_items(
+    resp: Any,
+    tp: Type[T],
+    validate: bool = True,
+    *,
+    key: Optional[str] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[T]:
+    """
+    Yield the items of a `stream=True` requests response one by one, decoded
+    as `tp` (validated models, or record views with `validate=False`) as
+    their bytes arrive. gzip / deflate bodies are decompressed on the fly.
+    `meta` receives the body's other top-level members once it is read.
+    The response is closed when the iterator finishes or is closed.
+    """
+    decoder = _Decoder(resp, tp, validate, key)
+    try:
+        for chunk in resp.iter_content(chunk_size):
+            yield from decoder.feed(chunk)
+        yield from decoder.feed(None)
+        decoder.done()
+    finally:
+        resp.close()
+    if meta is not None:
+        meta.update(decoder.scanner.meta)
+
+
+async def aiter_items(
+    resp: Any,
+    tp: Type[T],
+    validate: bool = True,
+    *,
+    key: Optional[str] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[T]:
+    """`iter_items` for a streamed httpx response."""
+    decoder = _Decoder(resp, tp, validate, key)
+    try:
+        async for chunk in resp.aiter_bytes(chunk_size):
+            for item in decoder.feed(chunk):
+                yield item
+        for item in decoder.feed(None):
+            yield item
+        decoder.done()
+    finally:
+        await resp.aclose()
+    if meta is not None:
+        meta.update(decoder.scanner.meta)
@@ -0,0 +1,300 @@
+from __future__ import annotations
+import itertools
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+from .models import Receipt, ReceiptStatus
+from .tracker import TERMINAL_STATUSES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS receipts (
+    id INTEGER PRIMARY KEY,
+    reference_id TEXT,
+    status TEXT,
+    irt_amount TEXT,
+    created_at TEXT,
+    synced_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS receipts_reference_id ON receipts (reference_id);
+CREATE INDEX IF NOT EXISTS receipts_status ON receipts (status, created_at);
+CREATE INDEX IF NOT EXISTS receipts_created_at ON receipts (created_at);
+CREATE TABLE IF NOT EXISTS sync_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_UPSERT = """
+INSERT INTO receipts (id, reference_id, status, irt_amount, created_at, synced_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    reference_id = excluded.reference_id,
+    status = excluded.status,
+    irt_amount = excluded.irt_amount,
+    created_at = excluded.created_at,
+    synced_at = excluded.synced_at,
+    data = excluded.data
+"""
+
+_CHECKPOINT = "checkpoint_id"
+
+# Bound parameters per `IN (...)` query: under SQLITE_MAX_VARIABLE_NUMBER
+# (999 before SQLite 3.32), whatever the page size.
+_MAX_VARIABLES = 500
+
+
+@dataclass(frozen=True, slots=True)
+class SyncResult:
+    pages: int
+    fetched: int
+    inserted: int
+    updated: int
+    refreshed: int  # non-terminal receipts re-read with receipt.get
+    checkpoint: Optional[int]  # highest receipt id fully synced
+    complete: bool  # reached the end or the previous checkpoint
+    elapsed: float
+
+
+def _timestamp(value: Union[datetime, str, None]) -> Optional[str]:
+    """UTC, fixed-width ISO text so SQLite string order is time order."""
+    if value is None or isinstance(value, str):  # unparsed server date: kept as is
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _status_text(status: Union[ReceiptStatus, str, None]) -> Optional[str]:
+    return status.value if isinstance(status, ReceiptStatus) else status
+
+
+def _ids(receipts: Sequence[Receipt]) -> List[int]:
+    return [r.id for r in receipts if r.id is not None]
+
+
+def _ascending(receipts: Sequence[Receipt]) -> bool:
+    """True when a page lists receipts oldest first (ids increasing)."""
+    ids = _ids(receipts)
+    return len(ids) >= 2 and ids[0] < ids[-1]
+
+
+def _row(receipt: Receipt, now: float) -> Tuple[Any, ...]:
+    return (
+        receipt.id,
+        receipt.reference_id,
+        _status_text(receipt.status),
+        receipt.irt_amount,
+        _timestamp(receipt.created_at),
+        now,
+        receipt.model_dump_json(),
+    )
+
+
+class ReceiptStore:
+    """
+    Local SQLite mirror of receipts, indexed by id, reference_id, status and
+    created_at, kept current by incremental `sync()` runs.
+    - `sync(client)` walks `receipt.list` from its newest end (page 1 onwards
+      when receipts are listed newest first; the last page backwards when page 1
+      shows them oldest first) and stops at the first page reaching the previous
+      checkpoint (the highest id of the last complete run), so a nightly run
+      reads only the new pages. `refresh_pending=True` also re-reads stored
+      receipts whose status is not terminal yet (gozarpay.tracker.TERMINAL_STATUSES).
+    - Queries (`get`, `by_reference`, `by_status`, `between`) never touch the API.
+    Receipts without an `id` are not stored. One connection, guarded by a lock:
+    safe to share between threads.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "ReceiptStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM receipts").fetchone()[0]
+
+    # ---- checkpoint ----
+
+    @property
+    def checkpoint(self) -> Optional[int]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM sync_meta WHERE key = ?", (_CHECKPOINT,)
+            ).fetchone()
+        return int(row[0]) if row else None
+
+    def reset(self) -> None:
+        """Forget the checkpoint: the next sync walks every page again."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM sync_meta WHERE key = ?", (_CHECKPOINT,))
+
+    # ---- writes ----
+
+    def upsert(self, receipts: Iterable[Receipt]) -> Tuple[int, int]:
+        """Insert or update receipts (by id); returns (inserted, updated)."""
+        now = time.time()
+        rows = [_row(r, now) for r in receipts if r.id is not None]
+        if not rows:
+            return 0, 0
+        ids = [row[0] for row in rows]
+        known = set()
+        with self._lock, self._db:
+            for start in range(0, len(ids), _MAX_VARIABLES):
+                chunk = ids[start : start + _MAX_VARIABLES]
+                known.update(
+                    r[0]
+                    for r in self._db.execute(
+                        f"SELECT id FROM receipts WHERE id IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                )
+            self._db.executemany(_UPSERT, rows)
+        inserted = len(set(ids) - known)
+        return inserted, len(ids) - inserted
+
+    def sync(
+        self,
+        client: Any,
+        *,
+        max_pages: Optional[int] = None,
+        refresh_pending: bool = False,
+    ) -> SyncResult:
+        """
+        Mirror new receipts from `client` (a Client). The checkpoint only moves
+        when the walk is complete, so a run cut short by `max_pages` or an
+        error is picked up again by the next one.
+        """
+        started = time.perf_counter()
+        previous = self.checkpoint
+        pages = fetched = inserted = updated = 0
+        newest = previous
+
+        def fetch(page: int) -> Any:
+            nonlocal pages, fetched, inserted, updated, newest
+            listing = client.receipt.list(page=page, validate=True)
+            pages += 1
+            fetched += len(listing.results)
+            ins, upd = self.upsert(listing.results)
+            inserted += ins
+            updated += upd
+            ids = _ids(listing.results)
+            if ids:
+                newest = max(ids) if newest is None else max(newest, *ids)
+            return listing
+
+        def seen(listing: Any) -> bool:
+            ids = _ids(listing.results)
+            return previous is not None and any(i <= previous for i in ids)
+
+        first = fetch(1)
+        ascending = _ascending(first.results)
+        complete = not first.next or (not ascending and seen(first))
+        if not complete:
+            # Walk from the newest end: page 2 onwards, or back from the last page.
+            size = len(first.results)
+            order: Iterable[int] = (
+                range(max(2, math.ceil(first.count / size)), 1, -1)
+                if ascending
+                else itertools.count(2)
+            )
+            complete = True  # unless cut short below
+            for page in order:
+                if max_pages is not None and pages >= max_pages:
+                    complete = False
+                    break
+                listing = fetch(page)
+                if seen(listing) or (not ascending and not listing.next):
+                    break
+        if complete and newest is not None and newest != previous:
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sync_meta (key, value) VALUES (?, ?)",
+                    (_CHECKPOINT, str(newest)),
+                )
+        refreshed = 0
+        if refresh_pending:
+            pending = [r.id for r in self.pending() if r.id is not None]
+            for receipt_id in pending:
+                self.upsert([client.receipt.get(receipt_id=receipt_id, validate=True)])
+            refreshed = len(pending)
+        return SyncResult(
+            pages=pages,
+            fetched=fetched,
+            inserted=inserted,
+            updated=updated,
+            refreshed=refreshed,
+            checkpoint=newest if complete else previous,
+            complete=complete,
+            elapsed=time.perf_counter() - started,
+        )
+
+    # ---- queries (local only) ----
+
+    def get(self, receipt_id: int) -> Optional[Receipt]:
+        found = self._select("WHERE id = ?", (receipt_id,))
+        return found[0] if found else None
+
+    def by_reference(self, reference_id: str) -> Optional[Receipt]:
+        found = self._select("WHERE reference_id = ? ORDER BY id DESC LIMIT 1", (reference_id,))
+        return found[0] if found else None
+
+    def by_status(
+        self, status: ReceiptStatus | str, *, limit: Optional[int] = None
+    ) -> List[Receipt]:
+        """Receipts with `status`, newest first."""
+        value = _status_text(status)
+        return self._select(
+            "WHERE status = ? ORDER BY created_at DESC, id DESC LIMIT ?",
+            (value, -1 if limit is None else limit),
+        )
+
+    def between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        status: Optional[ReceiptStatus | str] = None,
+    ) -> List[Receipt]:
+        """Receipts created in [start, end) (naive datetimes are taken as UTC), oldest first."""
+        clauses, args = [], []
+        if start is not None:
+            clauses.append("created_at >= ?")
+            args.append(_timestamp(start))
+        if end is not None:
+            clauses.append("created_at < ?")
+            args.append(_timestamp(end))
+        if status is not None:
+            clauses.append("status = ?")
+            args.append(_status_text(status))
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        return self._select(where + "ORDER BY created_at, id", args)
+
+    def pending(self) -> List[Receipt]:
+        """Stored receipts whose status is not terminal (or unknown)."""
+        terminal = [s.value for s in TERMINAL_STATUSES]
+        return self._select(
+            f"WHERE status IS NULL OR status NOT IN ({','.join('?' * len(terminal))}) "
+            "ORDER BY id",
+            terminal,
+        )
+
+    def _select(self, clause: str, args: Sequence[Any]) -> List[Receipt]:
+        with self._lock:
+            rows = self._db.execute(f"SELECT data FROM receipts {clause}", args).fetchall()
+        return [Receipt.model_validate_json(data) for (data,) in rows]
@@ -0,0 +1,420 @@
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+from .models import ReceiptStatus
+
+TERMINAL_STATUSES: FrozenSet[ReceiptStatus] = frozenset(
+    {
+        ReceiptStatus.success,
+        ReceiptStatus.expired,
+        ReceiptStatus.refunded,
+        ReceiptStatus.refund_failed,
+        ReceiptStatus.failed_insufficient_amount,
+        ReceiptStatus.failed_not_verified,
+    }
+)
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, Union[int, str]]  # ("receipt_id", 7) / ("reference_id", "order-7")
+
+
+@dataclass(frozen=True, slots=True)
+class PollSchedule:
+    """
+    When to check a pending receipt again, from its age (time since `track`):
+    `age * age_factor`, clamped to [min_interval, max_interval], +/- `jitter`.
+    Fresh receipts (payer still on the gateway) are checked often, old ones rarely.
+    - A failed check is retried after `error_interval`, doubling per consecutive
+      failure; `max_errors` in a row fail the receipt with the last error.
+    - `timeout`: give up with TimeoutError when still pending (None = never).
+    """
+
+    min_interval: float = 2.0
+    max_interval: float = 60.0
+    age_factor: float = 0.1
+    jitter: float = 0.1
+    error_interval: float = 5.0
+    max_errors: int = 5
+    timeout: Optional[float] = 3600.0
+
+    def next_delay(self, age: float, errors: int = 0) -> float:
+        if errors:
+            base = self.error_interval * 2 ** (errors - 1)
+        else:
+            base = max(self.min_interval, age * self.age_factor)
+        base = min(self.max_interval, base)
+        return base * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+@dataclass(frozen=True, slots=True)
+class Settlement:
+    """A receipt that reached a terminal status; `result` is the last response."""
+
+    receipt_id: Optional[int]
+    reference_id: Optional[str]
+    status: ReceiptStatus
+    result: Any  # Receipt (receipt_id) or VerifyReceipt (reference_id)
+    checks: int
+    elapsed: float
+
+
+@dataclass(slots=True)
+class _Tracked:
+    key: Key
+    started: float
+    future: Any  # concurrent.futures.Future / asyncio.Future
+    checks: int = 0
+    errors: int = 0
+    callbacks: List[Callable[[Settlement], None]] = field(default_factory=list)
+
+
+def _key(receipt_id: Optional[int], reference_id: Optional[str]) -> Key:
+    if (receipt_id is None) == (reference_id is None):
+        raise ValueError("pass exactly one of receipt_id / reference_id")
+    if receipt_id is not None:
+        return ("receipt_id", receipt_id)
+    return ("reference_id", reference_id)  # type: ignore[return-value]
+
+
+def _status(result: Any) -> Optional[ReceiptStatus]:
+    # models keep a status they cannot map as the raw string, record views always do
+    status = getattr(result, "status", None)
+    try:
+        return ReceiptStatus(status) if status is not None else None
+    except ValueError:  # status this SDK does not know yet: keep polling
+        return None
+
+
+def _advance(
+    item: _Tracked,
+    schedule: PollSchedule,
+    terminal: FrozenSet[ReceiptStatus],
+    now: float,
+    result: Any = None,
+    error: Optional[BaseException] = None,
+) -> Union[Settlement, BaseException, float]:
+    """Outcome of one check: a Settlement, an error to fail with, or the next due time."""
+    age = now - item.started
+    if error is not None:
+        item.errors += 1
+        if item.errors >= schedule.max_errors:
+            return error
+    else:
+        item.checks += 1
+        item.errors = 0
+        status = _status(result)
+        if status in terminal:
+            kind, value = item.key
+            by_id = kind == "receipt_id"
+            return Settlement(
+                receipt_id=value if by_id else None,  # type: ignore[arg-type]
+                reference_id=None if by_id else value,  # type: ignore[arg-type]
+                status=status,  # type: ignore[arg-type]
+                result=result,
+                checks=item.checks,
+                elapsed=age,
+            )
+    due = now + schedule.next_delay(age, item.errors)
+    if schedule.timeout is not None:
+        deadline = item.started + schedule.timeout
+        if now >= deadline:
+            return TimeoutError(f"receipt {item.key[1]!r} still pending after {age:.1f}s")
+        due = min(due, deadline)  # one last check at the deadline
+    return due
+
+
+def _outcome(
+    item: _Tracked,
+    schedule: PollSchedule,
+    terminal: FrozenSet[ReceiptStatus],
+    result: Any = None,
+    error: Optional[BaseException] = None,
+) -> Union[Settlement, BaseException, float]:
+    """`_advance` now; if it raises, that error fails this receipt instead of stranding it."""
+    try:
+        return _advance(item, schedule, terminal, time.monotonic(), result, error)
+    except Exception as exc:
+        logger.exception("could not advance %r", item.key)
+        return exc
+
+
+def _run_callbacks(item: _Tracked, settlement: Settlement) -> None:
+    """A failing callback is logged; it neither stops the others nor the tracker."""
+    for callback in item.callbacks:
+        try:
+            callback(settlement)
+        except Exception:
+            logger.exception("settlement callback %r failed for %r", callback, item.key)
+
+
+class SettlementTracker:
+    """
+    Watch many receipts until they reach a terminal status, from one scheduler.
+    - `track(receipt_id=...)` polls `receipt.get`; `track(reference_id=...)`
+      polls `receipt.verify`. Both return a Future[Settlement]; `callback`
+      (optional) is called with the Settlement when it settles.
+    - Checks come off one heap ordered by due time (PollSchedule) and run on
+      at most `max_concurrency` worker threads, whatever the number of receipts.
+    - Tracking a receipt twice shares one Future; cancel it to stop tracking.
+    Use as a context manager, or call `close()` (cancels what is still pending).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        schedule: PollSchedule = PollSchedule(),
+        max_concurrency: int = 8,
+        terminal: Iterable[ReceiptStatus] = TERMINAL_STATUSES,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self._client = client
+        self.schedule = schedule
+        self.terminal = frozenset(terminal)
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, _Tracked]] = []
+        self._seq = itertools.count()
+        self._tracked: Dict[Key, _Tracked] = {}
+        self._slots = threading.Semaphore(max_concurrency)
+        self._pool = ThreadPoolExecutor(max_concurrency, thread_name_prefix="gozarpay-tracker")
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._tracked)
+
+    def track(
+        self,
+        *,
+        receipt_id: Optional[int] = None,
+        reference_id: Optional[str] = None,
+        callback: Optional[Callable[[Settlement], None]] = None,
+    ) -> "Future[Settlement]":
+        key = _key(receipt_id, reference_id)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("SettlementTracker is closed")
+            item = self._tracked.get(key)
+            if item is None:
+                now = time.monotonic()
+                item = self._tracked[key] = _Tracked(key, now, Future())
+                heapq.heappush(self._heap, (now, next(self._seq), item))
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="gozarpay-tracker-scheduler", daemon=True
+                    )
+                    self._thread.start()
+                self._cond.notify()
+            if callback is not None:
+                item.callbacks.append(callback)
+        return item.future
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            items = list(self._tracked.values())
+            self._tracked.clear()
+            self._heap.clear()
+            self._cond.notify()
+        for item in items:
+            item.future.cancel()
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "SettlementTracker":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if self._closed:
+                    return
+                _, _, item = heapq.heappop(self._heap)
+                if item.future.cancelled():
+                    self._tracked.pop(item.key, None)
+                    continue
+            self._slots.acquire()  # global concurrency cap
+            try:
+                self._pool.submit(self._check, item)
+            except RuntimeError:  # closed meanwhile
+                self._slots.release()
+                return
+
+    def _check(self, item: _Tracked) -> None:
+        try:
+            kind, value = item.key
+            try:
+                if kind == "receipt_id":
+                    result = self._client.receipt.get(receipt_id=value)
+                else:
+                    result = self._client.receipt.verify(reference_id=value)
+            except Exception as exc:
+                outcome = _outcome(item, self.schedule, self.terminal, error=exc)
+            else:
+                outcome = _outcome(item, self.schedule, self.terminal, result)
+        finally:
+            self._slots.release()
+        with self._cond:
+            if self._closed:
+                return
+            if isinstance(outcome, float):
+                heapq.heappush(self._heap, (outcome, next(self._seq), item))
+                self._cond.notify()
+                return
+            self._tracked.pop(item.key, None)
+        if isinstance(outcome, Settlement):
+            if item.future.set_running_or_notify_cancel():
+                item.future.set_result(outcome)
+                _run_callbacks(item, outcome)
+        elif item.future.set_running_or_notify_cancel():
+            item.future.set_exception(outcome)
+
+
+class AsyncSettlementTracker:
+    """
+    asyncio twin of `SettlementTracker` for AsyncClient: one scheduler task,
+    at most `max_concurrency` checks in flight. `track()` returns an
+    asyncio.Future and must be called from the event loop.
+    Use `async with`, or `await aclose()`.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        schedule: PollSchedule = PollSchedule(),
+        max_concurrency: int = 8,
+        terminal: Iterable[ReceiptStatus] = TERMINAL_STATUSES,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self._client = client
+        self.schedule = schedule
+        self.terminal = frozenset(terminal)
+        self.max_concurrency = max_concurrency
+        self._heap: List[Tuple[float, int, _Tracked]] = []
+        self._seq = itertools.count()
+        self._tracked: Dict[Key, _Tracked] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._runner: Optional["asyncio.Task[None]"] = None
+        self._checks: "set[asyncio.Task[None]]" = set()
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._tracked)
+
+    def track(
+        self,
+        *,
+        receipt_id: Optional[int] = None,
+        reference_id: Optional[str] = None,
+        callback: Optional[Callable[[Settlement], None]] = None,
+    ) -> "asyncio.Future[Settlement]":
+        key = _key(receipt_id, reference_id)
+        if self._closed:
+            raise RuntimeError("AsyncSettlementTracker is closed")
+        item = self._tracked.get(key)
+        if item is None:
+            loop = asyncio.get_running_loop()
+            now = time.monotonic()
+            item = self._tracked[key] = _Tracked(key, now, loop.create_future())
+            heapq.heappush(self._heap, (now, next(self._seq), item))
+            if self._runner is None:
+                self._wake = asyncio.Event()
+                self._slots = asyncio.Semaphore(self.max_concurrency)
+                self._runner = loop.create_task(self._run())
+            self._wake.set()  # type: ignore[union-attr]
+        if callback is not None:
+            item.callbacks.append(callback)
+        return item.future
+
+    async def aclose(self) -> None:
+        self._closed = True
+        tasks = [t for t in (self._runner, *self._checks) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for item in self._tracked.values():
+            item.future.cancel()
+        self._tracked.clear()
+        self._heap.clear()
+
+    async def __aenter__(self) -> "AsyncSettlementTracker":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _run(self) -> None:
+        wake, slots = self._wake, self._slots
+        assert wake is not None and slots is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            wake.clear()
+            if not self._heap:
+                await wake.wait()
+                continue
+            delay = self._heap[0][0] - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _, _, item = heapq.heappop(self._heap)
+            if item.future.done():  # cancelled by the caller
+                self._tracked.pop(item.key, None)
+                continue
+            await slots.acquire()  # global concurrency cap
+            task = loop.create_task(self._check(item))
+            self._checks.add(task)
+            task.add_done_callback(self._checks.discard)
+
+    async def _check(self, item: _Tracked) -> None:
+        kind, value = item.key
+        try:
+            if kind == "receipt_id":
+                result = await self._client.receipt.get(receipt_id=value)
+            else:
+                result = await self._client.receipt.verify(reference_id=value)
+        except Exception as exc:
+            outcome = _outcome(item, self.schedule, self.terminal, error=exc)
+        else:
+            outcome = _outcome(item, self.schedule, self.terminal, result)
+        finally:
+            self._slots.release()  # type: ignore[union-attr]
+        if isinstance(outcome, float):
+            heapq.heappush(self._heap, (outcome, next(self._seq), item))
+            self._wake.set()  # type: ignore[union-attr]
+            return
+        self._tracked.pop(item.key, None)
+        if item.future.done():
+            return
+        if isinstance(outcome, Settlement):
+            item.future.set_result(outcome)
+            _run_callbacks(item, outcome)
+        else:
+            item.future.set_exception(outcome)
@@ -0,0 +1,269 @@
+from __future__ import annotations
+import json
+import re
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Pattern, Tuple, Union
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from . import deadlines
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_POOL_SIZE = 10
+
+
+class Transport(ABC):
+    """
+    Sends one HTTP request and returns a requests-compatible response
+    (`status_code`, `headers`, `content`, `text`, `json()`, `elapsed`, `request`;
+    `iter_content()` and `close()` for `stream=True` calls).
+    Client and the auth strategies share one transport; several clients may too.
+    """
+
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs: Any) -> Any: ...
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """Release pooled connections (no-op by default)."""
+
+    def after_fork(self) -> None:
+        """Called in a forked child: drop state shared with the parent (no-op by default)."""
+
+
+class HTTPTransport(Transport):
+    """
+    Pooled `requests` transport.
+    - `pool_size`: connections kept per host (also the per-host concurrency cap
+      when `pool_block=True`; otherwise extra connections are opened and dropped).
+    - `keep_alive=False` sends `Connection: close` on each call (one connection
+      per call); a passed-in session's own headers are left alone.
+    - `timeout` applies to calls that do not pass their own.
+    - Pass `session` to reuse an existing requests.Session (its adapters are kept).
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        pool_block: bool = False,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.pool_size = pool_size
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size, pool_block=pool_block
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        # Capped by the caller's deadline (gozarpay.deadlines), if any
+        kwargs["timeout"] = deadlines.cap(kwargs.get("timeout", self.timeout))
+        if not self.keep_alive:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), "Connection": "close"}
+        return self.session.request(method, url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def after_fork(self) -> None:
+        # The parent's pooled sockets (and pool locks) must not be used from the
+        # child: mount fresh adapters with the same settings. Headers, cookies and
+        # auth of the session are kept; the old adapters are dropped, not closed.
+        fresh: Dict[int, HTTPAdapter] = {}
+        for prefix, adapter in list(self.session.adapters.items()):
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            if id(adapter) not in fresh:  # one adapter mounted twice stays shared
+                fresh[id(adapter)] = HTTPAdapter(
+                    pool_connections=adapter._pool_connections,
+                    pool_maxsize=adapter._pool_maxsize,
+                    max_retries=adapter.max_retries,
+                    pool_block=adapter._pool_block,
+                )
+            self.session.mount(prefix, fresh[id(adapter)])
+
+
+# ---- in-memory transport (no sockets) ----
+
+
+@dataclass(slots=True)
+class MemoryRequest:
+    """What an in-memory handler sees; `path_params` come from `{name}` placeholders."""
+
+    method: str
+    url: str
+    path: str
+    path_params: Dict[str, str]
+    params: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    json: Any = None
+    body: Optional[bytes] = None
+
+
+class MemoryResponse:
+    """Minimal requests.Response look-alike produced by InMemoryTransport."""
+
+    __slots__ = (
+        "status_code",
+        "headers",
+        "content",
+        "request",
+        "url",
+        "_gozarpay_trace",
+        "_gozarpay_memo",
+    )
+
+    elapsed = timedelta(0)
+
+    def __init__(
+        self,
+        status_code: int = 200,
+        content: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        request: Optional[MemoryRequest] = None,
+    ) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {"Content-Type": "application/json"}
+        self.request = request
+        self.url = request.url if request is not None else ""
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", "replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: Optional[int] = 1) -> Iterator[bytes]:
+        size = chunk_size or len(self.content) or 1
+        for i in range(0, len(self.content), size):
+            yield self.content[i : i + size]
+
+    def close(self) -> None:
+        pass
+
+
+HandlerResult = Union[MemoryResponse, Tuple[int, Any], Any]
+Handler = Callable[[MemoryRequest], HandlerResult]
+
+
+def _to_bytes(body: Any) -> bytes:
+    if isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode()
+    return json.dumps(body).encode()
+
+
+class InMemoryTransport(Transport):
+    """
+    Zero-network transport: requests are routed by method + URL path to Python
+    handlers, so the SDK can be load-tested without sockets.
+    - Paths may be VersionSpec patterns, e.g. `V1_SPEC.routes["receipt.get"]`.
+    - A handler returns a MemoryResponse, a `(status, body)` tuple, or a body
+      (status 200); bodies that are not bytes/str are JSON-encoded.
+    - Unrouted requests get a 404; `calls` counts requests per (method, pattern).
+    """
+
+    def __init__(self) -> None:
+        self._exact: Dict[Tuple[str, str], Handler] = {}
+        self._patterns: List[Tuple[str, Pattern[str], str, Handler]] = []
+        self._lock = threading.Lock()
+        self.calls: Dict[Tuple[str, str], int] = {}
+
+    def after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def route(
+        self, method: str, path: str, handler: Union[Handler, Any]
+    ) -> "InMemoryTransport":
+        """Register `handler` (or a fixed body) for `method path`; returns self."""
+        fn = handler if callable(handler) else (lambda _req, body=handler: body)
+        method = method.upper()
+        if "{" in path:
+            regex = re.sub(r"\\{(\w+)\\}", r"(?P<\1>[^/]+)", re.escape(path))
+            self._patterns.append((method, re.compile(f"^{regex}$"), path, fn))
+        else:
+            self._exact[(method, path)] = fn
+        return self
+
+    def request(self, method: str, url: str, **kwargs: Any) -> MemoryResponse:
+        path = urlsplit(url).path
+        method = method.upper()
+        handler, pattern, path_params = self._resolve(method, path)
+        payload = kwargs.get("json")
+        req = MemoryRequest(
+            method=method,
+            url=url,
+            path=path,
+            path_params=path_params,
+            params=kwargs.get("params"),
+            headers=dict(kwargs.get("headers") or {}),
+            json=payload,
+            body=_to_bytes(payload) if payload is not None else kwargs.get("data"),
+        )
+        with self._lock:
+            key = (method, pattern)
+            self.calls[key] = self.calls.get(key, 0) + 1
+        if handler is None:
+            return MemoryResponse(404, b'{"detail": "Not found."}', request=req)
+        result = handler(req)
+        if isinstance(result, MemoryResponse):
+            if result.request is None:
+                result.request, result.url = req, req.url
+            return result
+        if isinstance(result, tuple):
+            status, body = result
+            return MemoryResponse(status, _to_bytes(body), request=req)
+        return MemoryResponse(200, _to_bytes(result), request=req)
+
+    def _resolve(
+        self, method: str, path: str
+    ) -> Tuple[Optional[Handler], str, Dict[str, str]]:
+        handler = self._exact.get((method, path))
+        if handler is not None:
+            return handler, path, {}
+        for route_method, regex, pattern, fn in self._patterns:
+            if route_method == method:
+                m = regex.match(path)
+                if m:
+                    return fn, pattern, m.groupdict()
+        return None, path, {}
+
+    def as_httpx(self) -> Any:
+        """This transport as an `httpx.MockTransport` (for AsyncClient)."""
+        import httpx
+
+        def handle(request: "httpx.Request") -> "httpx.Response":
+            body: Dict[str, Any] = {}
+            if request.content:
+                try:
+                    body["json"] = json.loads(request.content)
+                except ValueError:
+                    body["data"] = request.content
+            resp = self.request(
+                request.method,
+                str(request.url),
+                params=dict(request.url.params),
+                headers=dict(request.headers),
+                **body,
+            )
+            return httpx.Response(
+                resp.status_code, content=resp.content, headers=resp.headers
+            )
+
+        return httpx.MockTransport(handle)
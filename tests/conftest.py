@@ -0,0 +1,68 @@
+from __future__ import annotations
+import itertools
+from typing import Any, Dict
+
+import pytest
+
+from gozarpay import ClientConfig
+from gozarpay.auth.strategies import LOGIN_PATH, REFRESH_PATH
+from gozarpay.factory import create_async_client, create_client
+from gozarpay.retry import _reset_breakers
+from gozarpay.transport import InMemoryTransport
+
+BASE_URL = "http://mem"
+
+
+@pytest.fixture(autouse=True)
+def closed_breakers():
+    """Circuit breakers are process-wide per host: every test starts with closed ones."""
+    _reset_breakers()
+    yield
+    _reset_breakers()
+
+
+@pytest.fixture
+def api() -> InMemoryTransport:
+    """
+    InMemoryTransport answering login and refresh; tokens are numbered
+    (`access-1`, `refresh-1`, ...). Tests add their own routes.
+    """
+    numbers = itertools.count(1)
+
+    def login(req) -> Dict[str, str]:
+        n = next(numbers)
+        return {"access_token": f"access-{n}", "refresh_token": f"refresh-{n}"}
+
+    def refresh(req) -> Dict[str, str]:
+        return {"access": f"access-{next(numbers)}"}
+
+    return InMemoryTransport().route("POST", LOGIN_PATH, login).route("POST", REFRESH_PATH, refresh)
+
+
+def config(api: InMemoryTransport, **options: Any) -> ClientConfig:
+    return ClientConfig(base_url=BASE_URL, api_key="k", secret_key="s", transport=api, **options)
+
+
+@pytest.fixture
+def client(api):
+    client = create_client(config(api))
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def make_client(api):
+    """`make_client(**ClientConfig options)` -> Client on `api`, closed after the test."""
+    clients = []
+
+    def make(**options: Any):
+        clients.append(create_client(config(api, **options)))
+        return clients[-1]
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def async_client(api: InMemoryTransport, **options: Any):
+    return create_async_client(config(api, **options))
@@ -0,0 +1,57 @@
+from __future__ import annotations
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from gozarpay.auth.store import FileTokenStore, MemoryTokenStore
+from gozarpay.auth.strategies import LOGIN_PATH, ApiKeyAuth, AsyncApiKeyAuth
+from gozarpay.exceptions import AuthenticationError
+
+from conftest import BASE_URL
+
+
+def test_cancelled_async_refresh_does_not_leak_the_store_lock(tmp_path, api):
+    store = FileTokenStore(str(tmp_path / "tokens.json"))
+    auth = AsyncApiKeyAuth(base_url=BASE_URL, api_key="k", secret_key="s", store=store)
+    holder = store.lock()
+    holder.acquire()  # another worker is mid-refresh
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=api.as_httpx()) as http:
+            auth.bind(http)
+            with pytest.raises(TimeoutError):
+                async with asyncio.timeout(0.1):
+                    await auth.attach({})
+            holder.release()
+            await asyncio.sleep(0.1)  # the abandoned acquire lands and lets go
+            async with asyncio.timeout(2):
+                return await auth.attach({})
+
+    headers = asyncio.run(scenario())
+    assert headers["Authorization"] == "Bearer access-1"
+
+    probe = threading.Thread(target=lambda: (holder.acquire(), holder.release()))
+    probe.start()
+    probe.join(2)
+    assert not probe.is_alive()
+
+
+def test_wrong_secret_cannot_adopt_a_stored_token(tmp_path, api):
+    def login(req):
+        if req.json["secret_key"] != "s":
+            return 401, {"detail": "bad credentials"}
+        return {"access_token": "access-live", "refresh_token": "refresh-live"}
+
+    api.route("POST", LOGIN_PATH, login)
+    for store in (MemoryTokenStore(), FileTokenStore(str(tmp_path / "tokens.json"))):
+        good = ApiKeyAuth(BASE_URL, "k", "s", store=store)
+        good.bind(api)
+        assert good.attach({})["Authorization"] == "Bearer access-live"
+
+        wrong = ApiKeyAuth(BASE_URL, "k", "rotated", store=store)
+        wrong.bind(api)
+        with pytest.raises(AuthenticationError):
+            wrong.attach({})
+        assert wrong.identity() != good.identity()
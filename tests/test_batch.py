@@ -0,0 +1,117 @@
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gozarpay.batch import run_batch
+from gozarpay.retry import IDEMPOTENCY_HEADER, RetryPolicy
+from gozarpay.versioning import V1_SPEC
+
+from conftest import async_client
+
+CREATE = V1_SPEC.routes["receipt.create"]
+
+
+def receipt_create(api):
+    """Route receipt.create; returns the list of reference_ids POSTed."""
+    posted, lock = [], threading.Lock()
+
+    def create(req):
+        with lock:
+            posted.append(req.json["reference_id"])
+            n = len(posted)
+        time.sleep(0.01)
+        return {"redirect_url": f"https://pay/{n}", "id": n, "reference_id": req.json["reference_id"]}
+
+    api.route("POST", CREATE, create)
+    return posted
+
+
+def item(reference_id: str):
+    return {
+        "irt_amount": "10000",
+        "reference_id": reference_id,
+        "phone_number": "09120000000",
+        "callback": "https://shop/cb",
+    }
+
+
+def test_create_many_sends_one_post_per_reference_id(api, client):
+    posted = receipt_create(api)
+    refs = ["dup"] * 20 + ["a", "b", "dup", "a"]
+
+    results = client.receipt.create_many([item(r) for r in refs], max_workers=4)
+
+    assert sorted(posted) == ["a", "b", "dup"]
+    assert [r.key for r in results] == refs
+    assert all(r.ok for r in results)
+    # every duplicate gets the one receipt created for its reference_id
+    assert len({r.value.id for r in results if r.key == "dup"}) == 1
+
+
+def test_async_create_many_sends_one_post_per_reference_id(api):
+    posted = receipt_create(api)
+    refs = ["dup"] * 20 + ["a"]
+
+    async def scenario():
+        async with async_client(api) as client:
+            return await client.receipt.create_many([item(r) for r in refs])
+
+    results = asyncio.run(scenario())
+    assert sorted(posted) == ["a", "dup"]
+    assert [r.key for r in results] == refs
+    assert len({r.value.id for r in results}) == 2
+
+
+def test_duplicates_after_a_settled_send_reuse_its_result():
+    sent = []
+
+    def send(payload):
+        sent.append(payload)
+        if payload == "boom":
+            raise ValueError(payload)
+        return payload.upper()
+
+    # duplicates arriving while "x" is in flight or after it settled both reuse it
+    items = [("x", "x"), ("y", "boom")] + [("x", "again"), ("y", "again")] * 5
+    results = run_batch(items, send, max_workers=1)
+
+    assert sent == ["x", "boom"]
+    assert [r.value for r in results if r.key == "x"] == ["X"] * 6
+    assert all(isinstance(r.error, ValueError) for r in results if r.key == "y")
+
+
+def test_concurrent_creates_with_different_payloads_are_all_sent(api, client):
+    posted = receipt_create(api)
+    amounts = ["10000", "20000", "30000"]
+
+    with ThreadPoolExecutor(3) as workers:
+        list(workers.map(lambda a: client.receipt.create(**{**item("dup"), "irt_amount": a}), amounts))
+
+    assert posted == ["dup"] * 3
+
+
+def test_batch_creates_carry_an_idempotency_key_and_are_retried(api, make_client):
+    keys, failed = [], set()
+
+    def create(req):
+        key = req.headers.get(IDEMPOTENCY_HEADER)
+        keys.append((req.json["reference_id"], key))
+        if key not in failed:  # first attempt of every receipt fails
+            failed.add(key)
+            return 503, {}
+        return {"redirect_url": "https://pay/1", "reference_id": req.json["reference_id"]}
+
+    api.route("POST", CREATE, create)
+    client = make_client(retry=RetryPolicy(backoff_base=0.001))
+
+    results = client.receipt.create_many([item("a"), item("b"), item("a")])
+
+    assert all(r.ok for r in results)
+    by_ref = {}
+    for ref, key in keys:
+        by_ref.setdefault(ref, set()).add(key)
+    assert len(keys) == 4  # two attempts per reference_id
+    assert all(len(k) == 1 and None not in k for k in by_ref.values())
+    assert by_ref["a"] != by_ref["b"]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+import asyncio
+
+import pytest
+
+from gozarpay.bulk import BulkRun, percentile
+from gozarpay.exceptions import APIError
+from gozarpay.versioning import V1_SPEC
+
+from conftest import async_client
+
+WALLETS = V1_SPEC.routes["wallet.list_by_phone"]
+
+
+def wallet(code: str) -> dict:
+    return {"currency": {"id": 1, "code": code}, "balance": "1", "value_total": "1"}
+
+
+def wallet_pages(api):
+    """0912: two pages (BTC, ETH), 0913: one page (USDT), anything else: 404."""
+    books = {"0912": [[wallet("BTC")], [wallet("ETH")]], "0913": [[wallet("USDT")]]}
+
+    def page(req):
+        pages = books.get(req.path_params["phone"])
+        if pages is None:
+            return 404, {"detail": "Not found."}
+        number = int((req.params or {}).get("page", 1))
+        more = number < len(pages)
+        return {
+            "count": sum(map(len, pages)),
+            "next": f"http://mem{req.path}?page={number + 1}" if more else None,
+            "previous": None,
+            "results": pages[number - 1],
+        }
+
+    api.route("GET", WALLETS, page)
+
+
+def test_list_many_collects_wallets_errors_and_stats(api, client):
+    wallet_pages(api)
+
+    run = client.wallet.list_many(["0912", "0913", "0999"], max_workers=2)
+    pairs = sorted((phone, w.currency.code) for phone, w in run)
+
+    assert pairs == [("0912", "BTC"), ("0912", "ETH"), ("0913", "USDT")]
+    assert list(run.errors) == ["0999"]
+    assert isinstance(run.errors["0999"], APIError)
+    stats = run.stats
+    assert (stats.keys, stats.succeeded, stats.failed, stats.items) == (3, 2, 1, 3)
+    assert stats.throughput > 0 and stats.max >= stats.p50
+
+
+def test_async_list_many_collects_wallets_errors_and_stats(api):
+    wallet_pages(api)
+
+    async def main():
+        async with async_client(api) as client:
+            run = client.wallet.list_many(["0912", "0913", "0999"], max_workers=2)
+            return run, sorted([(phone, w.currency.code) async for phone, w in run])
+
+    run, pairs = asyncio.run(main())
+
+    assert pairs == [("0912", "BTC"), ("0912", "ETH"), ("0913", "USDT")]
+    assert list(run.errors) == ["0999"]
+    assert (run.stats.succeeded, run.stats.failed, run.stats.items) == (2, 1, 3)
+
+
+def test_bulk_run_stops_early_without_losing_stats():
+    run = BulkRun(range(100), lambda key: [key], max_workers=2)
+
+    for key, value in run:
+        break
+
+    assert run.stats is not None and run.stats.items >= 1
+
+
+def test_bulk_run_rejects_no_workers():
+    with pytest.raises(ValueError):
+        BulkRun([], lambda key: [], max_workers=0)
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) == 0.0
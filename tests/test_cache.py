@@ -0,0 +1,121 @@
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gozarpay import cache as cache_module
+from gozarpay.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def counting_loader():
+    calls = []
+
+    def load():
+        calls.append(1)
+        return len(calls)
+
+    return load, calls
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(ttl=5)
+    load, calls = counting_loader()
+
+    assert cache.get_or_load("k", load) == 1
+    clock[0] += 4.9
+    assert cache.get_or_load("k", load) == 1
+    clock[0] += 0.2
+    assert cache.get_or_load("k", load) == 2
+    assert cache.stats.hits == 1 and cache.stats.misses == 2
+
+
+def test_stale_entry_is_served_while_one_background_reload_runs(clock):
+    cache = TTLCache(ttl=5, stale_ttl=10)
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(2)
+        return len(calls)
+
+    assert cache.get_or_load("k", load) == 1
+    clock[0] += 6
+    assert [cache.get_or_load("k", load) for _ in range(3)] == [1, 1, 1]
+    release.set()
+    deadline = time.time() + 2
+    while cache.get_or_load("k", load) != 2 and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert cache.get_or_load("k", load) == 2
+    assert len(calls) == 2
+    assert cache.stats.stale_hits >= 3
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache(ttl=5)
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.2)
+        return "v"
+
+    with ThreadPoolExecutor(8) as workers:
+        values = list(workers.map(lambda _: cache.get_or_load("k", load), range(8)))
+
+    assert values == ["v"] * 8
+    assert len(calls) == 1
+
+
+def test_async_concurrent_misses_share_one_load():
+    cache = TTLCache(ttl=5)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "v"
+
+    async def main():
+        return await asyncio.gather(*(cache.aget_or_load("k", load) for _ in range(8)))
+
+    assert asyncio.run(main()) == ["v"] * 8
+    assert len(calls) == 1
+
+
+def test_async_waiters_take_over_when_the_loader_is_cancelled():
+    cache = TTLCache(ttl=5)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.create_task(cache.aget_or_load("k", load))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(cache.aget_or_load("k", load)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        async with asyncio.timeout(2):
+            values = await asyncio.gather(*followers)
+        return leader, values
+
+    leader, values = asyncio.run(main())
+
+    assert leader.cancelled()
+    assert values == [2, 2, 2]
+    assert len(calls) == 2
@@ -0,0 +1,147 @@
+from __future__ import annotations
+import asyncio
+import logging
+from urllib.parse import urlsplit
+
+from gozarpay.callbacks import CallbackReceiver
+from gozarpay.models import ReceiptCallback, ReceiptStatus
+from gozarpay.versioning import V1_SPEC
+
+from conftest import async_client
+
+
+async def _exchange(url: str, request: bytes) -> bytes:
+    split = urlsplit(url)
+    reader, writer = await asyncio.open_connection(split.hostname, split.port)
+    writer.write(request)
+    await writer.drain()
+    if writer.can_write_eof():
+        writer.write_eof()
+    data = await reader.read()
+    writer.close()
+    return data
+
+
+def _post(path: str, body: bytes, length: int) -> bytes:
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: mem\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {length}\r\nConnection: close\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+def test_client_hanging_up_mid_body_is_not_an_unhandled_error():
+    errors, events = [], []
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda _loop, ctx: errors.append(ctx))
+        async with CallbackReceiver(events.append) as rx:
+            path = urlsplit(rx.url).path
+            cut = await _exchange(rx.url, _post(path, b'{"reference_id": ', 100))
+            body = b'{"reference_id": "order-1", "status": "success"}'
+            ok = await _exchange(rx.url, _post(path, body, len(body)))
+            await asyncio.sleep(0.05)  # let the cut connection's handler finish
+            return cut, ok
+
+    cut, ok = asyncio.run(scenario())
+    assert cut == b""
+    assert ok.startswith(b"HTTP/1.1 200")
+    assert [e.callback.reference_id for e in events] == ["order-1"]
+    assert errors == []
+
+
+def _callback(reference_id: str = "order-1", status: str = "success") -> ReceiptCallback:
+    return ReceiptCallback(reference_id=reference_id, status=status)
+
+
+def test_repeated_delivery_is_acknowledged_but_processed_once():
+    events = []
+
+    async def scenario():
+        async with CallbackReceiver(events.append) as rx:
+            assert rx.submit(_callback()) == 200
+            assert rx.submit(_callback()) == 200
+            assert rx.submit(_callback(status="refunded")) == 200  # a new status is new
+            await rx.join()
+            return rx.stats
+
+    stats = asyncio.run(scenario())
+    assert [e.callback.status for e in events] == ["success", "refunded"]
+    assert (stats.accepted, stats.duplicates) == (2, 1)
+
+
+def test_full_queue_answers_503_and_lets_the_redelivery_in():
+    events = []
+
+    async def scenario():
+        rx = await CallbackReceiver(events.append, queue_size=1, workers=1).start(listen=False)
+        # no await in between: the worker has not taken anything off the queue yet
+        assert rx.submit(_callback("order-1")) == 200
+        assert rx.submit(_callback("order-2")) == 503
+        await rx.join()
+        assert rx.submit(_callback("order-2")) == 200  # the gateway's retry
+        await rx.aclose()
+        return rx.stats
+
+    stats = asyncio.run(scenario())
+    assert [e.callback.reference_id for e in events] == ["order-1", "order-2"]
+    assert (stats.rejected, stats.accepted) == (1, 2)
+
+
+def test_verify_hands_the_confirmed_receipt_to_the_handler(api):
+    events = []
+    api.route("POST", V1_SPEC.routes["receipt.verify"], lambda req: {**req.json, "status": "success"})
+
+    async def scenario():
+        async with async_client(api) as client:
+            async with CallbackReceiver(events.append, client=client, verify=True) as rx:
+                rx.submit(_callback(status="pending"))
+
+    asyncio.run(scenario())
+    assert events[0].verified.status is ReceiptStatus.success
+
+
+def test_failed_delivery_is_processed_again_even_when_on_error_raises(caplog):
+    events, errors = [], []
+
+    def handler(event):
+        if not errors:
+            raise RuntimeError("handler down")
+        events.append(event)
+
+    def on_error(callback, exc):
+        errors.append(exc)
+        raise ValueError("on_error down too")
+
+    async def scenario():
+        rx = await CallbackReceiver(handler, on_error=on_error, workers=1).start(listen=False)
+        try:
+            async with asyncio.timeout(2):  # a dead worker never drains the queue
+                rx.submit(_callback())
+                await rx.join()
+                assert rx.submit(_callback()) == 200  # forgotten: not a duplicate
+                await rx.join()
+        finally:
+            await rx.aclose(drain=False)
+        return rx.stats
+
+    with caplog.at_level(logging.ERROR, logger="gozarpay.callbacks"):
+        stats = asyncio.run(scenario())
+    assert (stats.failed, stats.processed) == (1, 1)
+    assert len(events) == 1
+    assert "on_error down too" in caplog.text
+
+
+def test_unsupported_framing_counts_as_invalid():
+    async def scenario():
+        async with CallbackReceiver(max_body=10) as rx:
+            path = urlsplit(rx.url).path
+            too_big = await _exchange(rx.url, _post(path, b"{}", 11))
+            chunked = f"POST {path} HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n".encode()
+            no_length = await _exchange(rx.url, chunked)
+            return too_big, no_length, rx.stats
+
+    too_big, no_length, stats = asyncio.run(scenario())
+    assert too_big.startswith(b"HTTP/1.1 413")
+    assert no_length.startswith(b"HTTP/1.1 411")
+    assert stats.invalid == 2
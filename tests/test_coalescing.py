@@ -0,0 +1,46 @@
+from __future__ import annotations
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gozarpay.versioning import V1_SPEC
+
+GET = V1_SPEC.routes["receipt.get"]
+
+
+def test_identical_concurrent_gets_share_one_call(api, make_client):
+    def slow_get(req):
+        time.sleep(0.2)
+        return {"redirect_url": "https://pay/7", "id": 7}
+
+    api.route("GET", GET, slow_get)
+    client = make_client(coalesce=True)
+    client.receipt.get(receipt_id=1)  # log in first: only the GETs race
+
+    with ThreadPoolExecutor(8) as workers:
+        receipts = list(workers.map(lambda _: client.receipt.get(receipt_id=7), range(8)))
+
+    assert [r.id for r in receipts] == [7] * 8
+    assert api.calls[("GET", GET)] == 2
+    assert client.coalesced == 7
+
+
+def test_gets_are_not_shared_without_coalesce(api, client):
+    api.route("GET", GET, {"redirect_url": "https://pay/7", "id": 7})
+
+    with ThreadPoolExecutor(4) as workers:
+        list(workers.map(lambda _: client.receipt.get(receipt_id=7), range(4)))
+
+    assert api.calls[("GET", GET)] == 4
+
+
+def test_sync_client_does_not_import_asyncio():
+    script = (
+        "import sys, gozarpay\n"
+        "from gozarpay.factory import create_client\n"
+        "c = create_client(gozarpay.ClientConfig(base_url='http://mem', api_key='k', secret_key='s'))\n"
+        "c.receipt, c.wallet, c.market\n"
+        "sys.exit('asyncio' in sys.modules)\n"
+    )
+    assert subprocess.run([sys.executable, "-c", script]).returncode == 0
@@ -0,0 +1,100 @@
+from __future__ import annotations
+import json
+import sys
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import ValidationError
+
+from gozarpay import decoding
+from gozarpay.decoding import SharedDecode, adapter, decode, json_backend, loads, wants_validation
+from gozarpay.models import MarketPrice, Receipt
+from gozarpay.versioning import V1_SPEC
+
+PRICE = {
+    "id": 1,
+    "code": "BTCIRT",
+    "price_info": json.dumps({"price": "1000", "change": 1.5}),
+    "price": "1000",
+    "buy_price": "990",
+    "sell_price": "1010",
+    "currency1": {"id": 3, "code": "BTC"},
+}
+
+
+def response(body) -> SimpleNamespace:
+    return SimpleNamespace(content=json.dumps(body).encode())
+
+
+def test_adapter_is_built_once_per_type():
+    assert adapter(List[MarketPrice]) is adapter(List[MarketPrice])
+    assert adapter(List[MarketPrice]) is not adapter(List[Receipt])
+
+
+def test_decode_validates_bytes_straight_into_models():
+    [price] = decode(response([PRICE]), List[MarketPrice])
+
+    assert isinstance(price, MarketPrice)
+    assert price.currency1 == 3
+    assert price.price_info.price == "1000"  # JSON string coerced to PriceInfo
+
+
+def test_decode_rejects_invalid_bodies():
+    with pytest.raises(ValidationError):
+        decode(response([{"id": "x"}]), List[MarketPrice])
+
+
+def test_decode_without_validation_skips_the_model():
+    [price] = decode(response([{"id": "x"}]), List[MarketPrice], validate=False)
+
+    assert not isinstance(price, MarketPrice)
+    assert price.id == "x"
+
+
+@pytest.mark.parametrize(
+    "mode, validate, expected",
+    [("model", None, True), ("raw", None, False), ("raw", True, True), ("model", False, False)],
+)
+def test_per_call_validate_overrides_the_response_mode(mode, validate, expected):
+    assert wants_validation(mode, validate) is expected
+
+
+def test_orjson_is_used_when_installed():
+    pytest.importorskip("orjson")
+
+    assert json_backend() == "orjson"
+    assert loads(b'{"a": [1, 2.5, "x"]}') == {"a": [1, 2.5, "x"]}
+
+
+def test_stdlib_json_is_the_fallback(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)  # import orjson -> ImportError
+    decoding._json_loads.cache_clear()
+    try:
+        assert json_backend() == "json"
+        assert loads('{"a": 1}') == {"a": 1}
+    finally:
+        decoding._json_loads.cache_clear()
+
+
+def test_shared_decode_decodes_once():
+    memo = SharedDecode()
+    calls = []
+
+    def load():
+        calls.append(1)
+        return object()
+
+    first = memo.get("key", load)
+
+    assert memo.get("key", load) is first
+    assert len(calls) == 1
+
+
+def test_client_decodes_into_models(api, client):
+    api.route("GET", V1_SPEC.routes["market.price_stats"], [PRICE])
+
+    [price] = client.market.price_stats()
+
+    assert isinstance(price, MarketPrice)
+    assert price.buy_price == "990"
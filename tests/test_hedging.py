@@ -0,0 +1,86 @@
+from __future__ import annotations
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gozarpay.hedging import HedgePolicy, HedgePool
+from gozarpay.versioning import V1_SPEC
+
+GET = V1_SPEC.routes["receipt.get"]
+
+
+def slow_then_fast(api, slow: float = 0.3):
+    """receipt.get: the first request stalls for `slow` seconds, later ones answer at once."""
+    calls = itertools.count()
+
+    def get(req):
+        if next(calls) == 0:
+            time.sleep(slow)
+        return {"redirect_url": "https://pay/7", "id": 7}
+
+    api.route("GET", GET, get)
+
+
+def policy(**options) -> HedgePolicy:
+    return HedgePolicy(max_delay=0.05, max_extra=1.0, **options)
+
+
+def test_slow_read_is_hedged_and_the_duplicate_wins(api, make_client):
+    slow_then_fast(api)
+    client = make_client(hedge=policy(max_workers=2))
+
+    assert client.receipt.get(receipt_id=7).id == 7
+
+    stats = client.hedge_stats()["receipt.get"]
+    assert (stats.hedged, stats.wins, stats.saturated) == (1, 1, 0)
+    assert stats.p50 < 0.3
+
+
+def test_hedge_is_skipped_when_no_worker_is_idle(api, make_client):
+    slow_then_fast(api)
+    client = make_client(hedge=policy(max_workers=1))
+
+    assert client.receipt.get(receipt_id=7).id == 7
+
+    stats = client.hedge_stats()["receipt.get"]
+    assert (stats.hedged, stats.saturated) == (0, 1)
+    assert api.calls[("GET", GET)] == 1
+
+
+def test_concurrent_first_calls_share_one_hedge_pool(api, make_client, monkeypatch):
+    import gozarpay.hedging
+
+    api.route("GET", GET, {"redirect_url": "https://pay/7", "id": 7})
+    built = []
+
+    class CountingPool(HedgePool):
+        def __init__(self, size: int) -> None:
+            built.append(self)
+            time.sleep(0.05)  # widen any check-then-create window
+            super().__init__(size)
+
+    monkeypatch.setattr(gozarpay.hedging, "HedgePool", CountingPool)
+    client = make_client(hedge=policy(max_workers=2))
+
+    with ThreadPoolExecutor(8) as workers:
+        list(workers.map(lambda _: client.receipt.get(receipt_id=7), range(8)))
+
+    assert len(built) == 1
+    client.close()
+
+
+def test_hedge_pool_never_queues():
+    pool = HedgePool(1)
+    release = threading.Event()
+    try:
+        busy = pool.try_submit(release.wait)
+        assert busy is not None
+        assert pool.try_submit(lambda: None) is None
+        release.set()
+        busy.result(1)
+        time.sleep(0.01)  # the worker hands its slot back once done
+        assert pool.try_submit(lambda: 1).result(1) == 1
+    finally:
+        release.set()
+        pool.shutdown()
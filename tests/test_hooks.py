@@ -0,0 +1,154 @@
+from __future__ import annotations
+import pickle
+import urllib.error
+import urllib.request
+
+import pytest
+import requests
+
+from gozarpay.auth.strategies import LOGIN_PATH
+from gozarpay.hooks import Hooks, MultiHooks, RequestInfo
+from gozarpay.metrics import Histogram, MetricsHooks
+from gozarpay.retry import NO_RETRY
+from gozarpay.versioning import V1_SPEC
+
+GET = V1_SPEC.routes["receipt.get"]
+
+
+class Recorder(Hooks):
+    def __init__(self) -> None:
+        self.events = []
+
+    def on_request_start(self, route, method, url, attempt):
+        self.events.append(("start", route, method, attempt))
+
+    def on_request_end(self, info):
+        self.events.append(("end", info))
+
+    def on_auth_refresh(self, elapsed, error):
+        self.events.append(("auth", error))
+
+    def on_decode(self, route, phase, elapsed, nbytes):
+        self.events.append(("decode", route, phase, nbytes))
+
+
+def test_hooks_see_each_exchange_auth_and_decode(api, make_client):
+    api.route("GET", GET, {"redirect_url": "https://pay/7", "id": 7})
+    recorder = Recorder()
+    client = make_client(hooks=recorder)
+
+    client.receipt.get(receipt_id=7)
+
+    kinds = [event[0] for event in recorder.events]
+    assert kinds == ["auth", "start", "end", "decode"]
+    assert recorder.events[1] == ("start", "receipt.get", "GET", 1)
+    info = recorder.events[2][1]
+    assert (info.route, info.method, info.status, info.error) == ("receipt.get", "GET", 200, None)
+    assert info.bytes_in > 0 and info.total >= info.wait
+    assert recorder.events[3][:3] == ("decode", "receipt.get", "validate")
+
+
+def test_failed_send_is_reported_with_its_error(api, make_client):
+    def down(req):
+        raise requests.ConnectionError("refused")
+
+    api.route("GET", GET, down)
+    recorder = Recorder()
+    client = make_client(hooks=recorder, retry=NO_RETRY)
+
+    with pytest.raises(requests.ConnectionError):
+        client.receipt.get(receipt_id=7)
+
+    [info] = [event[1] for event in recorder.events if event[0] == "end"]
+    assert info.status is None
+    assert isinstance(info.error, requests.ConnectionError)
+
+
+def test_multi_hooks_fan_out_in_order():
+    first, second = Recorder(), Recorder()
+
+    MultiHooks(first, second).on_request_start("receipt.get", "GET", "http://mem", 1)
+
+    assert first.events == second.events == [("start", "receipt.get", "GET", 1)]
+
+
+def test_histogram_buckets_and_quantiles():
+    h = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        h.observe(value)
+
+    assert h.counts == [2, 1, 1]  # bounds are inclusive upper edges
+    assert h.count == 4 and h.sum == pytest.approx(2.65)
+    assert h.quantile(0.5) == 0.1
+    assert h.quantile(0.75) == 1.0
+    assert h.quantile(1.0) == float("inf")
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_prometheus_output():
+    metrics = MetricsHooks(buckets=(0.1, 1.0))
+    metrics.on_request_end(
+        RequestInfo(
+            "receipt.get", "GET", "http://mem", 1, status=200, bytes_in=10, wait=0.05, total=0.2
+        )
+    )
+    metrics.on_retry('odd"route', 1, 0.1, None)
+
+    text = metrics.prometheus()
+
+    assert "# TYPE gozarpay_request_duration_seconds histogram" in text
+    assert 'gozarpay_request_duration_seconds_bucket{route="receipt.get",le="0.1"} 0' in text
+    assert 'gozarpay_request_duration_seconds_bucket{route="receipt.get",le="1.0"} 1' in text
+    assert 'gozarpay_request_duration_seconds_bucket{route="receipt.get",le="+Inf"} 1' in text
+    assert 'gozarpay_request_duration_seconds_count{route="receipt.get"} 1' in text
+    assert "# TYPE gozarpay_requests_total counter" in text
+    assert 'gozarpay_requests_total{method="GET",route="receipt.get",status="200"} 1' in text
+    assert 'gozarpay_response_bytes_total{route="receipt.get"} 10' in text
+    assert 'gozarpay_retries_total{reason="connection",route="odd\\"route"} 1' in text
+    assert "request_connect_seconds" not in text  # unknown connect time is not observed
+    assert metrics.histogram("request_wait_seconds", route="receipt.get").count == 1
+
+
+def test_metrics_from_a_client_are_keyed_by_route(api, make_client):
+    api.route("GET", GET, {"redirect_url": "https://pay/7", "id": 7})
+    metrics = MetricsHooks()
+    client = make_client(hooks=metrics)
+
+    client.receipt.get(receipt_id=7)
+    client.receipt.get(receipt_id=7)
+
+    text = metrics.prometheus()
+    assert 'gozarpay_requests_total{method="GET",route="receipt.get",status="200"} 2' in text
+    assert 'gozarpay_auth_refresh_total{outcome="ok"} 1' in text
+    assert 'gozarpay_decode_seconds_count{phase="validate",route="receipt.get"} 2' in text
+    assert api.calls[("POST", LOGIN_PATH)] == 1
+
+
+def test_metrics_reset_fork_and_pickle_start_empty():
+    metrics = MetricsHooks(prefix="shop")
+    metrics.on_coalesced("receipt.get")
+
+    copy = pickle.loads(pickle.dumps(metrics))
+    assert copy.prefix == "shop" and copy.prometheus() == "\n"
+    metrics.after_fork()
+    assert metrics.prometheus() == "\n"
+    metrics.on_coalesced("receipt.get")
+    metrics.reset()
+    assert metrics.prometheus() == "\n"
+
+
+def test_serve_exposes_metrics_over_http():
+    metrics = MetricsHooks()
+    metrics.on_coalesced("receipt.get")
+    server = metrics.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=2) as resp:
+            body = resp.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other", timeout=2)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 'gozarpay_coalesced_total{route="receipt.get"} 1' in body
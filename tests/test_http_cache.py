@@ -0,0 +1,81 @@
+from __future__ import annotations
+from dataclasses import replace
+
+from gozarpay.cache import HTTPCache
+from gozarpay.factory import create_client
+from gozarpay.transport import MemoryResponse
+from gozarpay.versioning import V1_SPEC
+
+from conftest import config
+
+GET = V1_SPEC.routes["receipt.get"]
+
+
+def versioned_receipt(api):
+    """receipt.get with an ETag; answers 304 to a matching If-None-Match. Returns its state."""
+    state = {"version": 1, "conditional": []}
+
+    def get(req):
+        etag = f'"v{state["version"]}"'
+        sent = req.headers.get("If-None-Match")
+        state["conditional"].append(sent)
+        if sent == etag:
+            return MemoryResponse(304, b"", {"ETag": etag})
+        body = f'{{"redirect_url": "https://pay/{state["version"]}", "id": 7}}'.encode()
+        return MemoryResponse(200, body, {"Content-Type": "application/json", "ETag": etag})
+
+    api.route("GET", GET, get)
+    return state
+
+
+def test_304_serves_the_cached_model(api, make_client):
+    state = versioned_receipt(api)
+    cache = HTTPCache()
+    client = make_client(http_cache=cache)
+
+    first = client.receipt.get(receipt_id=7)
+    second = client.receipt.get(receipt_id=7)
+
+    assert state["conditional"] == [None, '"v1"']
+    assert second is first
+    assert (cache.stats.stores, cache.stats.revalidated) == (1, 1)
+
+
+def test_changed_resource_replaces_the_entry(api, make_client):
+    state = versioned_receipt(api)
+    cache = HTTPCache()
+    client = make_client(http_cache=cache)
+
+    client.receipt.get(receipt_id=7)
+    state["version"] = 2
+    changed = client.receipt.get(receipt_id=7)
+    again = client.receipt.get(receipt_id=7)
+
+    assert changed.redirect_url == "https://pay/2"
+    assert again is changed
+    assert state["conditional"] == [None, '"v1"', '"v2"']
+    assert cache.stats.revalidated == 1
+
+
+def test_tenants_do_not_share_entries(api):
+    state = versioned_receipt(api)
+    cfg = config(api, http_cache=HTTPCache())
+    tenants = [create_client(cfg), create_client(replace(cfg, api_key="other"))]
+
+    for client in tenants:
+        client.receipt.get(receipt_id=7)
+        client.close()
+
+    assert state["conditional"] == [None, None]
+
+
+def test_hosts_do_not_share_entries(api):
+    state = versioned_receipt(api)
+    cfg = config(api, http_cache=HTTPCache())
+    hosts = [create_client(cfg), create_client(replace(cfg, base_url="http://mem-staging"))]
+
+    for client in hosts:
+        client.receipt.get(receipt_id=7)
+        client.close()
+
+    assert state["conditional"] == [None, None]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+import subprocess
+import sys
+
+import pytest
+
+import gozarpay
+
+
+def run(script: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+
+
+def test_import_gozarpay_loads_no_heavy_dependency():
+    result = run(
+        "import sys, gozarpay\n"
+        "heavy = {'requests', 'pydantic', 'httpx', 'orjson'} & set(sys.modules)\n"
+        "print(sorted(heavy))\n"
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_sync_client_does_not_load_httpx():
+    result = run(
+        "import sys, gozarpay\n"
+        "gozarpay.Client\n"
+        "print('gozarpay.client' in sys.modules, 'httpx' in sys.modules)\n"
+    )
+
+    assert result.stdout.strip() == "True False"
+
+
+@pytest.mark.parametrize("name", gozarpay.__all__)
+def test_every_export_resolves(name):
+    value = getattr(gozarpay, name)
+
+    assert value is not None
+    assert vars(gozarpay)[name] is value  # cached: later lookups skip __getattr__
+
+
+def test_unknown_attribute_raises_and_dir_lists_exports():
+    with pytest.raises(AttributeError, match="no attribute 'Nope'"):
+        gozarpay.Nope
+    assert set(gozarpay.__all__) <= set(dir(gozarpay))
+
+
+def test_services_are_built_on_first_access(client):
+    assert "wallet" not in vars(client)
+
+    assert client.wallet is client.wallet
+    assert "wallet" in vars(client)
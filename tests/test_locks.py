@@ -0,0 +1,56 @@
+from __future__ import annotations
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from gozarpay import locks
+from gozarpay.locks import FileLock
+
+pytestmark = pytest.mark.skipif(locks.fcntl is None, reason="POSIX flock")
+
+
+def open_fds() -> int:
+    return len(os.listdir(f"/proc/{os.getpid()}/fd"))
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_failed_flock_closes_the_descriptor_and_frees_the_lock(tmp_path, monkeypatch):
+    lock = FileLock(str(tmp_path / "x.lock"))
+
+    def interrupted(fd, op):
+        raise OSError("interrupted")
+
+    real = locks.fcntl
+    monkeypatch.setattr(locks, "fcntl", SimpleNamespace(flock=interrupted, LOCK_EX=real.LOCK_EX))
+    before = open_fds()
+    for _ in range(5):
+        with pytest.raises(OSError):
+            lock.acquire()
+    assert open_fds() == before
+
+    monkeypatch.setattr(locks, "fcntl", real)
+    with lock:  # the thread lock was released on failure
+        assert lock._fd is not None
+    assert lock._fd is None
+
+
+def test_lock_excludes_other_threads(tmp_path):
+    path = str(tmp_path / "x.lock")
+    order = []
+    holder = FileLock(path)
+    holder.acquire()
+
+    def contender():
+        with FileLock(path):  # a separate descriptor: flock makes it wait
+            order.append("contender")
+
+    thread = threading.Thread(target=contender)
+    thread.start()
+    thread.join(0.1)
+    order.append("holder")
+    holder.release()
+    thread.join(2)
+
+    assert order == ["holder", "contender"]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from gozarpay.pagination import Paginator
+from gozarpay.versioning import V1_SPEC
+
+from conftest import async_client
+
+LIST = V1_SPEC.routes["receipt.list"]
+SIZE = 3
+
+
+def receipt_pages(api, total: int, delay: float = 0.0):
+    """
+    receipt.list over `total` receipts, SIZE per page (DRF shape: 404 past the end).
+    `state["total"]` can change mid-crawl; returns the state and the peak concurrency.
+    """
+    state = {"total": total, "inflight": 0, "peak": 0, "pages": []}
+    lock = threading.Lock()
+
+    def page(req):
+        number = int((req.params or {}).get("page", 1))
+        with lock:
+            state["pages"].append(number)
+            state["inflight"] += 1
+            state["peak"] = max(state["peak"], state["inflight"])
+        time.sleep(delay)
+        with lock:
+            state["inflight"] -= 1
+        total = state["total"]
+        first = (number - 1) * SIZE + 1
+        if first > total and number > 1:
+            return 404, {"detail": "Invalid page."}
+        ids = range(first, min(first + SIZE, total + 1))
+        return {
+            "count": total,
+            "next": f"http://mem{LIST}?page={number + 1}" if ids.stop <= total else None,
+            "previous": None,
+            "results": [{"redirect_url": f"https://pay/{i}", "id": i} for i in ids],
+        }
+
+    api.route("GET", LIST, page)
+    return state
+
+
+def test_pages_are_prefetched_concurrently_and_yielded_in_order(api, client):
+    state = receipt_pages(api, 28, delay=0.02)
+
+    ids = [r.id for r in client.receipt.iter_receipts(concurrency=4)]
+
+    assert ids == list(range(1, 29))
+    assert sorted(state["pages"]) == list(range(1, 11))
+    assert state["peak"] > 1
+
+
+def test_count_shrinking_mid_crawl_stops_at_the_404(api, client):
+    state = receipt_pages(api, 30)
+    receipts = client.receipt.iter_receipts(concurrency=4)
+    assert next(receipts).id == 1
+    state["total"] = 7  # pages 4..10 now answer 404
+
+    assert [r.id for r in receipts][-1] == 7
+
+
+def test_count_growing_mid_crawl_is_followed_page_by_page(api, client):
+    state = receipt_pages(api, 9)
+    receipts = client.receipt.iter_receipts(concurrency=2)
+    assert next(receipts).id == 1
+    state["total"] = 14  # page 3 (the planned last) now reports a next page
+
+    assert [r.id for r in receipts] == list(range(2, 15))
+
+
+def test_prefetch_stays_within_the_window():
+    fetched = []
+
+    def fetch(number):
+        fetched.append(number)
+        return SimpleNamespace(count=100 * SIZE, next="more", results=[number] * SIZE)
+
+    pages = iter(Paginator(fetch, concurrency=2, window=3))
+    for _ in range(SIZE + 1):  # all of page 1, first item of page 2
+        next(pages)
+    time.sleep(0.05)
+    assert max(fetched) <= 1 + 3
+    pages.close()
+
+
+def test_async_paginator_yields_every_receipt_in_order(api):
+    receipt_pages(api, 20)  # handlers run inline on the loop: order only, no overlap
+
+    async def scenario():
+        async with async_client(api) as client:
+            return [r.id async for r in client.receipt.iter_receipts(concurrency=4)]
+
+    assert asyncio.run(scenario()) == list(range(1, 21))
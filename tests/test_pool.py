@@ -0,0 +1,31 @@
+from __future__ import annotations
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gozarpay.auth.strategies import LOGIN_PATH
+from gozarpay.pool import ClientPool
+from gozarpay.versioning import V1_SPEC
+
+from conftest import config
+
+
+def test_tenant_logins_do_not_serialize_on_the_default_store(api):
+    def slow_login(req):
+        time.sleep(0.2)
+        return {"access_token": f"access-{req.json['api_key']}", "refresh_token": "r"}
+
+    api.route("POST", LOGIN_PATH, slow_login)
+    api.route("GET", V1_SPEC.routes["receipt.get"], {"redirect_url": "https://pay/1", "id": 1})
+
+    with ClientPool(config(api)) as pool:
+
+        def call(tenant: int):
+            return pool.get(f"key-{tenant}", "secret").receipt.get(receipt_id=1).id
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(10) as workers:
+            assert list(workers.map(call, range(10))) == [1] * 10
+        elapsed = time.perf_counter() - start
+
+    assert api.calls[("POST", LOGIN_PATH)] == 10
+    assert elapsed < 1.0  # one-at-a-time logins take >= 2s
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import json
+import multiprocessing
+import pickle
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from gozarpay import ClientConfig
+from gozarpay.auth.strategies import LOGIN_PATH
+from gozarpay.factory import create_client
+from gozarpay.hedging import HedgePolicy
+from gozarpay.procpool import ProcessExecutor, receipt_page
+from gozarpay.retry import RetryPolicy
+from gozarpay.versioning import V1_SPEC
+
+LIST = V1_SPEC.routes["receipt.list"]
+SIZE = 2
+
+
+@pytest.fixture
+def server():
+    """
+    A real HTTP server (worker processes cannot reach an InMemoryTransport):
+    receipt.list over 6 receipts, and a login counter shared by every process.
+    """
+    logins = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            logins.append(1)
+            self._json({"access_token": f"access-{len(logins)}", "refresh_token": "refresh"})
+
+        def do_GET(self):
+            split = urlsplit(self.path)
+            if split.path != LIST:
+                return self._json({"detail": "Not found."}, 404)
+            page = int(parse_qs(split.query).get("page", ["1"])[0])
+            ids = range((page - 1) * SIZE + 1, page * SIZE + 1)
+            self._json(
+                {
+                    "count": 6,
+                    "next": None,
+                    "previous": None,
+                    "results": [{"redirect_url": f"https://pay/{i}", "id": i} for i in ids],
+                }
+            )
+
+        def _json(self, body, status=200):
+            raw = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", logins
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make(base_url: str, **options):
+    return create_client(ClientConfig(base_url=base_url, api_key="k", secret_key="s", **options))
+
+
+def test_pickled_client_keeps_its_tokens(server):
+    base_url, logins = server
+    client = make(base_url)
+    client.receipt.list(page=1)
+
+    clone = pickle.loads(pickle.dumps(client))
+    assert [r.id for r in clone.receipt.list(page=2).results] == [3, 4]
+
+    assert clone._auth.access_token == client._auth.access_token == "access-1"
+    assert len(logins) == 1
+    clone.close()
+    client.close()
+
+
+def test_process_executor_runs_under_spawn_without_new_logins(server):
+    base_url, logins = server
+    client = make(base_url)
+    client.receipt.list(page=1)
+
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessExecutor(client, processes=2, mp_context=spawn) as pool:
+        run = pool.run(receipt_page, [1, 2, 3])
+        pairs = sorted((page, r.id) for page, r in run)
+
+    assert pairs == [(1, 1), (1, 2), (2, 3), (2, 4), (3, 5), (3, 6)]
+    assert not run.errors
+    assert len(logins) == 1
+    client.close()
+
+
+def fork_state(client, key):
+    pool = client._hedge_pool._pool
+    return [(len(pool._threads), client._breaker.state)]
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_forked_worker_gets_a_fresh_hedge_pool_and_closed_breakers(server):
+    base_url, _ = server
+    client = make(
+        base_url,
+        retry=RetryPolicy(breaker_threshold=1),
+        hedge=HedgePolicy(max_delay=0.05, max_workers=2),
+    )
+    client._hedge_pool.try_submit(lambda: None).result(1)  # start a parent thread
+    client._breaker.record_failure()
+    assert client._breaker.state == "open"
+
+    fork = multiprocessing.get_context("fork")
+    with ProcessExecutor(client, processes=1, mp_context=fork) as pool:
+        [(_, state)] = list(pool.run(fork_state, [0]))
+
+    assert state == (0, "closed")
+    client.close()
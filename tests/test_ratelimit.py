@@ -0,0 +1,129 @@
+from __future__ import annotations
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+
+from gozarpay import deadlines
+from gozarpay.exceptions import DeadlineExceeded
+from gozarpay.ratelimit import (
+    FileBucketBackend,
+    MemoryBucketBackend,
+    Rate,
+    RateLimiter,
+    SharedMemoryBucketBackend,
+    parse_limits,
+)
+
+
+@pytest.mark.parametrize(
+    "spec, per_second, burst",
+    [
+        ("10/s", 10.0, 10),
+        ("120/m", 2.0, 2),
+        ("1800/h", 0.5, 1),
+        ("2/s@5", 2.0, 5),
+        (" 3 ", 3.0, 3),
+    ],
+)
+def test_rate_parse(spec, per_second, burst):
+    assert Rate.parse(spec) == Rate(per_second, burst)
+
+
+@pytest.mark.parametrize("spec", ["10/d", "x/s", "0/s"])
+def test_rate_parse_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        Rate.parse(spec)
+
+
+def test_parse_limits():
+    assert parse_limits("receipt.create=2/s@5, market.price_stats=10/s") == {
+        "receipt.create": Rate(2.0, 5),
+        "market.price_stats": Rate(10.0, 10),
+    }
+    with pytest.raises(ValueError):
+        parse_limits("receipt.create")
+
+
+def test_bucket_bursts_then_queues_callers_and_refills():
+    backend = MemoryBucketBackend()
+    rate = Rate(2.0, 2)
+
+    assert [backend.take("k", rate, 100.0) for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    assert backend.take("k", rate, 102.0) == 0.0  # refilled, capped at the burst
+    assert backend.take("k", rate, 102.0) == 0.0
+    assert backend.take("k", rate, 102.0) == 0.5
+
+
+def test_routes_without_a_limit_share_the_default_bucket():
+    limiter = RateLimiter({"receipt.create": Rate(1.0, 1)}, default=Rate(1.0, 1))
+
+    assert limiter.reserve("receipt.create") == 0.0
+    assert limiter.reserve("receipt.get") == 0.0
+    assert limiter.reserve(None) > 0.0
+    assert RateLimiter({}).reserve("receipt.get") == 0.0
+
+
+def test_file_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "buckets.json")
+    rate = Rate(1.0, 2)
+
+    assert FileBucketBackend(path).take("k", rate, 100.0) == 0.0
+    assert FileBucketBackend(path).take("k", rate, 100.0) == 0.0
+    assert FileBucketBackend(path).take("k", rate, 100.0) == 1.0
+
+
+def test_shared_memory_backend_is_shared_between_instances():
+    name = f"gozarpay-test-{uuid.uuid4().hex[:8]}"
+    first = SharedMemoryBucketBackend(name)
+    second = SharedMemoryBucketBackend(name)
+    rate = Rate(1.0, 1)
+    try:
+        assert first.take("k", rate, 100.0) == 0.0
+        assert second.take("k", rate, 100.0) == 1.0
+        assert first.take("other", rate, 100.0) == 0.0
+    finally:
+        second.close()
+        first.close()
+        first.unlink()
+
+
+def test_acquire_fails_fast_when_the_wait_outlasts_the_deadline():
+    limiter = RateLimiter({}, default=Rate(0.5, 1))
+    limiter.acquire("receipt.get")
+
+    started = time.monotonic()
+    with deadlines.deadline(0.2), pytest.raises(DeadlineExceeded):
+        limiter.acquire("receipt.get")
+    assert time.monotonic() - started < 0.1
+
+
+def test_aacquire_fails_fast_when_the_wait_outlasts_the_deadline():
+    limiter = RateLimiter({}, default=Rate(0.5, 1))
+
+    async def main():
+        await limiter.aacquire("receipt.get")
+        with deadlines.deadline(0.2):
+            await limiter.aacquire("receipt.get")
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(main())
+
+
+def test_aacquire_takes_file_buckets_off_the_event_loop(tmp_path):
+    backend = FileBucketBackend(str(tmp_path / "buckets.json"))
+    threads = []
+    take = backend.take
+
+    def recording_take(*args):
+        threads.append(threading.current_thread())
+        return take(*args)
+
+    backend.take = recording_take
+    limiter = RateLimiter({}, default="10/s", backend=backend)
+
+    asyncio.run(limiter.aacquire("receipt.get"))
+
+    assert threads and threads[0] is not threading.main_thread()
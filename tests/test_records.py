@@ -0,0 +1,79 @@
+from __future__ import annotations
+import json
+import pickle
+
+import pytest
+
+from gozarpay.models import MarketPrice, PaginatedWalletList, Receipt
+from gozarpay.records import (
+    MarketPriceRecord,
+    PriceInfoRecord,
+    ReceiptRecord,
+    WalletRecord,
+    view_for,
+)
+from gozarpay.versioning import V1_SPEC
+
+PRICE = {
+    "id": 1,
+    "code": "BTCIRT",
+    "price_info": json.dumps({"price": "1000"}),
+    "price": "1000",
+    "buy_price": "990",
+    "sell_price": "1010",
+}
+
+
+def test_raw_mode_returns_lazy_record_views(api, make_client):
+    api.route("GET", V1_SPEC.routes["market.price_stats"], [PRICE])
+    client = make_client(response_mode="raw")
+
+    [price] = client.market.price_stats()
+
+    assert type(price) is MarketPriceRecord
+    assert price.buy_price == "990" and price["code"] == "BTCIRT"
+    assert isinstance(price.price_info, PriceInfoRecord)  # JSON string decoded on access
+    assert price.price_info.price == "1000"
+    assert isinstance(price.to_model(), MarketPrice)
+    assert isinstance(client.market.price_stats(validate=True)[0], MarketPrice)
+
+
+def test_nested_views_are_wrapped_on_access():
+    page = PaginatedWalletList.model_validate(
+        {
+            "count": 1,
+            "results": [{"currency": {"id": 1, "code": "BTC"}, "balance": "1", "value_total": "2"}],
+        }
+    )
+    view = view_for(PaginatedWalletList)(page.model_dump())
+
+    assert isinstance(view.results[0], WalletRecord)
+    assert view.results[0].currency.code == "BTC"
+    assert view.to_model() == page
+
+
+def test_absent_optional_field_reads_as_none():
+    record = ReceiptRecord({"redirect_url": "https://pay/7"})
+
+    assert record.id is None and record.status is None
+    assert Receipt.model_validate(record.raw).status is None
+
+
+def test_absent_required_or_unknown_field_raises():
+    record = MarketPriceRecord({"id": 1})
+
+    with pytest.raises(AttributeError):
+        record.price  # required on MarketPrice
+    with pytest.raises(AttributeError):
+        record.not_a_field
+    assert getattr(record, "title", "unset") is None
+
+
+def test_records_are_slotted_comparable_and_picklable():
+    record = ReceiptRecord({"redirect_url": "https://pay/7", "id": 7})
+
+    with pytest.raises(AttributeError):
+        record.__dict__
+    assert record == ReceiptRecord({"redirect_url": "https://pay/7", "id": 7})
+    assert record != ReceiptRecord({"redirect_url": "https://pay/8", "id": 8})
+    assert pickle.loads(pickle.dumps(record)) == record
@@ -0,0 +1,153 @@
+from __future__ import annotations
+import asyncio
+import base64
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from gozarpay.auth.refresh import (
+    TOKEN_TTL,
+    RefreshCoordinator,
+    due,
+    jwt_exp,
+    token_expiry,
+)
+from gozarpay.auth.strategies import LOGIN_PATH, REFRESH_PATH, ApiKeyAuth, AsyncApiKeyAuth
+
+from conftest import BASE_URL
+
+
+def jwt(claims: dict | str) -> str:
+    raw = claims if isinstance(claims, str) else json.dumps(claims)
+    payload = base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+    return f"eyJhbGciOiJIUzI1NiJ9.{payload}.signature"
+
+
+@pytest.mark.parametrize(
+    "token, exp",
+    [
+        (jwt({"exp": 1700000000}), 1700000000.0),
+        (jwt({"exp": 1700000000.5, "sub": "k"}), 1700000000.5),
+        (jwt({"sub": "k"}), None),  # no exp
+        (jwt({"exp": "1700000000"}), None),  # not a number
+        (jwt("not json"), None),
+        (jwt("[1, 2]"), None),  # not an object
+        ("eyJ.@@@.sig", None),  # not base64
+        ("opaque-token", None),
+        (None, None),
+    ],
+)
+def test_jwt_exp(token, exp):
+    assert jwt_exp(token) == exp
+
+
+def test_token_without_exp_gets_the_fallback_lifetime():
+    assert token_expiry(jwt({"exp": 123})) == 123.0
+    assert token_expiry("opaque-token", now=1000.0) == 1000.0 + TOKEN_TTL
+    assert token_expiry(jwt("not json"), now=1000.0) == 1000.0 + TOKEN_TTL
+
+
+def test_due():
+    assert not due(None, 30)
+    assert not due(1000.0, 30, now=969.0)
+    assert due(1000.0, 30, now=970.0)
+
+
+def jwt_api(api, lifetime: float, delay: float = 0.0):
+    """Login / refresh answer JWTs expiring `lifetime` seconds from now."""
+
+    def login(req):
+        time.sleep(delay)
+        exp = time.time() + lifetime
+        return {"access_token": jwt({"exp": exp, "n": "login"}), "refresh_token": "refresh"}
+
+    def refresh(req):
+        time.sleep(delay)
+        return {"access": jwt({"exp": time.time() + 3600, "n": "refresh"})}
+
+    api.route("POST", LOGIN_PATH, login).route("POST", REFRESH_PATH, refresh)
+
+
+def test_token_near_expiry_is_refreshed_in_the_background(api):
+    jwt_api(api, lifetime=60)  # inside refresh_ahead (120s), outside the margin (30s)
+    auth = ApiKeyAuth(BASE_URL, "k", "s")
+    auth.bind(api)
+    first = auth.attach({})["Authorization"]
+
+    assert auth.attach({})["Authorization"] == first  # served at once
+    deadline = time.time() + 2
+    while api.calls.get(("POST", REFRESH_PATH), 0) == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    while auth.attach({})["Authorization"] == first and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert auth.attach({})["Authorization"] != first
+    assert api.calls[("POST", REFRESH_PATH)] == 1
+    assert api.calls[("POST", LOGIN_PATH)] == 1
+
+
+def test_token_inside_the_margin_is_refreshed_before_sending(api):
+    jwt_api(api, lifetime=10)
+    auth = ApiKeyAuth(BASE_URL, "k", "s")
+    auth.bind(api)
+    first = auth.attach({})["Authorization"]
+
+    assert auth.attach({})["Authorization"] != first
+    assert api.calls[("POST", REFRESH_PATH)] == 1
+
+
+def test_token_without_exp_is_not_refreshed_early(api):
+    auth = ApiKeyAuth(BASE_URL, "k", "s")  # conftest tokens are opaque
+    auth.bind(api)
+    auth.attach({})
+
+    assert auth.access_expires_at == pytest.approx(time.time() + TOKEN_TTL, abs=5)
+    auth.attach({})
+    assert api.calls.get(("POST", REFRESH_PATH), 0) == 0
+
+
+def test_concurrent_callers_share_one_login(api):
+    jwt_api(api, lifetime=3600, delay=0.1)
+    auth = ApiKeyAuth(BASE_URL, "k", "s")
+    auth.bind(api)
+
+    with ThreadPoolExecutor(8) as workers:
+        headers = list(workers.map(lambda _: auth.attach({})["Authorization"], range(8)))
+
+    assert len(set(headers)) == 1
+    assert api.calls[("POST", LOGIN_PATH)] == 1
+
+
+def test_coordinator_runs_one_renewal_for_waiting_callers():
+    coordinator = RefreshCoordinator()
+    renewals = []
+    fresh = threading.Event()
+
+    def renew():
+        renewals.append(1)
+        time.sleep(0.1)
+        fresh.set()
+
+    with ThreadPoolExecutor(8) as workers:
+        list(workers.map(lambda _: coordinator.run(renew, fresh.is_set), range(8)))
+
+    assert len(renewals) == 1
+
+
+def test_async_concurrent_callers_share_one_login(api):
+    jwt_api(api, lifetime=3600)
+    auth = AsyncApiKeyAuth(base_url=BASE_URL, api_key="k", secret_key="s")
+
+    async def main():
+        async with httpx.AsyncClient(transport=api.as_httpx()) as http:
+            auth.bind(http)
+            return await asyncio.gather(*(auth.attach({}) for _ in range(8)))
+
+    headers = asyncio.run(main())
+
+    assert len({h["Authorization"] for h in headers}) == 1
+    assert api.calls[("POST", LOGIN_PATH)] == 1
@@ -0,0 +1,109 @@
+from __future__ import annotations
+import time
+
+import pytest
+import requests
+
+from gozarpay.exceptions import APIError, CircuitOpenError
+from gozarpay.retry import RetryPolicy
+from gozarpay.transport import MemoryResponse
+from gozarpay.versioning import V1_SPEC
+
+GET = V1_SPEC.routes["receipt.get"]
+CREATE = V1_SPEC.routes["receipt.create"]
+RECEIPT = {"redirect_url": "https://pay/7", "id": 7}
+FAST = RetryPolicy(backoff_base=0.001)
+
+
+def answers(*results):
+    """Handler replaying `results` in turn (the last one repeats); exceptions are raised."""
+    pending = list(results)
+
+    def handler(req):
+        result = pending.pop(0) if len(pending) > 1 else pending[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return handler
+
+
+def create(client, **options):
+    return client.receipt.create(
+        irt_amount="10000",
+        reference_id="order-1",
+        phone_number="09120000000",
+        callback="https://shop/cb",
+        **options,
+    )
+
+
+def test_idempotent_read_is_retried_until_it_succeeds(api, make_client):
+    api.route("GET", GET, answers((503, {}), requests.ConnectionError("reset"), RECEIPT))
+    client = make_client(retry=FAST)
+
+    assert client.receipt.get(receipt_id=7).id == 7
+    assert api.calls[("GET", GET)] == 3
+
+
+def test_retries_stop_after_max_attempts(api, make_client):
+    api.route("GET", GET, (502, {"detail": "bad gateway"}))
+    client = make_client(retry=RetryPolicy(max_attempts=4, backoff_base=0.001))
+
+    with pytest.raises(APIError) as err:
+        client.receipt.get(receipt_id=7)
+    assert err.value.status_code == 502
+    assert api.calls[("GET", GET)] == 4
+
+
+def test_retry_after_sets_the_backoff_floor(api, make_client):
+    throttled = MemoryResponse(429, b"{}", {"Retry-After": "1"})
+    api.route("GET", GET, answers(throttled, RECEIPT))
+    client = make_client(retry=FAST)
+
+    start = time.perf_counter()
+    client.receipt.get(receipt_id=7)
+    assert time.perf_counter() - start >= 1.0
+
+
+def test_create_is_retried_only_with_an_idempotency_key(api, make_client):
+    api.route("POST", CREATE, answers((503, {}), RECEIPT))
+    client = make_client(retry=FAST)
+
+    with pytest.raises(APIError):
+        create(client)
+    assert api.calls[("POST", CREATE)] == 1
+
+    api.route("POST", CREATE, answers((503, {}), RECEIPT))
+    assert create(client, idempotency_key="order-1").id == 7
+    assert api.calls[("POST", CREATE)] == 3
+
+
+def test_breaker_opens_fails_fast_and_closes_after_a_good_probe(api, make_client):
+    upstream = {"answer": (500, {})}
+    api.route("GET", GET, lambda req: upstream["answer"])
+    policy = RetryPolicy(max_attempts=1, breaker_threshold=2, breaker_reset=0.2)
+    client = make_client(retry=policy)
+
+    for _ in range(2):
+        with pytest.raises(APIError):
+            client.receipt.get(receipt_id=7)
+    with pytest.raises(CircuitOpenError):
+        client.receipt.get(receipt_id=7)
+    assert api.calls[("GET", GET)] == 2  # the open circuit sent nothing
+
+    time.sleep(0.2)
+    upstream["answer"] = RECEIPT
+    assert client.receipt.get(receipt_id=7).id == 7  # half-open probe
+    assert client.receipt.get(receipt_id=7).id == 7
+    assert api.calls[("GET", GET)] == 4
+
+
+def test_retries_and_breaker_are_off_by_default(api, client):
+    api.route("GET", GET, (503, {"detail": "busy"}))
+
+    for _ in range(6):
+        with pytest.raises(APIError):
+            client.receipt.get(receipt_id=7)
+
+    assert api.calls[("GET", GET)] == 6  # one send per call, and no open circuit
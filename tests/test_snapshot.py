@@ -0,0 +1,84 @@
+from __future__ import annotations
+from decimal import Decimal
+
+from gozarpay.snapshot import MarketSnapshot
+
+
+def market(market_id, code1, code2, price, buy=None, sell=None, tradable=True) -> dict:
+    return {
+        "id": market_id,
+        "code": f"{code1}{code2}",
+        "code1": code1,
+        "code2": code2,
+        "price": price,
+        "buy_price": buy,
+        "sell_price": sell,
+        "tradable": tradable,
+    }
+
+
+PRICES = [
+    market(1, "BTC", "IRT", "1000", "990", "1010"),
+    market(2, "USDT", "IRT", "50", "49", "51"),
+    market(3, "ETH", "USDT", "20", None, "21"),  # no bid
+    market(4, "BTC", "USDT", "20", "19", "21"),
+    market(5, "SHIB", "IRT", "1", "1", "1", tradable=False),
+    market(6, "SHIB", "USDT", "0.02", "0.02", "0.02"),
+]
+
+
+def test_inverted_leg_swaps_buy_and_sell():
+    rate = MarketSnapshot(PRICES).rate("IRT", "BTC")
+
+    assert rate.direct and rate.path == ("IRT", "BTC")
+    assert rate.price == Decimal(1) / Decimal(1000)
+    assert rate.buy_price == Decimal(1) / Decimal(1010)
+    assert rate.sell_price == Decimal(1) / Decimal(990)
+
+
+def test_cross_rate_multiplies_legs_and_a_missing_side_poisons_it():
+    rate = MarketSnapshot(PRICES).rate("ETH", "IRT")
+
+    assert rate.path == ("ETH", "USDT", "IRT")
+    assert rate.price == Decimal(1000)
+    assert rate.buy_price is None  # ETHUSDT has no bid
+    assert rate.sell_price == Decimal(21) * Decimal(51)
+
+
+def test_tradable_markets_are_preferred_among_equally_short_paths():
+    rate = MarketSnapshot(PRICES).rate("SHIB", "BTC")
+
+    assert rate.path == ("SHIB", "USDT", "BTC")
+    assert rate.price == Decimal("0.02") / Decimal(20)
+
+
+def test_max_legs_bounds_the_path():
+    snapshot = MarketSnapshot(PRICES, max_legs=1)
+
+    assert snapshot.rate("ETH", "IRT") is None
+    assert snapshot.rate("BTC", "IRT").price == Decimal(1000)
+    assert MarketSnapshot(PRICES, max_legs=2).rate("ETH", "IRT") is not None
+
+
+def test_duplicate_pair_keeps_the_first_tradable_market():
+    snapshot = MarketSnapshot(
+        [
+            market(1, "BTC", "IRT", "900", tradable=False),
+            market(2, "BTC", "IRT", "1000"),
+            market(3, "BTC", "IRT", "1100"),
+        ]
+    )
+
+    assert snapshot.pair("IRT", "BTC").id == 2
+    assert snapshot.rate("BTC", "IRT").price == Decimal(1000)
+    assert [e[1].id for e in snapshot._graph["BTC"]] == [2]  # the replaced edge is gone
+    assert snapshot.rate("IRT", "BTC").markets[0].id == 2
+
+
+def test_zero_or_unparseable_prices_are_left_out():
+    snapshot = MarketSnapshot(
+        [market(1, "BTC", "IRT", "0"), market(2, "ETH", "IRT", "n/a"), PRICES[1]]
+    )
+
+    assert len(snapshot) == 1
+    assert snapshot.rate("BTC", "IRT") is None
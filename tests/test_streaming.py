@@ -0,0 +1,87 @@
+from __future__ import annotations
+import asyncio
+import json
+
+import pytest
+
+from gozarpay.streaming import ArrayScanner
+from gozarpay.versioning import V1_SPEC
+
+from conftest import async_client
+
+LIST = V1_SPEC.routes["receipt.list"]
+PRICES = V1_SPEC.routes["market.price_stats"]
+
+PAGE = {
+    "count": 3,
+    "note": "a \"results\": [1] decoy, ünïcode and \\ escapes",
+    "results": [
+        {"redirect_url": "https://pay/1", "id": 1, "irt_amount": "10000", "tags": [[], {}]},
+        {"redirect_url": "https://pay/2?q=\"x\"", "id": 22, "reference_id": "سفارش-۲"},
+        {"redirect_url": "https://pay/3", "id": 333, "ratio": -1.25e-3},
+    ],
+    "next": None,
+}
+
+
+def scan(body: bytes, cuts, key=None):
+    """Items and meta of `body` fed to an ArrayScanner in pieces ending at `cuts`."""
+    scanner, items, start = ArrayScanner(key), [], 0
+    for end in [*cuts, len(body)]:
+        items += scanner.feed(body[start:end])
+        start = end
+    return items + scanner.close(), scanner.meta
+
+
+def test_any_chunk_boundary_gives_the_buffered_decode():
+    body = json.dumps(PAGE, ensure_ascii=False).encode()
+    expected_meta = {k: v for k, v in PAGE.items() if k != "results"}
+
+    for cut in range(1, len(body)):
+        assert scan(body, [cut], key="results") == (PAGE["results"], expected_meta), cut
+    assert scan(body, range(1, len(body)), key="results")[0] == PAGE["results"]
+
+
+def test_a_number_cut_at_a_chunk_end_is_not_split():
+    items, _ = scan(b"[12, 3.5, -7e2]", [3, 8])
+    assert items == [12, 3.5, -7e2]
+
+
+@pytest.mark.parametrize("body", [b'[{"id": 1}, {"id"', b'{"results": [1, 2]', b"[1, 2] 3"])
+def test_truncated_or_trailing_data_raises(body):
+    scanner = ArrayScanner("results" if body.startswith(b"{") else None)
+    with pytest.raises(ValueError):
+        scanner.feed(body)
+        scanner.close()
+
+
+def test_streamed_receipts_match_the_buffered_list(api, client):
+    api.route("GET", LIST, PAGE)
+
+    streamed = list(client.receipt.iter_list())
+
+    assert streamed == client.receipt.list().results
+    assert [r.reference_id for r in streamed][1] == "سفارش-۲"
+
+
+def test_streamed_price_stats_decode_per_item(api, client):
+    markets = [
+        {"id": i, "code": f"C{i}IRT", "price_info": "{}", "price": "1", "buy_price": "1", "sell_price": "1"}
+        for i in range(50)
+    ]
+    api.route("GET", PRICES, markets)
+
+    codes = [m.code for m in client.market.iter_price_stats(validate=False)]
+
+    assert codes == [m["code"] for m in markets]
+
+
+def test_async_stream_matches_the_buffered_list(api):
+    api.route("GET", LIST, PAGE)
+
+    async def scenario():
+        async with async_client(api) as client:
+            return [r async for r in client.receipt.iter_list()], await client.receipt.list()
+
+    streamed, page = asyncio.run(scenario())
+    assert streamed == page.results
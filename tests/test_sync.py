@@ -0,0 +1,116 @@
+from __future__ import annotations
+import sqlite3
+
+from gozarpay import sync as sync_module
+from gozarpay.models import Receipt, ReceiptStatus
+from gozarpay.sync import ReceiptStore
+from gozarpay.versioning import V1_SPEC
+
+LIST = V1_SPEC.routes["receipt.list"]
+GET = V1_SPEC.routes["receipt.get"]
+SIZE = 3
+
+
+def receipt(i: int, status: str = "success") -> dict:
+    return {"redirect_url": f"https://pay/{i}", "id": i, "status": status}
+
+
+def listing(api, ids: list, *, newest_first: bool):
+    """receipt.list over `ids` (mutable: append to add receipts), SIZE per page."""
+    pages = []
+
+    def page(req):
+        number = int((req.params or {}).get("page", 1))
+        pages.append(number)
+        ordered = sorted(ids, reverse=newest_first)
+        chunk = ordered[(number - 1) * SIZE : number * SIZE]
+        if not chunk and number > 1:
+            return 404, {"detail": "Invalid page."}
+        more = number * SIZE < len(ordered)
+        return {
+            "count": len(ordered),
+            "next": f"http://mem{LIST}?page={number + 1}" if more else None,
+            "previous": None,
+            "results": [receipt(i) for i in chunk],
+        }
+
+    api.route("GET", LIST, page)
+    return pages
+
+
+def test_newest_first_listing_walks_forward_and_stops_at_the_checkpoint(api, client):
+    ids = list(range(1, 11))
+    pages = listing(api, ids, newest_first=True)
+    store = ReceiptStore()
+
+    first = store.sync(client)
+    assert (first.complete, first.checkpoint, first.inserted) == (True, 10, 10)
+    assert pages == [1, 2, 3, 4]
+
+    ids.extend([11, 12])
+    pages.clear()
+    second = store.sync(client)
+
+    assert pages == [1]  # page 1 already reaches receipt 10
+    assert (second.inserted, second.checkpoint) == (2, 12)
+    assert len(store) == 12
+
+
+def test_oldest_first_listing_walks_back_from_the_last_page(api, client):
+    ids = list(range(1, 11))
+    pages = listing(api, ids, newest_first=False)
+    store = ReceiptStore()
+
+    assert store.sync(client).checkpoint == 10
+    assert pages == [1, 4, 3, 2]
+
+    ids.extend([11, 12, 13])
+    pages.clear()
+    second = store.sync(client)
+
+    assert pages == [1, 5, 4]  # page 4 holds 10..12: the checkpoint is reached
+    assert (second.inserted, second.checkpoint) == (3, 13)
+    assert len(store) == 13
+
+
+def test_max_pages_leaves_the_checkpoint_for_the_next_run(api, client):
+    listing(api, list(range(1, 11)), newest_first=True)
+    store = ReceiptStore()
+
+    cut = store.sync(client, max_pages=2)
+    assert (cut.complete, cut.pages, cut.checkpoint) == (False, 2, None)
+    assert store.checkpoint is None
+
+    rest = store.sync(client)
+    assert (rest.complete, rest.checkpoint) == (True, 10)
+    assert len(store) == 10
+
+
+def test_refresh_pending_rereads_only_non_terminal_receipts(api, client):
+    listing(api, [1, 2, 3], newest_first=True)
+    api.route("GET", GET, receipt(4, "success"))
+    store = ReceiptStore()
+    store.upsert(
+        [
+            Receipt.model_validate(receipt(4, "pending")),
+            Receipt.model_validate(receipt(5, "refund_failed")),
+        ]
+    )
+
+    result = store.sync(client, refresh_pending=True)
+
+    assert result.refreshed == 1
+    assert api.calls[("GET", GET)] == 1
+    assert store.get(4).status is ReceiptStatus.success
+    assert store.pending() == []
+
+
+def test_upsert_chunks_large_pages(monkeypatch):
+    monkeypatch.setattr(sync_module, "_MAX_VARIABLES", 7)
+    store = ReceiptStore()
+    store._db.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 7)  # a row binds 7
+    receipts = [Receipt.model_validate(receipt(i)) for i in range(1, 51)]
+
+    assert store.upsert(receipts[:20]) == (20, 0)
+    assert store.upsert(receipts) == (30, 20)
+    assert len(store) == 50
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import asyncio
+import logging
+
+import pytest
+
+from gozarpay.models import ReceiptStatus
+from gozarpay.tracker import AsyncSettlementTracker, PollSchedule, SettlementTracker
+from gozarpay.versioning import V1_SPEC
+
+from conftest import async_client
+
+FAST = PollSchedule(min_interval=0.01, jitter=0, timeout=5)
+
+
+def receipt_statuses(api, *statuses: str, created_at: str = "1403/07/01"):
+    """Route receipt.get to answer `statuses` in turn (the last one repeats)."""
+    answers = list(statuses)
+
+    def get(req):
+        status = answers.pop(0) if len(answers) > 1 else answers[0]
+        return {"redirect_url": "https://pay/7", "id": 7, "status": status, "created_at": created_at}
+
+    api.route("GET", V1_SPEC.routes["receipt.get"], get)
+
+
+def test_unknown_status_and_non_iso_date_still_decode(api, client):
+    receipt_statuses(api, "on_hold")
+
+    receipt = client.receipt.get(receipt_id=7)
+
+    assert receipt.status == "on_hold"
+    assert receipt.created_at == "1403/07/01"
+
+
+def test_unknown_status_keeps_the_receipt_pending(api, client):
+    receipt_statuses(api, "on_hold", "on_hold", "success")
+
+    with SettlementTracker(client, schedule=FAST) as tracker:
+        settlement = tracker.track(receipt_id=7).result(5)
+
+    assert settlement.status is ReceiptStatus.success
+    assert settlement.checks == 3
+
+
+def test_failing_callback_is_logged_and_the_others_still_run(api, client, caplog):
+    receipt_statuses(api, "success")
+    seen = []
+
+    def broken(settlement):
+        raise RuntimeError("boom")
+
+    with caplog.at_level(logging.ERROR, logger="gozarpay.tracker"):
+        with SettlementTracker(client, schedule=FAST) as tracker:
+            tracker.track(receipt_id=7, callback=broken)
+            fut = tracker.track(receipt_id=7, callback=seen.append)
+            settlement = fut.result(5)
+            tracker.close()  # waits for the callbacks
+
+    assert seen == [settlement]
+    assert "boom" in caplog.text
+
+
+def test_refund_failed_is_terminal(api, client):
+    receipt_statuses(api, "pending", "refund_failed")
+
+    with SettlementTracker(client, schedule=FAST) as tracker:
+        settlement = tracker.track(receipt_id=7).result(5)
+
+    assert settlement.status is ReceiptStatus.refund_failed
+
+
+class BrokenSchedule(PollSchedule):
+    def next_delay(self, age: float, errors: int = 0) -> float:
+        raise ValueError("bad schedule")
+
+
+def test_error_while_advancing_fails_the_receipt(api, client):
+    receipt_statuses(api, "pending")
+
+    with SettlementTracker(client, schedule=BrokenSchedule(timeout=5)) as tracker:
+        fut = tracker.track(receipt_id=7)
+        with pytest.raises(ValueError, match="bad schedule"):
+            fut.result(5)
+
+
+def test_async_error_while_advancing_fails_the_receipt(api):
+    receipt_statuses(api, "pending")
+
+    async def main():
+        async with async_client(api) as client:
+            async with AsyncSettlementTracker(
+                client, schedule=BrokenSchedule(timeout=5)
+            ) as tracker:
+                async with asyncio.timeout(5):
+                    await tracker.track(receipt_id=7)
+
+    with pytest.raises(ValueError, match="bad schedule"):
+        asyncio.run(main())
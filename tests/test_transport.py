@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from gozarpay import deadlines
+from gozarpay.exceptions import DeadlineExceeded
+from gozarpay.transport import HTTPTransport, InMemoryTransport, MemoryResponse
+
+
+class Recording(HTTPAdapter):
+    """Answers every request with an empty 200 and keeps what was sent."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append((request, kwargs))
+        resp = requests.Response()
+        resp.status_code, resp._content, resp.request = 200, b"{}", request
+        return resp
+
+
+def recording_session():
+    session = requests.Session()
+    adapter = Recording()
+    session.mount("http://", adapter)
+    return session, adapter
+
+
+def test_keep_alive_off_closes_per_request_and_leaves_the_session_alone():
+    session, adapter = recording_session()
+    transport = HTTPTransport(keep_alive=False, session=session)
+
+    transport.request("GET", "http://mem/a", headers={"X-Trace": "1"})
+
+    request, _ = adapter.sent[0]
+    assert request.headers["Connection"] == "close"
+    assert request.headers["X-Trace"] == "1"
+    assert "close" not in session.headers.get("Connection", "")
+    session.get("http://mem/b")  # the caller's own use of the session keeps alive
+    assert adapter.sent[1][0].headers.get("Connection") != "close"
+
+
+def test_default_timeout_per_call_timeout_and_deadline_cap():
+    session, adapter = recording_session()
+    transport = HTTPTransport(timeout=10, session=session)
+
+    transport.request("GET", "http://mem/a")
+    transport.request("GET", "http://mem/a", timeout=(1, 20))
+    with deadlines.deadline(2):
+        transport.request("GET", "http://mem/a", timeout=(1, 20))
+
+    timeouts = [kwargs["timeout"] for _, kwargs in adapter.sent]
+    assert timeouts[0] == 10
+    assert timeouts[1] == (1, 20)
+    assert timeouts[2][0] == 1 and 0 < timeouts[2][1] <= 2
+
+
+def test_spent_deadline_raises_before_sending():
+    session, adapter = recording_session()
+    transport = HTTPTransport(session=session)
+
+    with deadlines.deadline(0.0), pytest.raises(DeadlineExceeded):
+        transport.request("GET", "http://mem/a")
+    assert adapter.sent == []
+
+
+def test_pool_size_and_after_fork_remount_fresh_adapters():
+    transport = HTTPTransport(pool_size=7, pool_block=True)
+    old = transport.session.get_adapter("https://x")
+    assert (old._pool_maxsize, old._pool_block) == (7, True)
+    assert transport.session.get_adapter("http://x") is old
+
+    transport.after_fork()
+
+    new = transport.session.get_adapter("https://x")
+    assert new is not old and transport.session.get_adapter("http://x") is new
+    assert (new._pool_connections, new._pool_maxsize, new._pool_block) == (7, 7, True)
+    transport.close()
+
+
+def test_memory_transport_routes_and_counts():
+    api = InMemoryTransport()
+    api.route("GET", "/items/{item_id}/", lambda req: {"id": req.path_params["item_id"]})
+    api.route("POST", "/items/", lambda req: (201, {"got": req.json}))
+    api.route("GET", "/plain/", MemoryResponse(204, b"", {"X-Empty": "1"}))
+    api.route("GET", "/fixed/", {"fixed": True})
+
+    assert api.request("GET", "http://mem/items/7/").json() == {"id": "7"}
+    created = api.post("http://mem/items/", json={"a": 1})
+    assert (created.status_code, created.json()) == (201, {"got": {"a": 1}})
+    assert api.request("GET", "http://mem/plain/").headers == {"X-Empty": "1"}
+    assert api.request("GET", "http://mem/fixed/?x=1").json() == {"fixed": True}
+    missing = api.request("GET", "http://mem/nowhere/")
+    assert missing.status_code == 404
+    api.request("GET", "http://mem/items/8/")
+
+    assert api.calls[("GET", "/items/{item_id}/")] == 2
+    assert api.calls[("GET", "/nowhere/")] == 1
+
+
+def test_memory_response_streams_its_content():
+    resp = MemoryResponse(200, b"abcdefg")
+
+    assert list(resp.iter_content(3)) == [b"abc", b"def", b"g"]
+    assert resp.text == "abcdefg"
+
+
+def test_memory_transport_serves_httpx():
+    api = InMemoryTransport()
+    api.route("POST", "/echo/", lambda req: {"json": req.json, "q": req.params})
+
+    with httpx.Client(transport=api.as_httpx()) as http:
+        resp = http.post("http://mem/echo/?page=2", json={"a": 1})
+
+    assert resp.json() == {"json": {"a": 1}, "q": {"page": "2"}}